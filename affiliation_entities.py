@@ -0,0 +1,127 @@
+# ============================================================
+# affiliation_entities.py
+#   - Países e instituciones por registro, extraídos UNA vez de "Authors with
+#     affiliations" ya normalizado (alias de países de country_normalizer)
+#   - Formatos:
+#       Scopus: "Apellido, Nombre, Institución, ..., Ciudad, País; Apellido2, ..."
+#       WoS:    "[Autor1; Autor2] Institución, Depto, Ciudad, País; [Autor3] ..."
+#               (registros con EID "WOS:..."; sin corchetes son direcciones sueltas)
+#   - Tabla larga y compacta: una fila por (registro, afiliación) con institución y
+#     país como Categorical (códigos enteros + vocabulario); los reportes y exports
+#     agrupan sobre ella sin volver a tokenizar los strings
+# ============================================================
+from __future__ import annotations
+
+import pandas as pd
+
+from deduplication import record_ids
+
+ENTITY_COLUMNS = ["record_id", "entry", "institution", "country"]
+
+# Prefijo del ID de WoS (UT) en la columna EID del dataset combinado
+WOS_ID_PREFIX = "WOS:"
+# Dirección de WoS: lo que sigue a cada [autores] hasta el siguiente corchete
+_WOS_ADDRESS = r"\[[^\]]*\]\s*([^\[]+)"
+# Parte de una afiliación de Scopus que nombra a la institución: se busca por niveles
+# (universidad antes que instituto/colegio, y estos antes que centro/escuela) porque
+# Scopus suele listar primero la unidad ("School of X, University Y"); la primera
+# parte que coincida en el nivel más alto gana. Sin coincidencias: la primera parte
+INSTITUTION_TIERS = [
+    r"univ|üniv",
+    r"institu|academ|hospital|polytech|politecn|politécn|hochschule|college|école|ecole|escuela",
+    r"centre|center|ministry|council|foundation|agency|bank|laborator|observator|museum|"
+    r"corporation|company|school",
+]
+# Estado y código postal antes del país en direcciones de WoS ("CA 94305 United States")
+_POSTAL_PREFIX = r"^(?:[A-Z]{2}\s+)?(?:\S*\d\S*\s+)*"
+
+
+def _entries(text: pd.Series, is_wos: pd.Series) -> pd.DataFrame:
+    """Afiliaciones sueltas (sin nombres de autor) con la posición de su registro."""
+    wos_bracketed = is_wos & text.str.startswith("[")
+    # WoS con corchetes: una dirección por grupo de autores
+    wos = text[wos_bracketed].str.findall(_WOS_ADDRESS)
+    # WoS sin corchetes (direcciones sueltas) y Scopus: separados por ";"
+    plain = text[~wos_bracketed].str.split(";")
+    entries = pd.concat([wos, plain]).explode().dropna().str.strip(" ;")
+    entries = entries[entries != ""]
+
+    frame = pd.DataFrame({"text": entries, "is_wos": is_wos.reindex(entries.index).to_numpy()})
+    # Scopus: las dos primeras partes son el autor ("Apellido, Nombre")
+    scopus = ~frame["is_wos"]
+    frame.loc[scopus, "text"] = frame.loc[scopus, "text"].str.split(",", n=2).str[2].str.strip()
+    return frame.dropna(subset=["text"]).sort_index(kind="stable")
+
+
+def extract_affiliation_entities(df: pd.DataFrame, id_column: str = "EID") -> pd.DataFrame:
+    """
+    Tabla (record_id, entry, institution, country) del dataset combinado ya normalizado.
+    Una fila por afiliación distinta del registro (entry = orden de aparición);
+    institution y country son Categorical. Si falta "Authors with affiliations" se usa
+    "Affiliations" (sin nombres de autor).
+    """
+    if df is None or df.empty:
+        return _empty_entities()
+    column = next((c for c in ("Authors with affiliations", "Affiliations") if c in df.columns), None)
+    if column is None:
+        return _empty_entities()
+
+    ids = record_ids(df, id_column, "record").reset_index(drop=True)
+    text = df[column].astype(object).where(df[column].notna(), None).reset_index(drop=True)
+    present = text.map(lambda v: isinstance(v, str))
+    text = text[present].astype(str)
+    is_wos = ids[present].str.startswith(WOS_ID_PREFIX) | text.str.startswith("[")
+    if column == "Affiliations":
+        # Sin nombres de autor: todas las entradas se leen como direcciones sueltas
+        is_wos[:] = True
+        text = text.str.replace(r"^\[", "", regex=True)
+
+    frame = _entries(text, is_wos)
+    if frame.empty:
+        return _empty_entities()
+    parts = frame["text"].str.split(",")
+
+    # País: última parte, sin estado/código postal delante
+    country = parts.str[-1].str.strip().str.replace(_POSTAL_PREFIX, "", regex=True).str.strip()
+    # Institución: WoS la pone primero; en Scopus, la primera parte con palabra clave
+    first = parts.str[0].str.strip()
+    keyword = pd.Series(pd.NA, index=frame.index, dtype=object)
+    for tier in INSTITUTION_TIERS:
+        found = frame["text"].str.extract(rf"(?i)(?:^|,)([^,]*(?:{tier})[^,]*)", expand=False)
+        keyword = keyword.fillna(found.str.strip())
+    institution = first.where(frame["is_wos"], keyword.fillna(first))
+    # Algunos exports de WoS traen el país en mayúsculas ("BELARUS")
+    country = country.where(~(country.str.isupper() & (country.str.len() > 3)), country.str.title())
+    # Una sola parte: no hay país aparte de la institución
+    single = parts.str.len() < 2
+    country = country.mask(single)
+
+    entities = pd.DataFrame({
+        "record_id": ids.to_numpy()[frame.index.to_numpy()],
+        "institution": institution.mask(institution == "").to_numpy(),
+        "country": country.mask(country == "").to_numpy(),
+    })
+    entities = entities.drop_duplicates().reset_index(drop=True)
+    entities.insert(1, "entry", entities.groupby("record_id", sort=False).cumcount().astype("int16"))
+    return _encode(entities)
+
+
+def _encode(entities: pd.DataFrame) -> pd.DataFrame:
+    entities["record_id"] = entities["record_id"].astype(str)
+    for column in ("institution", "country"):
+        entities[column] = entities[column].astype("category")
+    return entities[ENTITY_COLUMNS]
+
+
+def _empty_entities() -> pd.DataFrame:
+    empty = pd.DataFrame({c: pd.Series(dtype=object) for c in ENTITY_COLUMNS})
+    empty["entry"] = empty["entry"].astype("int16")
+    return _encode(empty)
+
+
+def records_per_value(entities: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Registros distintos por país/institución (un registro cuenta una vez por valor)."""
+    pairs = entities[["record_id", column]].dropna().drop_duplicates()
+    counts = pairs[column].value_counts(sort=True)
+    counts = counts[counts > 0]
+    return counts.rename_axis(column.capitalize()).reset_index(name="Records")
@@ -0,0 +1,110 @@
+# ============================================================
+# benchmarks/bench_canonical_titles.py
+#   - Dataset combinado real (Scopus + WoS normalizado, como main.py paso 7) y mapa
+#     ISSN -> Title del artefacto SCImago
+#   - Compara apply_scimago_canonical_titles anterior (df.apply fila a fila, lista de
+#     títulos SCImago rearmada en cada fila sin ISSN) con la actual (una vez por clave
+#     distinta + memo persistente), en frío y con el memo ya escrito
+#   - Verifica que el Source title resultante es idéntico
+#
+# Uso:
+#   python benchmarks/bench_canonical_titles.py [--repeat 3]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import config  # noqa: E402
+from bench_dedup_blocking import load_real_inputs  # noqa: E402
+from file_validation import build_default_paths  # noqa: E402
+from normalization import normalize_wos_to_scopus_schema  # noqa: E402
+from scimago_artifact import load_scimago_artifact  # noqa: E402
+from scimago_utils import apply_scimago_canonical_titles, safe_text  # noqa: E402
+
+
+# ----------------------------
+# Implementación anterior (referencia)
+# ----------------------------
+def legacy_row(row: pd.Series, scimago_map) -> str:
+    issn = safe_text(row.get("ISSN", "")).strip()
+    src = safe_text(row.get("Source", "")).strip().lower()
+    orig = safe_text(row.get("Source title", "")).strip()
+    if issn and (issn in scimago_map) and (src != "scopus"):
+        cand = safe_text(scimago_map.get(issn, "")).strip()
+        if cand:
+            return re.sub(r"\([^)]*\)", "", cand).strip()
+    if (not issn) and (src != "scopus") and orig and scimago_map:
+        best = process.extractOne(orig, list(scimago_map.values()), scorer=fuzz.token_sort_ratio)
+        if best:
+            best_title, score, _ = best
+            if isinstance(score, (int, float)) and score > 90 and isinstance(best_title, str):
+                return re.sub(r"\([^)]*\)", "", best_title).strip()
+    return re.sub(r"\([^)]*\)", "", orig).strip() if orig else orig
+
+
+def legacy_apply(df: pd.DataFrame, scimago_map) -> pd.DataFrame:
+    for col in ["ISSN", "Source", "Source title"]:
+        if col in df.columns:
+            df[col] = df[col].astype(object).where(~df[col].isna(), None)
+    if "Source" in df.columns:
+        df["Source"] = df["Source"].fillna("unknown")
+    df["Source title"] = df.apply(lambda r: legacy_row(r, scimago_map), axis=1)
+    return df
+
+
+def combined_dataset() -> pd.DataFrame:
+    scopus, wos = load_real_inputs()
+    _, wos_norm = normalize_wos_to_scopus_schema(wos)
+    return pd.concat([scopus, wos_norm], ignore_index=True)
+
+
+def timed(fn, df: pd.DataFrame, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        frame = df.copy()
+        t0 = time.perf_counter()
+        out = fn(frame)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Títulos canónicos SCImago: fila a fila vs por clave distinta")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones (se reporta la mejor)")
+    args = parser.parse_args()
+
+    df = combined_dataset()
+    scimago_map = load_scimago_artifact(build_default_paths(config.BASE_DIR)).issn_map
+    print(f"{len(df)} filas combinadas | {len(scimago_map)} ISSN SCImago")
+
+    expected, t_legacy = timed(lambda d: legacy_apply(d, scimago_map), df, 1)
+    print(f"anterior (df.apply)         : {t_legacy:7.2f} s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memo = Path(tmp) / "memo.json"
+        cold, t_cold = timed(lambda d: apply_scimago_canonical_titles(d, scimago_map, memo_path=None), df, args.repeat)
+        print(f"por clave, sin memo         : {t_cold:7.2f} s  ({t_legacy / t_cold:.0f}x)")
+        apply_scimago_canonical_titles(df.copy(), scimago_map, memo_path=memo)
+        warm, t_warm = timed(lambda d: apply_scimago_canonical_titles(d, scimago_map, memo_path=memo), df, args.repeat)
+        print(f"por clave, memo persistente : {t_warm:7.2f} s  ({t_legacy / t_warm:.0f}x)")
+
+    for label, actual in (("sin memo", cold), ("con memo", warm)):
+        pd.testing.assert_frame_equal(actual, expected)
+        assert actual["Source title"].tolist() == expected["Source title"].tolist(), label
+    changed = (expected["Source title"] != df["Source title"].fillna("")).sum()
+    print(f"OK: Source title idéntico ({changed} filas cambian respecto al export)")
+
+
+if __name__ == "__main__":
+    main()
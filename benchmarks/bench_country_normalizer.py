@@ -0,0 +1,154 @@
+# ============================================================
+# benchmarks/bench_country_normalizer.py
+#   - Normalización de países en afiliaciones sobre --rows strings (afiliaciones
+#     reales de FILES/ remuestreadas + alias inyectados con mayúsculas aleatorias):
+#       "re.sub x33": implementación anterior (un re.sub por alias, por fila, .apply)
+#       "una pasada": CountryNormalizer (alternancia compilada desde
+#                     data/country_aliases.json, una vez por valor distinto)
+#   - Verifica que ambas dan exactamente la misma salida (nulos incluidos)
+#
+# Uso:
+#   python benchmarks/bench_country_normalizer.py [--rows 100000]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_dedup_blocking import load_real_inputs  # noqa: E402
+from country_normalizer import get_country_normalizer  # noqa: E402
+
+# Textos que ejercitan cada alias (y casos límite: dentro de otras palabras, sufijos, nulos)
+ALIAS_SAMPLES = [
+    "USA", "u.s.a.", "United States of America", "united states", "UK", "U.K.", "United Kingdom",
+    "United Arab Emirates", "Republic of Korea", "Peoples R China", "Russian Federation", "England",
+    "SCOTLAND", "Wales", "New South Wales", "Northern Ireland", "Viet Nam", "Vietnam", "Côte d'Ivoire",
+    "Cote d'Ivoire", "Cote Ivoire", "Dominican Rep", "Dominican Republic", "Trinidad Tobago",
+    "Timor Leste", "St Vincent", "Germany (Democratic Republic, DDR)", "Sao Tome & Prin", "St Lucia",
+    "St Kitts & Nevi", "Papua N Guinea", "Guinea Bissau", "Cent Afr Republ", "Cape Verde", "Brunei",
+    "Brunei Darussalam", "Nigeria", "Niger", "DEM REP CONGO", "Democratic Republic of the Congo",
+    "Turkiye", "St Martin", "Saint Martin", "Busan", "Ukraine", "Pusan Natl Univ",
+]
+
+
+# ----------------------------
+# Implementación anterior (normalization.normalize_country antes de country_normalizer)
+# ----------------------------
+def legacy_normalize_country(text: str) -> str:
+    if not isinstance(text, str):
+        return text
+
+    text = re.sub(r'(?i)\b(?:usa|u\.s\.a\.|united states of america|united states)\b', 'United States', text)
+    text = re.sub(r'(?i)\b(?:uk|u\.k\.|united kingdom)\b', 'United Kingdom', text)
+    text = re.sub(r'(?i)\b(?:united arab emirates)\b', 'United Arab Emirates', text)
+    text = re.sub(r'(?i)\brepublic of korea\b', 'South Korea', text)
+    text = re.sub(r'(?i)\bpeoples r china\b', 'China', text)
+    text = re.sub(r'(?i)\brussian federation\b', 'Russia', text)
+    text = re.sub(r'(?i)\bengland\b', 'United Kingdom', text)
+    text = re.sub(r'(?i)\bScotland\b', 'United Kingdom', text)
+    text = re.sub(r'(?i)\bwales\b', 'United Kingdom', text)
+    text = re.sub(r'(?i)\bnorthern ireland\b', 'United Kingdom', text)
+    text = re.sub(r'(?i)\bviet\s?nam\b', 'Vietnam', text)
+    text = re.sub(r"(?i)\bCôte d'Ivoire\b", "Ivory Coast", text)
+    text = re.sub(r"(?i)\bCote d'Ivoire\b", "Ivory Coast", text)
+    text = re.sub(r"(?i)\bCote Ivoire\b", "Ivory Coast", text)
+    text = re.sub(r"(?i)\bDominican Rep\b", "Dominican Republic", text)
+    text = re.sub(r"(?i)\bTrinidad Tobago\b", "Trinidad and Tobago", text)
+    text = re.sub(r"(?i)\bTimor Leste\b", "Timor-Leste", text)
+    text = re.sub(r"(?i)\bSt Vincent\b", "Saint Vincent and the Grenadines", text)
+    text = re.sub(r"(?i)\bGermany \(Democratic Republic, DDR\)\b", "Germany", text)
+    text = re.sub(r"(?i)\bSao Tome & Prin\b", "Sao Tome and Principe", text)
+    text = re.sub(r"(?i)\bSt Lucia\b", "Saint Lucia", text)
+    text = re.sub(r"(?i)\bSt Kitts & Nevi\b", "Saint Kitts and Nevis", text)
+    text = re.sub(r"(?i)\bPapua N Guinea\b", "Papua New Guinea", text)
+    text = re.sub(r"(?i)\bGuinea Bissau\b", "Guinea-Bissau", text)
+    text = re.sub(r"(?i)\bCent Afr Republ\b", "Central African Republic", text)
+    text = re.sub(r"(?i)\bCape Verde\b", "Cabo Verde", text)
+    text = re.sub(r"(?i)\bBrunei\b", "Brunei Darussalam", text)
+    text = re.sub(r"(?i)\bNigeria\b", "Niger", text)
+    text = re.sub(r"(?i)\bDEM REP CONGO\b", "Congo", text)
+    text = re.sub(r"(?i)\bDemocratic Republic of the Congo\b", "Congo", text)
+    text = re.sub(r"(?i)\bTurkiye\b", "Turkey", text)
+    text = re.sub(r"(?i)\bSt Martin\b", "Saint Martin", text)
+    text = re.sub(r"(?i)\bSaint Martin\b", "Saint Martin", text)
+    return text
+
+
+def legacy_process_record_affiliations(record):
+    if pd.isna(record):
+        return record
+    record = str(record)
+    record = re.sub(r"\[(.*?)\]", lambda m: m.group(0).replace(",", ""), record)
+    return legacy_normalize_country(record)
+
+
+# ----------------------------
+# Datos
+# ----------------------------
+def random_case(text: str, rng: random.Random) -> str:
+    return rng.choice([text, text.lower(), text.upper(), text.title()])
+
+
+def affiliation_strings(rows: int, rng: random.Random) -> pd.Series:
+    """Afiliaciones reales (Scopus + WoS) remuestreadas; 30% con un alias inyectado, 2% nulas."""
+    scopus, wos = load_real_inputs()
+    pool = pd.concat([
+        scopus["Affiliations"], scopus["Authors with affiliations"], wos["Addresses"],
+    ]).dropna().astype(str).tolist()
+    values = []
+    for _ in range(rows):
+        r = rng.random()
+        if r < 0.02:
+            values.append(None if r < 0.01 else np.nan)
+            continue
+        text = rng.choice(pool)
+        if r < 0.32:
+            parts = text.split("; ")
+            k = rng.randrange(len(parts))
+            parts[k] = f"{parts[k]}, {random_case(rng.choice(ALIAS_SAMPLES), rng)}"
+            text = "; ".join(parts)
+        values.append(text)
+    return pd.Series(values, dtype=object)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Normalización de países en afiliaciones: re.sub x33 vs una pasada")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    values = affiliation_strings(args.rows, rng)
+    normalizer = get_country_normalizer()
+    print(f"{len(values)} afiliaciones | {values.nunique()} distintas | {len(normalizer.replacements)} alias")
+
+    # Cada alias suelto, en todas las variantes de mayúsculas
+    for sample in ALIAS_SAMPLES:
+        for variant in (sample, sample.lower(), sample.upper(), sample.title(), f"Univ X, {sample}, 1000"):
+            assert normalizer.normalize(variant) == legacy_normalize_country(variant), variant
+
+    t0 = time.perf_counter()
+    old = values.apply(legacy_process_record_affiliations)
+    t_old = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new = normalizer.normalize_affiliations(values)
+    t_new = time.perf_counter() - t0
+
+    print(f"re.sub x33 (.apply) {t_old:7.2f} s | una pasada {t_new:6.2f} s | speedup {t_old / t_new:5.1f}x")
+    assert old.isna().equals(new.isna()), "cambiaron los nulos"
+    assert old[old.notna()].equals(new[new.notna()]), "la salida cambió"
+    changed = int((old[old.notna()] != values[old.notna()]).sum())
+    print(f"salida idéntica: sí ({changed} afiliaciones modificadas por la normalización)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# ============================================================
+# benchmarks/bench_csv_engines.py
+#   - Tiempos de lectura con motor "c" vs "pyarrow" (csv_engine.read_csv)
+#     para los CSV de Scopus (schema.py) y scimago_unificado.csv (sep=';', coma decimal)
+#   - Verifica que ambos motores producen el mismo DataFrame
+#
+# Uso:
+#   python benchmarks/bench_csv_engines.py [--repeat 3]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+import csv_engine  # noqa: E402
+from file_validation import build_default_paths, scan_inputs  # noqa: E402
+from loaders import read_scopus_csv  # noqa: E402
+
+
+def best_of(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de motores CSV")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = build_default_paths(config.BASE_DIR)
+    inv = scan_inputs(paths)
+
+    jobs = {
+        "Scopus (todos los CSV)": lambda: pd.concat([read_scopus_csv(f) for f in inv.scopus_files], ignore_index=True),
+    }
+    if paths.scimago_file.exists():
+        jobs["SCImago"] = lambda: csv_engine.read_csv(paths.scimago_file, sep=";", decimal=",")
+
+    engines = ["c", "pyarrow"] if csv_engine.pyarrow_available() else ["c"]
+    for label, job in jobs.items():
+        results = {}
+        for engine in engines:
+            config.CSV_ENGINE = engine
+            results[engine], t = best_of(job, args.repeat)
+            print(f"{label:24s} {engine:8s} {t:6.2f} s  ({len(results[engine])} filas)")
+        if len(results) == 2:
+            pd.testing.assert_frame_equal(results["c"], results["pyarrow"])
+            print(f"{label:24s} resultados idénticos")
+
+
+if __name__ == "__main__":
+    main()
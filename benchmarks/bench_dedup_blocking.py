@@ -0,0 +1,234 @@
+# ============================================================
+# benchmarks/bench_dedup_blocking.py
+#   - recall: el índice solo filtra candidatos (el matcher es el mismo), así que su
+#             recall se mide sobre matches confirmados por el modo "bruteforce":
+#               1) FILES/: IDs de WoS duplicados de bruteforce vs blocking y margen de
+#                  q-gramas compartidos (mínimo de los pares vs min_shared)
+#               2) casi-duplicados sintéticos de títulos reales (typos, palabras
+#                  unidas/movidas/omitidas, traducción agregada) que bruteforce acepta
+#             La precisión (pares que NO deben ser duplicados) está en
+#             check_dedup_year_shadowing.py. Falla si el índice pierde algún match.
+#   - scale:  tiempos con registros sintéticos (10k / 50k / 200k títulos Scopus,
+#             la mitad de candidatos WoS con 30% de casi-duplicados). El modo
+#             bruteforce se mide sobre una muestra y se extrapola.
+#   Todo en un solo proceso (process_chunk directo) para comparar por núcleo.
+#
+# Uso:
+#   python benchmarks/bench_dedup_blocking.py recall
+#   python benchmarks/bench_dedup_blocking.py scale [--sizes 10000 50000 200000]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from dedup_blocking import qgrams  # noqa: E402
+from deduplication import (  # noqa: E402
+    CANDIDATE_INDEXES,
+    WOS_ID_COLUMN,
+    FuzzyCandidates,
+    build_candidate_index,
+    index_method,
+    init_worker,
+    process_chunk,
+    record_ids,
+    release_worker,
+    share_reference,
+)
+
+
+def to_candidates(records) -> FuzzyCandidates:
+    """Registros del benchmark (dicts) -> arreglos paralelos que recibe process_chunk."""
+    return FuzzyCandidates(
+        row_ids=np.array([r["row_id"] for r in records], dtype=object),
+        titles=np.array([r["processed_title"] for r in records], dtype=object),
+        years=np.array([r["year"] for r in records], dtype=float),
+    )
+
+
+def fuzzy_duplicates(s_titles, s_years, candidates, threshold, method, pairs=False):
+    """
+    IDs de WoS duplicados (un proceso) y segundos usados, incluida la construcción del índice.
+    pairs=True: dict row_id de WoS -> posición del match en Scopus.
+    """
+    t0 = time.perf_counter()
+    index = None
+    if method in CANDIDATE_INDEXES:
+        index = build_candidate_index(method, s_titles, s_years)
+    with share_reference(s_titles, s_years, index) as reference:
+        init_worker(reference.handle, index_method(index))
+        found = {row_id: pos for row_id, pos, _ in process_chunk(to_candidates(candidates), threshold)}
+        release_worker()
+    return (found if pairs else set(found)), time.perf_counter() - t0
+
+
+# ----------------------------
+# recall (datos reales)
+# ----------------------------
+def load_real_inputs():
+    from file_validation import build_default_paths, scan_inputs
+    from loaders import load_merge_scopus, load_merge_wos
+
+    inv = scan_inputs(build_default_paths(config.BASE_DIR))
+    scopus, _ = load_merge_scopus(inv.scopus_files, inv.fingerprints)
+    wos, _ = load_merge_wos(inv.wos_files, inv.fingerprints)
+    return scopus, wos
+
+
+def fuzzy_inputs(scopus: pd.DataFrame, wos: pd.DataFrame):
+    """Mismas listas que arma cross_deduplicate para la fase fuzzy (sin la fase DOI)."""
+    s_titles = scopus["processed_title"].tolist()
+    s_years = pd.to_numeric(scopus["Year"], errors="coerce").tolist()
+    w_years = pd.to_numeric(wos["Publication Year"], errors="coerce").tolist()
+    w_ids = record_ids(wos, WOS_ID_COLUMN, "wos").tolist()
+    candidates = [
+        {"row_id": i, "processed_title": t, "year": y}
+        for i, t, y in zip(w_ids, wos["processed_title"], w_years)
+    ]
+    return s_titles, s_years, candidates
+
+
+def shared_fraction(a: str, b: str) -> float:
+    """Fracción de q-gramas compartidos sobre el título más corto (la que filtra el índice)."""
+    ga, gb = qgrams(a, config.DEDUP_QGRAM), qgrams(b, config.DEDUP_QGRAM)
+    return len(ga & gb) / min(len(ga), len(gb))
+
+
+def near_duplicate(title: str, pool, rng: random.Random) -> str:
+    """Variante realista de un título: typos, palabras unidas/movidas/omitidas o traducción agregada."""
+    words = title.split()
+    kind = rng.random()
+    if kind < 0.25:
+        chars = list(title)
+        for _ in range(rng.randint(1, 3)):
+            chars[rng.randrange(len(chars))] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        return "".join(chars)
+    if kind < 0.45:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+        return " ".join(words)
+    if kind < 0.6:
+        del words[rng.randrange(len(words))]
+        return " ".join(words)
+    if kind < 0.8:
+        return f"{title} {rng.choice(pool)}"
+    return title.replace(" ", "", 1)
+
+
+def run_recall(args) -> None:
+    scopus, wos = load_real_inputs()
+    s_titles, s_years, candidates = fuzzy_inputs(scopus, wos)
+    threshold = config.FUZZY_THRESHOLD
+    print(f"Scopus {len(s_titles)} | WoS {len(candidates)} | umbral {threshold} | "
+          f"min_shared {config.DEDUP_MIN_SHARED_QGRAMS}")
+
+    # 1) FILES/: mismo matcher y misma regla de año; la única diferencia es el filtro de q-gramas
+    brute, t_brute = fuzzy_duplicates(s_titles, s_years, candidates, threshold, "bruteforce", pairs=True)
+    blocked, t_block = fuzzy_duplicates(s_titles, s_years, candidates, threshold, "blocking", pairs=True)
+    print(f"bruteforce (año ±1, sin índice)  {len(brute):6d} duplicados {t_brute:8.2f} s")
+    print(f"blocking   (año ±1 + q-gramas)   {len(blocked):6d} duplicados {t_block:8.2f} s | "
+          f"speedup {t_brute / t_block:.1f}x")
+
+    titles = {c["row_id"]: c["processed_title"] for c in candidates}
+    fractions = [shared_fraction(titles[w], s_titles[s]) for w, s in brute.items()]
+    print(f"q-gramas compartidos en matches confirmados: mínimo {min(fractions, default=1):.3f} "
+          f"(min_shared {config.DEDUP_MIN_SHARED_QGRAMS})")
+    missing = brute.keys() - blocked.keys()
+    print(f"recall del índice (FILES/): {1 - len(missing) / max(1, len(brute)):.4f} "
+          f"(faltan {len(missing)}, extra {len(blocked.keys() - brute.keys())})")
+    for row_id in sorted(missing)[: args.show]:
+        print(f"   falta: {row_id} {titles[row_id][:90]}")
+    assert not missing, "el índice de bloqueo perdió duplicados del modo bruteforce"
+    assert not blocked.keys() - brute.keys(), "el índice de bloqueo encontró duplicados fuera del modo bruteforce"
+
+    # 2) Casi-duplicados sintéticos de títulos de Scopus (mismo año)
+    rng = random.Random(0)
+    pool = [t for t in s_titles if len(str(t).split()) >= 3]
+    picks = [rng.randrange(len(s_titles)) for _ in range(args.synthetic)]
+    picks = [j for j in picks if len(str(s_titles[j]).split()) >= 3]
+    variants = [
+        {"row_id": f"syn:{k}", "processed_title": near_duplicate(s_titles[j], pool, rng), "year": s_years[j]}
+        for k, j in enumerate(picks)
+    ]
+    brute_syn, _ = fuzzy_duplicates(s_titles, s_years, variants, threshold, "bruteforce")
+    blocked_syn, _ = fuzzy_duplicates(s_titles, s_years, variants, threshold, "blocking")
+    missing = brute_syn - blocked_syn
+    print(f"recall del índice (sintético): {1 - len(missing) / max(1, len(brute_syn)):.4f} "
+          f"({len(brute_syn)} de {len(variants)} variantes aceptadas por bruteforce, faltan {len(missing)})")
+    assert not missing, "el índice de bloqueo perdió casi-duplicados sintéticos"
+
+
+# ----------------------------
+# scale (sintético)
+# ----------------------------
+def synthetic(n: int, pool, rng: random.Random):
+    vocab = sorted({w for t in pool for w in t.split()})
+    s_titles, s_years = [], []
+    for _ in range(n):
+        words = rng.choice(pool).split()
+        k = max(1, len(words) // 2)
+        for i in rng.sample(range(len(words)), min(k, len(words))):
+            words[i] = rng.choice(vocab)
+        s_titles.append(" ".join(words))
+        s_years.append(float(rng.randint(config.YEAR_START, config.YEAR_FINAL)))
+
+    candidates = []
+    for _ in range(n // 2):
+        if rng.random() < 0.3:
+            j = rng.randrange(n)
+            title = list(s_titles[j])
+            pos = rng.randrange(len(title))
+            title[pos] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+            candidates.append({"row_id": f"wos:{len(candidates)}", "processed_title": "".join(title),
+                               "year": s_years[j] + rng.choice((-1, 0, 0, 1))})
+        else:
+            words = rng.choice(pool).split()
+            rng.shuffle(words)
+            candidates.append({"row_id": f"wos:{len(candidates)}", "processed_title": " ".join(words),
+                               "year": float(rng.randint(config.YEAR_START, config.YEAR_FINAL))})
+    return s_titles, s_years, candidates
+
+
+def run_scale(args) -> None:
+    scopus, wos = load_real_inputs()
+    pool = [t for t in pd.concat([scopus["processed_title"], wos["processed_title"]]).dropna().unique() if len(t.split()) >= 4]
+    rng = random.Random(0)
+
+    print(f"{'Scopus':>8s} {'WoS':>8s} | {'blocking':>10s} | {'bruteforce (est.)':>18s} | speedup | muestra igual")
+    for n in args.sizes:
+        s_titles, s_years, candidates = synthetic(n, pool, rng)
+        blocked, t_block = fuzzy_duplicates(s_titles, s_years, candidates, config.FUZZY_THRESHOLD, "blocking")
+
+        sample = candidates[: args.sample]
+        brute_sample, t_sample = fuzzy_duplicates(s_titles, s_years, sample, config.FUZZY_THRESHOLD, "bruteforce")
+        t_brute = t_sample * len(candidates) / len(sample)
+        sample_ids = {c["row_id"] for c in sample}
+        same = brute_sample == blocked & sample_ids
+        print(f"{n:8d} {len(candidates):8d} | {t_block:8.2f} s | {t_brute:16.1f} s | {t_brute / t_block:6.1f}x | "
+              f"{'sí' if same else 'NO'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recall y escalado del índice de bloqueo de deduplicación")
+    parser.add_argument("command", choices=["recall", "scale"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--sample", type=int, default=300, help="Consultas WoS para estimar bruteforce")
+    parser.add_argument("--show", type=int, default=10, help="Títulos de ejemplo a mostrar")
+    parser.add_argument("--synthetic", type=int, default=3000, help="Casi-duplicados sintéticos (recall)")
+    args = parser.parse_args()
+
+    np.random.seed(0)
+    {"recall": run_recall, "scale": run_scale}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
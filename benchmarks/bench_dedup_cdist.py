@@ -0,0 +1,58 @@
+# ============================================================
+# benchmarks/bench_dedup_cdist.py
+#   - cross_deduplicate completo (DOI + fuzzy) con los datos de FILES/:
+#     "bruteforce" (ProcessPoolExecutor + extractOne), "blocking" y "cdist"
+#     (matriz rapidfuzz.process.cdist, uint8, workers=-1), mismo umbral
+#   - Verifica que los tres modos marcan los mismos registros de WoS (ledger)
+#
+# Uso:
+#   python benchmarks/bench_dedup_cdist.py [--threshold 85]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import config  # noqa: E402
+from bench_dedup_blocking import load_real_inputs  # noqa: E402
+from deduplication import cross_deduplicate  # noqa: E402
+
+
+def timed(scopus, wos, threshold, method):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ledger = cross_deduplicate(scopus, wos, threshold, method=method)
+    return set(ledger["wos_row_id"]), time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del modo matriz (cdist) de deduplicación")
+    parser.add_argument("--threshold", type=int, default=config.FUZZY_THRESHOLD)
+    args = parser.parse_args()
+
+    scopus, wos = load_real_inputs()
+    print(f"Scopus {len(scopus)} | WoS {len(wos)} | umbral {args.threshold}")
+
+    results = {}
+    for method in ("bruteforce", "blocking", "cdist"):
+        found, secs = timed(scopus, wos, args.threshold, method)
+        results[method] = (found, secs)
+
+    t_ref = results["bruteforce"][1]
+    for method, (found, secs) in results.items():
+        print(f"{method:10s} {len(found):6d} duplicados {secs:8.2f} s | speedup {t_ref / secs:6.1f}x")
+
+    assert results["cdist"][0] == results["bruteforce"][0], "cdist y bruteforce difieren"
+    assert results["blocking"][0] == results["bruteforce"][0], "blocking y bruteforce difieren"
+    print("bruteforce == blocking == cdist: sí")
+
+
+if __name__ == "__main__":
+    main()
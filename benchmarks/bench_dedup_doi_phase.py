@@ -0,0 +1,121 @@
+# ============================================================
+# benchmarks/bench_dedup_doi_phase.py
+#   - Fase DOI + armado de candidatos de cross_deduplicate con 100k filas sintéticas:
+#       "iterrows":    implementación anterior (dos pasadas wos_df.iterrows(), dict
+#                      de DOIs de Scopus, lista de dicts de candidatos)
+#       "vectorizada": normalize_doi + hash join (doi_positions) + máscaras,
+#                      candidatos como arreglos NumPy (FuzzyCandidates)
+#   - Verifica que ambas dan los mismos matches con DOIs sin prefijo, y cuenta los
+#     matches extra que aporta quitar prefijos (https://doi.org/, doi:)
+#
+# Uso:
+#   python benchmarks/bench_dedup_doi_phase.py [--rows 100000]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deduplication import FuzzyCandidates, doi_positions, normalize_doi  # noqa: E402
+
+PREFIXES = ["https://doi.org/", "http://dx.doi.org/", "doi:", "DOI: "]
+
+
+def synthetic(rows: int, prefixed: float, rng: np.random.Generator):
+    """Scopus y WoS de `rows` filas; 60% de WoS comparte DOI con Scopus, 10% sin DOI."""
+    s_doi = np.array([f"10.{1000 + i % 9000}/j.{i:07d}" for i in range(rows)], dtype=object)
+    scopus = pd.DataFrame({"DOI": s_doi, "processed_title": [f"title {i}" for i in range(rows)]})
+
+    w_doi = np.array([f"10.9999/w.{i:07d}" for i in range(rows)], dtype=object)
+    shared = rng.random(rows) < 0.6
+    w_doi[shared] = s_doi[rng.integers(0, rows, shared.sum())]
+    w_doi[rng.random(rows) < 0.1] = ""
+    # Mayúsculas/espacios como en los exports, y una fracción con prefijo de resolvedor
+    upper = rng.random(rows) < 0.2
+    w_doi[upper] = [f" {d.upper()} " for d in w_doi[upper]]
+    pref = (rng.random(rows) < prefixed) & (w_doi != "")
+    w_doi[pref] = [PREFIXES[i % len(PREFIXES)] + d.strip() for i, d in enumerate(w_doi[pref])]
+    wos = pd.DataFrame({
+        "DOI": w_doi,
+        "processed_title": [f"wos title {i}" for i in range(rows)],
+        "Publication Year": rng.integers(2000, 2025, rows).astype(float),
+    })
+    return scopus, wos
+
+
+def iterrows_phases(scopus_df, wos_df, wos_ids, wos_years):
+    """Implementación anterior: posición Scopus por fila de WoS (-1 = sin match) y candidatos."""
+    scopus_doi_pos = {}
+    for pos, doi in enumerate(scopus_df["DOI"]):
+        if pd.notna(doi):
+            scopus_doi_pos.setdefault(str(doi).lower().strip(), pos)
+    scopus_doi_pos.pop("", None)
+
+    matched = np.full(len(wos_df), -1, dtype=np.int64)
+    found = set()
+    for idx, wrow in wos_df.iterrows():
+        wdoi = str(wrow.get("DOI", "")).lower().strip()
+        if wdoi and wdoi in scopus_doi_pos:
+            matched[idx] = scopus_doi_pos[wdoi]
+            found.add(idx)
+
+    candidates = []
+    for idx, wrow in wos_df.iterrows():
+        if idx in found:
+            continue
+        candidates.append({"row_id": wos_ids[idx], "processed_title": wrow.get("processed_title", ""), "year": wos_years[idx]})
+    return matched, candidates
+
+
+def vectorized_phases(scopus_df, wos_df, wos_ids, wos_years):
+    matched = doi_positions(normalize_doi(scopus_df["DOI"]), normalize_doi(wos_df["DOI"]))
+    rest = matched < 0
+    candidates = FuzzyCandidates(
+        row_ids=wos_ids[rest],
+        titles=wos_df["processed_title"].fillna("").astype(str).to_numpy(dtype=object)[rest],
+        years=wos_years[rest],
+    )
+    return matched, candidates
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark de la fase DOI de cross_deduplicate")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"Scopus {args.rows} | WoS {args.rows}")
+    for label, prefixed in (("DOIs sin prefijo", 0.0), ("15% con prefijo", 0.15)):
+        scopus, wos = synthetic(args.rows, prefixed, rng)
+        wos_ids = np.array([f"WOS:{i}" for i in range(len(wos))], dtype=object)
+        wos_years = wos["Publication Year"].to_numpy(dtype=float)
+
+        (old, old_cand), t_old = timed(iterrows_phases, scopus, wos, wos_ids, wos_years)
+        (new, new_cand), t_new = timed(vectorized_phases, scopus, wos, wos_ids, wos_years)
+        print(f"{label:18s} iterrows {t_old:7.2f} s | vectorizada {t_new:6.3f} s | speedup {t_old / t_new:6.0f}x | "
+              f"DOI match {int((old >= 0).sum())} -> {int((new >= 0).sum())}")
+
+        if prefixed == 0.0:
+            assert np.array_equal(old, new), "la fase vectorizada cambió los matches por DOI"
+            assert [c["row_id"] for c in old_cand] == new_cand.row_ids.tolist(), "candidatos distintos"
+        else:
+            # Quitar prefijos solo agrega matches: los anteriores se conservan
+            assert np.array_equal(new[old >= 0], old[old >= 0]), "se perdieron matches por DOI"
+    print("iterrows == vectorizada (sin prefijos): sí")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# ============================================================
+# benchmarks/bench_dedup_incremental.py
+#   - Índice persistente de deduplicación (dedup_index.py) con registros sintéticos:
+#       1) cálculo completo: 100k títulos Scopus x N WoS -> construye el índice
+#       2) ejecución incremental: +500 WoS nuevos (30% casi-duplicados)
+#          y +100 Scopus nuevos contra el índice guardado
+#       3) recalculo completo (rebuild) con los mismos datos, como referencia
+#   - Verifica que la incremental marca los mismos registros de WoS que el
+#     recalculo completo
+#   - El índice se guarda en un directorio temporal (no toca CACHE/)
+#
+# Uso:
+#   python benchmarks/bench_dedup_incremental.py [--scopus 100000] [--wos 5000] [--new 500] [--threshold 95]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import config  # noqa: E402
+from bench_dedup_blocking import load_real_inputs, synthetic  # noqa: E402
+from dedup_index import incremental_deduplicate  # noqa: E402
+
+
+def scopus_frame(titles, years, start: int = 0) -> pd.DataFrame:
+    return pd.DataFrame({
+        "EID": [f"2-s2.0-{start + i}" for i in range(len(titles))],
+        "processed_title": titles,
+        "Year": years,
+        "DOI": None,
+    })
+
+
+def wos_frame(candidates, start: int = 0) -> pd.DataFrame:
+    return pd.DataFrame({
+        "UT (Unique WOS ID)": [f"WOS:{start + i}" for i in range(len(candidates))],
+        "processed_title": [c["processed_title"] for c in candidates],
+        "Publication Year": [c["year"] for c in candidates],
+        "DOI": None,
+    })
+
+
+def timed(scopus, wos, threshold: int, method: str, rebuild: bool):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ledger = incremental_deduplicate(scopus, wos, threshold, method=method, rebuild=rebuild)
+    return ledger, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de la deduplicación incremental con índice persistente")
+    parser.add_argument("--scopus", type=int, default=100_000, help="Registros Scopus del índice")
+    parser.add_argument("--wos", type=int, default=5_000, help="Registros WoS ya comparados")
+    parser.add_argument("--new", type=int, default=500, help="Registros WoS nuevos en la actualización")
+    parser.add_argument("--new-scopus", type=int, default=100, help="Registros Scopus nuevos en la actualización")
+    parser.add_argument("--method", default="blocking", choices=["bruteforce", "blocking", "cdist"])
+    # Umbral del fuzzy match (los casi-duplicados sintéticos tienen un solo typo)
+    parser.add_argument("--threshold", type=int, default=config.FUZZY_THRESHOLD)
+    args = parser.parse_args()
+
+    config.DEDUP_PROGRESS_SECONDS = float("inf")
+    scopus, wos = load_real_inputs()
+    pool = [t for t in pd.concat([scopus["processed_title"], wos["processed_title"]]).dropna().unique() if len(t.split()) >= 4]
+    rng = random.Random(0)
+
+    total = args.scopus + args.new_scopus
+    s_titles, s_years, candidates = synthetic(total, pool, rng)
+    while len(candidates) < args.wos + args.new:
+        candidates += synthetic(total, pool, rng)[2]
+    candidates = candidates[: args.wos + args.new]
+
+    scopus_old = scopus_frame(s_titles[: args.scopus], s_years[: args.scopus])
+    scopus_all = scopus_frame(s_titles, s_years)
+    wos_old = wos_frame(candidates[: args.wos])
+    wos_all = wos_frame(candidates)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.DEDUP_INDEX_DIR = Path(tmp)
+        print(f"Índice: Scopus {args.scopus} | WoS {args.wos} | método {args.method} | umbral {args.threshold} | "
+              f"actualización: +{args.new} WoS, +{args.new_scopus} Scopus")
+
+        _, t_build = timed(scopus_old, wos_old, args.threshold, args.method, rebuild=True)
+        incremental, t_inc = timed(scopus_all, wos_all, args.threshold, args.method, rebuild=False)
+        full, t_full = timed(scopus_all, wos_all, args.threshold, args.method, rebuild=True)
+        index_mb = sum(f.stat().st_size for f in Path(tmp).iterdir()) / 1e6
+
+    print(f"cálculo completo inicial   {t_build:8.2f} s")
+    print(f"incremental (+{args.new:d} WoS)    {t_inc:8.2f} s | {len(incremental)} duplicados")
+    print(f"recalculo completo         {t_full:8.2f} s | {len(full)} duplicados | speedup {t_full / t_inc:.1f}x")
+    print(f"tamaño del índice en disco {index_mb:8.1f} MB")
+
+    inc_ids, full_ids = set(incremental["wos_row_id"]), set(full["wos_row_id"])
+    assert inc_ids == full_ids, f"WoS distintos: faltan {len(full_ids - inc_ids)}, extra {len(inc_ids - full_ids)}"
+    # Un WoS ya emparejado conserva su par aunque aparezca un Scopus nuevo con mejor puntaje
+    differ = len(set(zip(incremental["wos_row_id"], incremental["scopus_row_id"]))
+                 - set(zip(full["wos_row_id"], full["scopus_row_id"])))
+    print(f"WoS duplicados incremental == completo: sí ({differ} con otro par de Scopus)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# ============================================================
+# benchmarks/bench_dedup_intra.py
+#   - real:  con los datos de FILES/, pares de casi-duplicados (fuzz.ratio) dentro de
+#            Scopus y dentro de WoS con "bruteforce" (exacto), "blocking" y "minhash".
+#            Verifica que blocking da exactamente los pares de bruteforce y muestra
+#            los grupos encontrados
+#   - scale: fuente sintética de --rows registros (títulos de palabras del vocabulario
+#            real) con una fracción de casi-duplicados inyectados (typos, palabra
+#            omitida, erratum). Tiempo de fuzzy_intra_deduplicate completo, registros
+#            eliminados, recall sobre los inyectados y eliminaciones falsas
+#
+# Uso:
+#   python benchmarks/bench_dedup_intra.py real
+#   python benchmarks/bench_dedup_intra.py scale [--rows 100000] [--methods blocking minhash]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import config  # noqa: E402
+from bench_dedup_blocking import load_real_inputs  # noqa: E402
+from dedup_intra import fuzzy_intra_deduplicate  # noqa: E402
+from deduplication import (  # noqa: E402
+    FuzzyCandidates,
+    build_candidate_index,
+    parallel_matches,
+    run_self_chunk,
+)
+
+METHODS = ["bruteforce", "blocking", "minhash"]
+
+
+def self_pairs(titles, years, method: str):
+    """Pares (i, j) con fuzz.ratio >= umbral y año compatible, y segundos."""
+    t0 = time.perf_counter()
+    index = None
+    if method != "bruteforce":
+        index = build_candidate_index(method, titles, years, min_shared=config.DEDUP_INTRA_MIN_SHARED_QGRAMS)
+    candidates = FuzzyCandidates(np.arange(len(titles)), np.array(titles, dtype=object), np.asarray(years, dtype=float))
+    pairs = parallel_matches(run_self_chunk, candidates, titles, years, config.DEDUP_INTRA_THRESHOLD, index, method)
+    return {(i, j) for i, j, _ in pairs}, time.perf_counter() - t0
+
+
+# ----------------------------
+# real (FILES/)
+# ----------------------------
+def run_real(args) -> None:
+    scopus, wos = load_real_inputs()
+    for label, df, year_column in (("Scopus", scopus, "Year"), ("WoS", wos, "Publication Year")):
+        titles = df["processed_title"].fillna("").astype(str).tolist()
+        years = pd.to_numeric(df[year_column], errors="coerce").to_numpy(dtype=float)
+        found = {}
+        for method in METHODS:
+            found[method], secs = self_pairs(titles, years, method)
+            recall = len(found[method] & found["bruteforce"]) / max(1, len(found["bruteforce"]))
+            print(f"{label:6s} {len(titles):6d} | {method:10s} | pares {len(found[method]):4d} | "
+                  f"recall {recall:.3f} | {secs:6.2f} s")
+        assert found["blocking"] == found["bruteforce"], "blocking perdió pares de bruteforce"
+        for i, j in sorted(found["bruteforce"]):
+            print(f"   {titles[i][:70]}\n   {titles[j][:70]}\n")
+
+
+# ----------------------------
+# scale (sintético)
+# ----------------------------
+def mutate(title: str, rng: random.Random) -> str:
+    """Casi-duplicado: typo (un carácter), palabra omitida o sufijo de erratum."""
+    kind = rng.random()
+    if kind < 0.5:
+        k = rng.randrange(len(title))
+        return title[:k] + rng.choice("aeiourstn") + title[k + 1:]
+    words = title.split()
+    if kind < 0.8 and len(words) > 8:
+        del words[rng.randrange(len(words))]
+        return " ".join(words)
+    return title + " erratum"
+
+
+def synthetic_source(rows: int, dup_fraction: float, vocab, rng: random.Random) -> pd.DataFrame:
+    """Registros con título de 8-14 palabras; `dup_fraction` son variantes de otro registro."""
+    n_dups = int(rows * dup_fraction)
+    titles, years, dup_of = [], [], []
+    for _ in range(rows - n_dups):
+        titles.append(" ".join(rng.choices(vocab, k=rng.randint(8, 14))))
+        years.append(float(rng.randint(2000, 2024)))
+        dup_of.append(-1)
+    for _ in range(n_dups):
+        src = rng.randrange(rows - n_dups)
+        titles.append(mutate(titles[src], rng))
+        years.append(years[src] + rng.choice((0, 0, 1)))
+        dup_of.append(src)
+    return pd.DataFrame({
+        "processed_title": titles,
+        "Year": years,
+        "DOI": [f"10.1/{i}" if rng.random() < 0.7 else "" for i in range(rows)],
+        "Cited by": [rng.randint(0, 50) for _ in range(rows)],
+        "dup_of": dup_of,
+    })
+
+
+def run_scale(args) -> None:
+    scopus, wos = load_real_inputs()
+    vocab = sorted({w for t in pd.concat([scopus["processed_title"], wos["processed_title"]]).dropna() for w in t.split()})
+    rng = random.Random(0)
+    df = synthetic_source(args.rows, args.dup_fraction, vocab, rng)
+    injected = df["dup_of"] >= 0
+    print(f"{args.rows} registros | {int(injected.sum())} casi-duplicados inyectados | vocabulario {len(vocab)} | "
+          f"ratio >= {config.DEDUP_INTRA_THRESHOLD}")
+
+    for method in args.methods:
+        t0 = time.perf_counter()
+        kept = fuzzy_intra_deduplicate(df, "Synthetic", "Year", ["Cited by"], method=method)
+        secs = time.perf_counter() - t0
+        removed = ~df.index.isin(kept.index)
+        # Por grupo (original + variantes) debe quedar uno: cuenta grupos que conservan más de uno
+        group = np.where(injected, df["dup_of"], np.arange(len(df)))
+        left = pd.Series(group[~removed]).value_counts()
+        merged = 1 - (left > 1).sum() / max(1, pd.Series(group[injected.to_numpy()]).nunique())
+        false_removed = int((removed & ~np.isin(group, group[injected.to_numpy()])).sum())
+        print(f"{method:10s} | {secs:7.1f} s | eliminados {int(removed.sum()):6d} | "
+              f"grupos inyectados resueltos {merged:.3f} | eliminaciones fuera de grupo {false_removed}")
+        assert secs < args.budget, f"{method}: {secs:.0f} s supera el presupuesto de {args.budget} s"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Deduplicación fuzzy interna de una fuente (dedup_intra)")
+    parser.add_argument("command", choices=["real", "scale"])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dup-fraction", type=float, default=0.05)
+    parser.add_argument("--methods", nargs="+", default=["blocking", "minhash"])
+    parser.add_argument("--budget", type=float, default=600, help="Segundos máximos por método (scale)")
+    args = parser.parse_args()
+    {"real": run_real, "scale": run_scale}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
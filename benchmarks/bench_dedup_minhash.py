@@ -0,0 +1,153 @@
+# ============================================================
+# benchmarks/bench_dedup_minhash.py
+#   - quality: con los datos de FILES/, fuzzy match de todos los títulos de WoS
+#              con el motor exacto ("bruteforce": WRatio contra todo Scopus de año
+#              compatible) y con "minhash" para varias configuraciones
+#              (num_perm x bands). Precisión / recall sobre los IDs de WoS
+#              marcados, candidatos por consulta y tiempo. Mismo matcher confirmado
+#              (deduplication.confirm_match) en ambos: minhash solo puede perder
+#              matches, nunca agregar; falla si la precisión es < 1.
+#   - scale:   registros sintéticos (50k / 200k / 500k títulos Scopus): tiempo de
+#              construcción, tamaño del índice, pico de memoria (tracemalloc) y
+#              consultas/s de "minhash" frente a "blocking" (referencia exacta a
+#              gran escala; bruteforce no es viable). blocking solo hasta --blocking-max.
+#   Todo en un solo proceso (process_chunk directo) para comparar por núcleo.
+#
+# Uso:
+#   python benchmarks/bench_dedup_minhash.py quality [--configs 64x32 64x16 128x32]
+#   python benchmarks/bench_dedup_minhash.py scale [--sizes 50000 200000 500000]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import config  # noqa: E402
+from bench_dedup_blocking import fuzzy_duplicates, fuzzy_inputs, load_real_inputs, synthetic  # noqa: E402
+from deduplication import build_candidate_index  # noqa: E402
+
+
+def set_minhash(cfg: str) -> None:
+    perm, bands = (int(v) for v in cfg.split("x"))
+    config.DEDUP_MINHASH_PERM, config.DEDUP_MINHASH_BANDS = perm, bands
+
+
+def index_nbytes(index) -> int:
+    if hasattr(index, "nbytes"):
+        return index.nbytes
+    return sum(getattr(index, name).nbytes for name in ("order", "years", "gram_counts", "postings", "indptr"))
+
+
+def candidates_per_query(index, candidates) -> float:
+    total = sum(len(index.candidates(c["processed_title"], c["year"])) for c in candidates)
+    return total / max(1, len(candidates))
+
+
+# ----------------------------
+# quality (datos reales)
+# ----------------------------
+def run_quality(args) -> None:
+    scopus, wos = load_real_inputs()
+    s_titles, s_years, candidates = fuzzy_inputs(scopus, wos)
+    threshold = config.FUZZY_THRESHOLD
+    print(f"Scopus {len(s_titles)} | WoS {len(candidates)} | umbral {threshold}")
+
+    exact, t_exact = fuzzy_duplicates(s_titles, s_years, candidates, threshold, "bruteforce")
+    print(f"{'motor':18s} {'marcados':>8s} {'precisión':>9s} {'recall':>7s} {'cand/consulta':>13s} {'tiempo':>9s}")
+    print(f"{'bruteforce (exacto)':18s} {len(exact):8d} {1:9.3f} {1:7.3f} {len(s_titles):13.0f} {t_exact:7.2f} s")
+
+    titles = {c["row_id"]: c["processed_title"] for c in candidates}
+    for cfg in args.configs:
+        set_minhash(cfg)
+        found, secs = fuzzy_duplicates(s_titles, s_years, candidates, threshold, "minhash")
+        per_query = candidates_per_query(build_candidate_index("minhash", s_titles, s_years), candidates)
+        hit = len(found & exact)
+        precision = hit / max(1, len(found))
+        recall = hit / max(1, len(exact))
+        rows = config.DEDUP_MINHASH_PERM // config.DEDUP_MINHASH_BANDS
+        label = f"minhash {cfg} (J~{(1 / config.DEDUP_MINHASH_BANDS) ** (1 / rows):.2f})"
+        print(f"{label:18s} {len(found):8d} {precision:9.3f} {recall:7.3f} {per_query:13.1f} {secs:7.2f} s")
+        for row_id in sorted(exact - found)[: args.show]:
+            print(f"   falta: {titles[row_id][:90]}")
+        assert not found - exact, f"minhash {cfg} marcó registros que bruteforce rechaza: {sorted(found - exact)[:5]}"
+
+
+# ----------------------------
+# scale (sintético)
+# ----------------------------
+def build_measured(method: str, s_titles, s_years):
+    """Índice, segundos de construcción y pico de memoria (MB) de una segunda construcción trazada."""
+    t0 = time.perf_counter()
+    index = build_candidate_index(method, s_titles, s_years)
+    secs = time.perf_counter() - t0
+    tracemalloc.start()
+    build_candidate_index(method, s_titles, s_years)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return index, secs, peak
+
+
+def run_scale(args) -> None:
+    scopus, wos = load_real_inputs()
+    pool = [t for t in pd.concat([scopus["processed_title"], wos["processed_title"]]).dropna().unique() if len(t.split()) >= 4]
+    rng = random.Random(0)
+    set_minhash(args.config)
+    threshold = config.FUZZY_THRESHOLD
+
+    print(f"minhash {args.config} | {args.queries} consultas WoS por tamaño | umbral {threshold}")
+    print(f"{'Scopus':>8s} {'motor':>8s} | {'build':>8s} | {'índice':>8s} | {'pico':>9s} | {'consultas/s':>11s} | "
+          f"{'cand/consulta':>13s} | recall vs blocking")
+    for n in args.sizes:
+        s_titles, s_years, candidates = synthetic(n, pool, rng)
+        for i, c in enumerate(candidates):
+            c["row_id"] = f"wos:{i}"
+        sample = candidates[: args.queries]
+
+        found = {}
+        for method in ("blocking", "minhash"):
+            if method == "blocking" and n > args.blocking_max:
+                print(f"{n:8d} {method:>8s} | {'—':>8s} | {'—':>8s} | {'—':>9s} | {'—':>11s} | {'—':>13s} |")
+                continue
+            index, t_build, peak = build_measured(method, s_titles, s_years)
+            per_query = candidates_per_query(index, sample)
+            size_mb = index_nbytes(index) / 1e6
+            del index
+            found[method], t_total = fuzzy_duplicates(s_titles, s_years, sample, threshold, method)
+            q_rate = len(sample) / max(1e-9, t_total - t_build)
+            recall = ""
+            if method == "minhash" and "blocking" in found:
+                recall = f"{len(found['minhash'] & found['blocking']) / max(1, len(found['blocking'])):.3f}"
+            print(f"{n:8d} {method:>8s} | {t_build:6.1f} s | {size_mb:5.0f} MB | {peak:6.0f} MB | {q_rate:11.0f} | "
+                  f"{per_query:13.1f} | {recall}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precisión/recall y escalado del motor MinHash/LSH de deduplicación")
+    parser.add_argument("command", choices=["quality", "scale"])
+    parser.add_argument("--configs", nargs="+", default=["64x32", "64x16", "128x32", "128x64"],
+                        help="Configuraciones num_perm x bands (quality)")
+    parser.add_argument("--config", default=f"{config.DEDUP_MINHASH_PERM}x{config.DEDUP_MINHASH_BANDS}",
+                        help="Configuración num_perm x bands (scale)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50_000, 200_000, 500_000])
+    parser.add_argument("--queries", type=int, default=2000, help="Consultas WoS por tamaño (scale)")
+    parser.add_argument("--blocking-max", type=int, default=200_000,
+                        help="Tamaño máximo en que se construye el índice blocking (memoria)")
+    parser.add_argument("--show", type=int, default=0, help="Títulos perdidos a mostrar (quality)")
+    args = parser.parse_args()
+
+    np.random.seed(0)
+    {"quality": run_quality, "scale": run_scale}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# ============================================================
+# benchmarks/bench_dedup_scheduler.py
+#   - Fuzzy match de cross_deduplicate con distintos topes de workers
+#     (2/4/8/16/32) y dos formas de repartir el trabajo:
+#       "equal":   un chunk igual por worker (reparto anterior)
+#       "dynamic": chunks pequeños con imap_unordered (config.DEDUP_CHUNK_SIZE)
+#   - Datos de FILES/; los candidatos de WoS se ordenan por largo de título
+#     para reproducir el caso de un chunk lento
+#   - Los topes mayores que los núcleos disponibles se limitan a cpu_count
+#
+# Uso:
+#   python benchmarks/bench_dedup_scheduler.py [--workers 2 4 8 16 32]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import math
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import config  # noqa: E402
+from bench_dedup_blocking import load_real_inputs  # noqa: E402
+from deduplication import cross_deduplicate  # noqa: E402
+
+
+def timed(scopus, wos, method: str, workers: int, chunk_size: int):
+    config.DEDUP_MAX_WORKERS = workers
+    config.DEDUP_CHUNK_SIZE = chunk_size
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ledger = cross_deduplicate(scopus, wos, config.FUZZY_THRESHOLD, method=method)
+    return set(ledger["wos_row_id"]), time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del scheduler dinámico de deduplicación")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8, 16, 32])
+    parser.add_argument("--method", default=config.DEDUP_METHOD, choices=["bruteforce", "blocking"])
+    args = parser.parse_args()
+
+    config.DEDUP_PROGRESS_SECONDS = float("inf")
+    scopus, wos = load_real_inputs()
+    # Títulos largos juntos: con reparto igual caen todos en el mismo chunk
+    wos = wos.iloc[wos["processed_title"].str.len().argsort()[::-1]].reset_index(drop=True)
+    dynamic_chunk = config.DEDUP_CHUNK_SIZE
+    cores = multiprocessing.cpu_count()
+
+    print(f"Scopus {len(scopus)} | WoS {len(wos)} | método {args.method} | núcleos disponibles {cores}")
+    print(f"{'workers':>7s} | {'equal':>9s} | {'dynamic':>9s} | {'rec/s dyn.':>10s} | speedup")
+    reference = None
+    for workers in args.workers:
+        effective = min(workers, cores)
+        equal_chunk = math.ceil(len(wos) / effective)
+        found_eq, t_eq = timed(scopus, wos, args.method, workers, equal_chunk)
+        found_dyn, t_dyn = timed(scopus, wos, args.method, workers, dynamic_chunk)
+        reference = reference or found_eq
+        assert found_eq == found_dyn == reference, "el reparto cambió el conjunto de duplicados"
+        print(f"{workers:7d} | {t_eq:7.2f} s | {t_dyn:7.2f} s | {len(wos) / t_dyn:10.0f} | {t_eq / t_dyn:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
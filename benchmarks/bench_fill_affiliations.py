@@ -0,0 +1,128 @@
+# ============================================================
+# benchmarks/bench_fill_affiliations.py
+#   - Relleno de Affiliations <-> Authors with affiliations sobre --rows filas
+#     (afiliaciones reales de FILES/ remuestreadas, con vacíos de todo tipo:
+#     None, NaN, "", espacios, tabs; y valores no-string):
+#       "apply":  implementación anterior (df.apply(fila -> pd.Series), axis=1)
+#       "máscaras": normalization.fill_missing_affiliations (columnar)
+#   - Verifica que ambas dan el mismo DataFrame (valores, posiciones nulas y dtypes),
+#     con columnas object, str y categóricas. None/NaN cuentan como el mismo nulo: el
+#     apply anterior ya convertía None en NaN según el resto de la fila
+#
+# Uso:
+#   python benchmarks/bench_fill_affiliations.py [--rows 100000]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_dedup_blocking import load_real_inputs  # noqa: E402
+from normalization import fill_missing_affiliations  # noqa: E402
+
+COLUMNS = ["Affiliations", "Authors with affiliations"]
+BLANKS = [None, np.nan, "", "  ", "\t", " \n "]
+
+
+# ----------------------------
+# Implementación anterior (función por fila)
+# ----------------------------
+def legacy_empty(x) -> bool:
+    return (pd.isna(x)) or (isinstance(x, str) and x.strip() == "")
+
+
+def legacy_fill_row(row: pd.Series) -> pd.Series:
+    affiliations = row.get("Affiliations", None)
+    authors_with_aff = row.get("Authors with affiliations", None)
+
+    if legacy_empty(affiliations) and legacy_empty(authors_with_aff):
+        return pd.Series([affiliations, authors_with_aff], index=COLUMNS)
+
+    if legacy_empty(affiliations):
+        affiliations = authors_with_aff
+    if legacy_empty(authors_with_aff):
+        authors_with_aff = affiliations
+
+    return pd.Series([affiliations, authors_with_aff], index=COLUMNS)
+
+
+def legacy(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df[COLUMNS] = df.apply(legacy_fill_row, axis=1)
+    return df
+
+
+def columnar(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["Affiliations"], df["Authors with affiliations"] = fill_missing_affiliations(
+        df["Affiliations"], df["Authors with affiliations"]
+    )
+    return df
+
+
+def assert_same(old: pd.DataFrame, new: pd.DataFrame, check_dtype: bool = True) -> None:
+    assert not check_dtype or old.dtypes.equals(new.dtypes), f"dtypes distintos: {old.dtypes.to_dict()} vs {new.dtypes.to_dict()}"
+    assert old.isna().equals(new.isna()), "cambiaron las posiciones nulas"
+    pd.testing.assert_frame_equal(old.astype(object).fillna("<nulo>"), new.astype(object).fillna("<nulo>"))
+
+
+# ----------------------------
+# Datos
+# ----------------------------
+def synthetic(rows: int, rng: random.Random) -> pd.DataFrame:
+    """Pares de afiliaciones reales; ~35% de celdas vacías y algunas no-string (números)."""
+    scopus, wos = load_real_inputs()
+    pool = pd.concat([scopus["Affiliations"], wos["Addresses"]]).dropna().astype(str).tolist()
+
+    def cell():
+        r = rng.random()
+        if r < 0.35:
+            return rng.choice(BLANKS)
+        if r < 0.36:
+            return rng.randint(0, 99)
+        return rng.choice(pool)
+
+    return pd.DataFrame({col: pd.Series([cell() for _ in range(rows)], dtype=object) for col in COLUMNS})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Relleno de afiliaciones: apply por fila vs máscaras")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df = synthetic(args.rows, random.Random(0))
+    print(f"{len(df)} filas | vacías: " + ", ".join(f"{c} {int(df[c].map(legacy_empty).sum())}" for c in COLUMNS))
+
+    # Casos límite de dtype: columnas todas nulas, str (pandas >= 3) y categóricas
+    edge = {
+        "object": df.head(2000),
+        "str": df.head(2000).map(lambda v: v if isinstance(v, str) else None).astype("str"),
+        "todo nulo": pd.DataFrame({c: [None, np.nan, None] for c in COLUMNS}),
+        "categórica": df.head(2000).map(lambda v: v if isinstance(v, str) else None).astype("category"),
+    }
+    for label, frame in edge.items():
+        # Todo nulo: el apply anterior infería float64; ahora las columnas siguen siendo object
+        assert_same(legacy(frame), columnar(frame), check_dtype=label != "todo nulo")
+        print(f"   {label:10s}: idéntico")
+
+    t0 = time.perf_counter()
+    old = legacy(df)
+    t_old = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new = columnar(df)
+    t_new = time.perf_counter() - t0
+    assert_same(old, new)
+    print(f"apply {t_old:7.2f} s | máscaras {t_new:6.3f} s | speedup {t_old / t_new:5.0f}x | salida idéntica: sí")
+
+
+if __name__ == "__main__":
+    main()
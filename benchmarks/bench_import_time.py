@@ -0,0 +1,68 @@
+# ============================================================
+# benchmarks/bench_import_time.py
+#   - Mide el costo de "import loaders" (tiempo + memoria pico) en un proceso limpio
+#   - Mide aparte la carga diferida del modelo spaCy (get_nlp) para comparar
+#
+# Uso:
+#   python benchmarks/bench_import_time.py [--model en_core_web_lg] [--repeat 3]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# Cada medición corre en un intérprete nuevo para no contar módulos ya importados.
+_SNIPPET = """
+import json, resource, sys, time
+sys.path.insert(0, {repo!r})
+t0 = time.perf_counter()
+import loaders
+t_import = time.perf_counter() - t0
+rss_import = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t_load = None
+if {load!r}:
+    import config
+    config.SPACY_MODEL = {model!r}
+    t0 = time.perf_counter()
+    loaders.get_nlp()
+    t_load = time.perf_counter() - t0
+rss_total = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"import_s": t_import, "load_s": t_load,
+                  "rss_import_mb": rss_import / 1024, "rss_total_mb": rss_total / 1024,
+                  "spacy_imported": "spacy" in sys.modules}}))
+"""
+
+
+def run_once(model: str, load: bool) -> dict:
+    code = _SNIPPET.format(repo=str(REPO_DIR), model=model, load=load)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de import de loaders")
+    parser.add_argument("--model", default=None, help="Modelo para medir get_nlp() (default: config.SPACY_MODEL)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_DIR))
+    import config
+
+    model = args.model or config.SPACY_MODEL
+
+    imports = [run_once(model, load=False) for _ in range(args.repeat)]
+    best = min(imports, key=lambda r: r["import_s"])
+    print(f"import loaders        : {best['import_s']:.3f} s  pico RSS {best['rss_import_mb']:.0f} MB"
+          f"  (spaCy importado: {best['spacy_imported']})")
+
+    loaded = run_once(model, load=True)
+    print(f"get_nlp() '{model}': {loaded['load_s']:.3f} s  pico RSS {loaded['rss_total_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
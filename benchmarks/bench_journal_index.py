@@ -0,0 +1,127 @@
+# ============================================================
+# benchmarks/bench_journal_index.py
+#   - Índice de títulos de revistas (journal_index.py) vs recorrido completo de
+#     SCImago (process.extractOne sobre todos los títulos), con los dos usos reales:
+#       canonical: scimago_utils, token_sort_ratio > 90 sobre títulos de issn_map
+#       sjr:       sjr_analysis, WRatio >= 90 (consulta en minúsculas) sobre source_titles
+#   - Consultas: --sizes títulos de revista distintos, sintéticos a partir de SCImago
+#     (MAYÚSCULAS estilo WoS, minúsculas, typo, título recortado, abreviado ISO 4,
+#     títulos inventados)
+#   - Tiempo de construcción / apertura del índice, latencia por consulta (media, p95)
+#     y concordancia con el recorrido completo (en una muestra de --scan-sample)
+#
+# Uso:
+#   python benchmarks/bench_journal_index.py [--sizes 1000 10000] [--scan-sample 1000]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from rapidfuzz import fuzz
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from file_validation import build_default_paths  # noqa: E402
+from journal_index import JournalTitleIndex, best_title, load_journal_abbreviations  # noqa: E402
+from scimago_artifact import load_scimago_artifact  # noqa: E402
+from scimago_utils import CANONICAL_FUZZY_MIN, scimago_title_choices  # noqa: E402
+
+
+# ----------------------------
+# Consultas sintéticas
+# ----------------------------
+def variant(title: str, titles, abbreviated, rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.2:
+        return title.upper()
+    if kind < 0.35:
+        return title.lower()
+    if kind < 0.55:
+        k = rng.randrange(len(title))
+        return title[:k] + rng.choice("aeiourstn") + title[k + 1:]
+    if kind < 0.7:
+        words = title.split()
+        return " ".join(words[:max(1, len(words) - rng.randint(1, 2))])
+    if kind < 0.85:
+        return " ".join(abbreviated.get(w.lower(), w) for w in title.split())
+    # Inventado: palabras de dos revistas distintas
+    a, b = rng.choice(titles).split(), rng.choice(titles).split()
+    return " ".join(a[:len(a) // 2 + 1] + b[len(b) // 2:])
+
+
+def make_queries(titles, size: int, rng: random.Random):
+    """`size` consultas distintas."""
+    abbreviated = {full: f"{abbr.capitalize()}." for abbr, full in load_journal_abbreviations().items()}
+    abbreviated = {**abbreviated, **{k.capitalize(): v for k, v in abbreviated.items()}}
+    queries = set()
+    while len(queries) < size:
+        queries.add(variant(rng.choice(titles), titles, abbreviated, rng))
+    return sorted(queries)
+
+
+def latencies(queries, fn):
+    times = np.empty(len(queries))
+    results = []
+    for i, q in enumerate(queries):
+        t0 = time.perf_counter()
+        results.append(fn(q))
+        times[i] = time.perf_counter() - t0
+    return results, times * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Índice de títulos de revistas vs recorrido completo de SCImago")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--scan-sample", type=int, default=1000, help="Consultas comparadas contra el recorrido completo")
+    parser.add_argument("--min-agreement", type=float, default=0.995)
+    args = parser.parse_args()
+
+    data = load_scimago_artifact(build_default_paths(config.BASE_DIR))
+    uses = {
+        "canonical": (scimago_title_choices(data.issn_map), fuzz.token_sort_ratio, CANONICAL_FUZZY_MIN, True, False),
+        "sjr": (data.source_titles, fuzz.WRatio, config.SCIMAGO_FUZZY_THRESHOLD, False, True),
+    }
+    rng = random.Random(0)
+
+    for name, (choices, scorer, threshold, strict, lower) in uses.items():
+        t0 = time.perf_counter()
+        index = JournalTitleIndex(choices)
+        t_build = time.perf_counter() - t0
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "index.npz"
+            index.save(path)
+            t0 = time.perf_counter()
+            loaded = JournalTitleIndex.load(path, choices)
+            t_load = time.perf_counter() - t0
+            size_mb = path.stat().st_size / 1e6
+        assert loaded is not None, "el índice guardado no se reconoce"
+        print(f"\n[{name}] {len(choices)} títulos | construcción {t_build:.2f} s | "
+              f"apertura {t_load:.2f} s | {size_mb:.1f} MB")
+
+        for size in args.sizes:
+            queries = make_queries(choices, size, rng)
+            queries = [q.lower() for q in queries] if lower else queries
+            got, t_index = latencies(queries, lambda q: loaded.best_match(q, scorer, threshold, strict=strict))
+            sample = queries[:args.scan_sample]
+            expected, t_scan = latencies(sample, lambda q: best_title(q, choices, scorer, threshold, strict=strict))
+            agree = sum(a == b for a, b in zip(got, expected)) / len(sample)
+            matched = sum(r is not None for r in got) / len(got)
+            print(f"  {size:6d} consultas | índice {t_index.mean():6.2f} ms (p95 {np.percentile(t_index, 95):6.2f}) "
+                  f"total {t_index.sum() / 1000:6.1f} s | recorrido {t_scan.mean():6.2f} ms "
+                  f"(~{t_scan.mean() * size / 1000:6.1f} s) | {t_scan.mean() / t_index.mean():4.0f}x | "
+                  f"con match {matched:.2f} | concordancia {agree:.4f} ({len(sample)})")
+            for q, a, b in zip(sample, got, expected):
+                if a != b:
+                    print(f"    distinto: {q!r} -> índice {a!r} / recorrido {b!r}")
+            assert agree >= args.min_agreement, f"{name}: concordancia {agree:.4f} < {args.min_agreement}"
+
+
+if __name__ == "__main__":
+    main()
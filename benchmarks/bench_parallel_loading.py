@@ -0,0 +1,56 @@
+# ============================================================
+# benchmarks/bench_parallel_loading.py
+#   - Lectura + limpieza base por archivo: modo secuencial vs pool de procesos
+#   - Verifica que el concat resultante es idéntico en ambos modos
+#   - Los snapshots Parquet se desactivan para medir el parseo real
+#
+# Uso:
+#   python benchmarks/bench_parallel_loading.py [--workers 4]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from file_validation import build_default_paths, scan_inputs  # noqa: E402
+from loaders import _read_files, _read_scopus_file, _read_wos_file  # noqa: E402
+
+
+def timed(reader, files, workers) -> tuple[pd.DataFrame, float]:
+    t0 = time.perf_counter()
+    dfs = _read_files(reader, files, workers=workers)
+    df = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+    return df, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de carga paralela por archivo")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    config.SNAPSHOT_CACHE_ENABLED = False
+    inv = scan_inputs(build_default_paths(config.BASE_DIR))
+
+    for label, reader, files in [
+        ("Scopus", _read_scopus_file, inv.scopus_files),
+        ("WoS", _read_wos_file, inv.wos_files),
+    ]:
+        if not files:
+            continue
+        seq, t_seq = timed(reader, files, 1)
+        par, t_par = timed(reader, files, args.workers)
+        pd.testing.assert_frame_equal(seq, par)
+        print(f"{label:6s} {len(files):3d} archivos, {len(seq):7d} filas | "
+              f"secuencial {t_seq:6.2f} s | paralelo ({args.workers}) {t_par:6.2f} s | "
+              f"speedup {t_seq / t_par:.2f}x | idénticos: sí")
+
+
+if __name__ == "__main__":
+    main()
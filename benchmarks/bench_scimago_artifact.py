@@ -0,0 +1,71 @@
+# ============================================================
+# benchmarks/bench_scimago_artifact.py
+#   - Arranque de SCImago: CSV + preparación vs artefacto compilado (memory-map)
+#   - Verifica que enrich_with_scimago da el mismo resultado con el DataFrame
+#     crudo y con el artefacto (sobre los registros de Scopus de FILES/)
+#
+# Uso:
+#   python benchmarks/bench_scimago_artifact.py [--limit 2000]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from file_validation import build_default_paths, scan_inputs  # noqa: E402
+from loaders import _read_files, _read_scopus_file  # noqa: E402
+from scimago_artifact import load_scimago_artifact  # noqa: E402
+from scimago_utils import build_scimago_map, load_scimago_if_exists  # noqa: E402
+from sjr_analysis import enrich_with_scimago, prepare_scimago  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del artefacto compilado de SCImago")
+    parser.add_argument("--limit", type=int, default=2000, help="Registros de Scopus para la verificación")
+    args = parser.parse_args()
+
+    paths = build_default_paths(config.BASE_DIR)
+    if not paths.scimago_file.exists():
+        print("No hay archivo SCImago en FILES/SCIMAGO")
+        return
+
+    t0 = time.perf_counter()
+    scimago_df = load_scimago_if_exists(paths)
+    scimago_map = build_scimago_map(scimago_df)
+    prepare_scimago(scimago_df)
+    t_csv = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    load_scimago_artifact(paths, force=True)
+    t_compile = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    data = load_scimago_artifact(paths)
+    t_open = time.perf_counter() - t0
+
+    print(f"CSV + preparación   {t_csv:6.2f} s")
+    print(f"compilar artefacto  {t_compile:6.2f} s (una vez por versión del CSV)")
+    print(f"abrir artefacto     {t_open:6.2f} s | speedup {t_csv / t_open:.1f}x")
+
+    assert data.issn_map == scimago_map, "issn_map distinto"
+
+    inv = scan_inputs(paths)
+    records = pd.concat(_read_files(_read_scopus_file, inv.scopus_files, workers=1), ignore_index=True)
+    records = records.loc[:, ["Title", "Year", "Source title", "ISSN"]].head(args.limit).copy()
+    records["Year"] = pd.to_numeric(records["Year"], errors="coerce")
+
+    expected = enrich_with_scimago(records.copy(), scimago_df, config.SCIMAGO_FUZZY_THRESHOLD)
+    actual = enrich_with_scimago(records.copy(), data, config.SCIMAGO_FUZZY_THRESHOLD)
+    pd.testing.assert_frame_equal(expected, actual, check_dtype=False)
+    print(f"enrich_with_scimago ({len(records)} registros): CSV y artefacto idénticos: sí")
+
+
+if __name__ == "__main__":
+    main()
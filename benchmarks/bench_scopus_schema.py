@@ -0,0 +1,60 @@
+# ============================================================
+# benchmarks/bench_scopus_schema.py
+#   - Pico de RSS y memoria del DataFrame al leer los CSV de Scopus:
+#     pandas por defecto vs schema.py (mismas columnas, con dtypes)
+#   - Cada modo corre en un proceso nuevo para que el pico de RSS sea comparable
+#
+# Uso:
+#   python benchmarks/bench_scopus_schema.py
+# ============================================================
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+_SNIPPET = """
+import json, resource, sys, time
+sys.path.insert(0, {repo!r})
+import pandas as pd
+import config
+from file_validation import build_default_paths, scan_inputs
+from loaders import read_scopus_csv
+inv = scan_inputs(build_default_paths(config.BASE_DIR))
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+reader = read_scopus_csv if {schema!r} else pd.read_csv
+df = pd.concat([reader(f) for f in inv.scopus_files], ignore_index=True)
+elapsed = time.perf_counter() - t0
+print(json.dumps({{
+    "rows": len(df), "cols": df.shape[1], "seconds": elapsed,
+    "frame_mb": df.memory_usage(deep=True).sum() / 1e6,
+    "rss_before_mb": base / 1024,
+    "rss_peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}}))
+"""
+
+
+def run(schema: bool) -> dict:
+    code = _SNIPPET.format(repo=str(REPO_DIR), schema=schema)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    results = []
+    for label, schema in [("Sin dtypes", False), ("schema.py", True)]:
+        r = run(schema)
+        results.append(r)
+        print(f"{label:20s} {r['rows']:7d} filas x {r['cols']:2d} cols | {r['seconds']:5.2f} s | "
+              f"DataFrame {r['frame_mb']:7.1f} MB | pico RSS {r['rss_peak_mb']:7.1f} MB "
+              f"(+{r['rss_peak_mb'] - r['rss_before_mb']:.1f} MB sobre el arranque)")
+    # El esquema no debe perder columnas del export (References, Funding, ...)
+    assert results[0]["cols"] == results[1]["cols"], results
+
+
+if __name__ == "__main__":
+    main()
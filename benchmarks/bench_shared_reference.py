@@ -0,0 +1,113 @@
+# ============================================================
+# benchmarks/bench_shared_reference.py
+#   - Arranque de los workers de deduplicación y memoria por worker:
+#       "pickle": listas de títulos/años de Scopus en initargs (forma anterior)
+#       "shared": bloque de shared_memory adjuntado por nombre (init_worker actual)
+#     --index blocking/minhash: también el índice de candidatos, picklead en initargs
+#     ("pickle") o como arreglos del mismo bloque compartido ("shared")
+#   - Con start method "fork" y "spawn" y N títulos sintéticos
+#   - Memoria privada por worker (Private_* de /proc/self/smaps_rollup, Linux)
+#     tras el initializer y tras decodificar una ventana de año
+#
+# Uso:
+#   python benchmarks/bench_shared_reference.py [--titles 200000] [--workers 4] [--index blocking]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import deduplication  # noqa: E402
+
+_legacy_titles = []
+_legacy_years = []
+_legacy_index = None
+
+
+def legacy_init(titles, years, index=None):
+    """Initializer anterior: las listas completas (y el índice) llegan picklead a cada worker."""
+    global _legacy_titles, _legacy_years, _legacy_index
+    _legacy_titles = titles
+    _legacy_years = years
+    _legacy_index = index
+
+
+def private_mb() -> float:
+    total_kb = 0
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            if line.startswith(("Private_Clean", "Private_Dirty")):
+                total_kb += int(line.split()[1])
+    return total_kb / 1024
+
+
+def probe(mode: str, year: int):
+    """Una tarea por worker: momento de inicio, memoria tras init y tras preparar una ventana de año."""
+    started = time.time()
+    time.sleep(0.3)  # para que cada worker reciba exactamente una tarea
+    after_init = private_mb()
+    if mode == "shared":
+        window = deduplication.year_window(year)
+    else:
+        window = [t for t, y in zip(_legacy_titles, _legacy_years) if abs(y - year) <= 1]
+    return started, after_init, private_mb(), len(window)
+
+
+def run(mode: str, start_method: str, titles, years, workers: int, index=None):
+    ctx = multiprocessing.get_context(start_method)
+    t0 = time.perf_counter()
+    if mode == "shared":
+        reference = deduplication.share_reference(titles, years, index)
+        init, args = deduplication.init_worker, (reference.handle, deduplication.index_method(index))
+    else:
+        reference = None
+        init, args = legacy_init, (titles, years, index)
+    pack = time.perf_counter() - t0
+
+    # Arranque: desde crear el pool hasta que el último worker (ya inicializado) empieza su tarea
+    t0 = time.time()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=init, initargs=args) as ex:
+        results = list(ex.map(probe, [mode] * workers, [2020] * workers))
+    startup = max(r[0] for r in results) - t0
+    if reference is not None:
+        reference.close()
+
+    init_mb = sum(r[1] for r in results) / workers
+    window_mb = sum(r[2] for r in results) / workers
+    return pack, startup, init_mb, window_mb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de la referencia Scopus en memoria compartida")
+    parser.add_argument("--titles", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--index", choices=["none", "blocking", "minhash"], default="none",
+                        help="Índice de candidatos que también reciben los workers")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = [f"word{i}" for i in range(5000)]
+    titles = [" ".join(rng.choice(words) for _ in range(rng.randint(6, 14))) for _ in range(args.titles)]
+    years = [float(rng.randint(2015, 2025)) for _ in range(args.titles)]
+
+    index = None
+    if args.index != "none":
+        index = deduplication.build_candidate_index(args.index, titles, years)
+
+    print(f"{args.titles} títulos, {args.workers} workers, índice {args.index}")
+    print(f"{'start':6s} {'modo':7s} | {'empaquetar':>10s} | {'arranque':>9s} | {'MB priv. init':>13s} | {'MB priv. ventana':>16s}")
+    for start_method in ("fork", "spawn"):
+        for mode in ("pickle", "shared"):
+            pack, startup, init_mb, window_mb = run(mode, start_method, titles, years, args.workers, index)
+            print(f"{start_method:6s} {mode:7s} | {pack:8.2f} s | {startup:7.2f} s | {init_mb:13.1f} | {window_mb:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
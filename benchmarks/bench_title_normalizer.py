@@ -0,0 +1,80 @@
+# ============================================================
+# benchmarks/bench_title_normalizer.py
+#   - Reporte de concordancia: backend "lookup" vs backend "spacy" sobre los exports reales
+#   - Throughput (títulos/seg) de ambos backends
+#
+# Uso:
+#   python benchmarks/bench_title_normalizer.py [--limit N] [--show 15]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+import loaders  # noqa: E402
+from bench_title_preprocessing import collect_titles  # noqa: E402
+
+
+def run_backend(name: str, titles: list) -> tuple[list, float]:
+    config.TITLE_NORMALIZER = name
+    # Precarga fuera del cronómetro (modelo spaCy o tabla de lemas)
+    loaders.get_lookup_lemmatizer() if name == "lookup" else loaders.get_nlp()
+    t0 = time.perf_counter()
+    out = loaders.preprocess_titles(titles)
+    return out, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concordancia y throughput de backends de lematización")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--show", type=int, default=15, help="Diferencias de tokens más frecuentes a mostrar")
+    args = parser.parse_args()
+
+    config.TITLE_CACHE_ENABLED = False
+    titles = collect_titles(args.limit)
+    n_str = sum(isinstance(t, str) for t in titles)
+    print(f"Títulos: {len(titles)} ({n_str} con texto)")
+
+    ref, t_spacy = run_backend("spacy", titles)
+    fast, t_lookup = run_backend("lookup", titles)
+
+    same_title = sum(a == b for a, b in zip(ref, fast))
+    tok_total = tok_same = 0
+    diffs: Counter = Counter()
+    for a, b in zip(ref, fast):
+        ta, tb = a.split(), b.split()
+        if len(ta) != len(tb):
+            diffs[(a, b)] += 1
+            tok_total += len(ta)
+            continue
+        for x, y in zip(ta, tb):
+            tok_total += 1
+            if x == y:
+                tok_same += 1
+            else:
+                diffs[(x, y)] += 1
+
+    print("\n--- Concordancia ---")
+    print(f"Títulos idénticos : {same_title}/{len(titles)} ({same_title / max(len(titles), 1) * 100:.2f}%)")
+    print(f"Tokens idénticos  : {tok_same}/{tok_total} ({tok_same / max(tok_total, 1) * 100:.2f}%)")
+    print(f"processed_title únicos: spacy={len(set(ref))}  lookup={len(set(fast))}"
+          "  (afecta la deduplicación interna por processed_title)")
+    if diffs:
+        print(f"\nDiferencias más frecuentes (spacy → lookup):")
+        for (x, y), n in diffs.most_common(args.show):
+            print(f"  {n:5d}  {x!r} → {y!r}")
+
+    print("\n--- Throughput ---")
+    print(f"spacy ({config.SPACY_MODEL}): {t_spacy:8.2f} s  ({len(titles) / t_spacy:10.1f} títulos/s)")
+    print(f"lookup                 : {t_lookup:8.2f} s  ({len(titles) / t_lookup:10.1f} títulos/s)")
+    print(f"Speedup: {t_spacy / t_lookup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
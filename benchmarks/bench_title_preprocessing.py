@@ -0,0 +1,68 @@
+# ============================================================
+# benchmarks/bench_title_preprocessing.py
+#   - Compara títulos/seg: preprocess_title por fila vs preprocess_titles (nlp.pipe)
+#   - Verifica que ambas rutas producen exactamente el mismo processed_title
+#
+# Uso:
+#   python benchmarks/bench_title_preprocessing.py [--limit N] [--batch-size B] [--n-process P]
+# ============================================================
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from file_validation import build_default_paths, scan_inputs  # noqa: E402
+from loaders import preprocess_title, preprocess_titles  # noqa: E402
+
+
+def collect_titles(limit: int | None) -> list:
+    """Títulos reales de los exports de Scopus (Title) y WoS (Article Title)."""
+    inv = scan_inputs(build_default_paths(config.BASE_DIR))
+    titles = []
+    for f in inv.scopus_files:
+        titles.extend(pd.read_csv(f, usecols=["Title"])["Title"].tolist())
+    for f in inv.wos_files:
+        titles.extend(pd.read_excel(f, usecols=["Article Title"])["Article Title"].tolist())
+    return titles[:limit] if limit else titles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de preprocesamiento de títulos")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=config.SPACY_BATCH_SIZE)
+    parser.add_argument("--n-process", type=int, default=config.SPACY_N_PROCESS)
+    args = parser.parse_args()
+
+    # Medimos spaCy, no la caché persistente de títulos
+    config.TITLE_CACHE_ENABLED = False
+
+    titles = collect_titles(args.limit)
+    print(f"Títulos: {len(titles)}")
+
+    t0 = time.perf_counter()
+    per_row = [preprocess_title(t) for t in titles]
+    t_row = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batched = preprocess_titles(titles, batch_size=args.batch_size, n_process=args.n_process)
+    t_batch = time.perf_counter() - t0
+
+    mismatches = sum(a != b for a, b in zip(per_row, batched))
+    print(f"Por fila : {t_row:8.2f} s  ({len(titles) / t_row:9.1f} títulos/s)")
+    print(f"Batch    : {t_batch:8.2f} s  ({len(titles) / t_batch:9.1f} títulos/s)"
+          f"  batch_size={args.batch_size} n_process={args.n_process}")
+    print(f"Speedup  : {t_row / t_batch:.1f}x")
+    print(f"Diferencias en processed_title: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# ============================================================
+# benchmarks/check_dedup_year_shadowing.py
+#   - Regresión del "shadowing" por año en la deduplicación fuzzy:
+#     un match mejor pero de otro año no debe tapar un match válido en año ±1
+#   - También cubre registros sin año (en WoS o en Scopus)
+#   - Precisión: títulos distintos del mismo año que comparten una sola palabra
+#     (WRatio 85.5-90 por partial_token_set) o un comienzo común NO son duplicados
+#   - Recall: título + traducción agregada SÍ es duplicado (también con el índice)
+#   - Mejor match: con más candidatos que una tanda, el ledger guarda el de mayor
+#     puntaje (título idéntico), no el primero aceptado
+#   - Con DEDUP_CONFIRM_MATCHES = False (solo WRatio) los pares de precisión vuelven
+#     a aparecer en los métodos exhaustivos (bruteforce, cdist): el interruptor
+#     reproduce el resultado anterior (blocking/minhash filtran antes por q-gramas)
+#   - Dedup interna (dedup_intra, fuzz.ratio): los mismos pares que comparten una
+#     palabra dentro de UNA fuente no se fusionan; un typo sí
+#   - Corre cross_deduplicate con todos los métodos y compara los pares
+#     (wos_row_id -> scopus_row_id) del ledger; falla con AssertionError
+#
+# Uso:
+#   python benchmarks/check_dedup_year_shadowing.py
+# ============================================================
+from __future__ import annotations
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rapidfuzz import fuzz  # noqa: E402
+
+import config  # noqa: E402
+from dedup_intra import fuzzy_intra_deduplicate  # noqa: E402
+from deduplication import cross_deduplicate  # noqa: E402
+
+METHODS = ("bruteforce", "blocking", "cdist", "minhash")
+EXHAUSTIVE_METHODS = ("bruteforce", "cdist")
+INTRA_METHODS = ("bruteforce", "blocking", "minhash")
+THRESHOLD = 85
+
+SCOPUS = pd.DataFrame({
+    "processed_title": [
+        # Shadowing: idéntico pero 10 años antes, y una variante válida del año correcto
+        "deep learn crop yield prediction remote sensing",
+        "deep learn crop yield prediction remote sense",
+        # Solo existe en otro año: NO es duplicado
+        "urban heat island mitigation green roof",
+        # Scopus sin año: compatible con cualquier año
+        "blockchain supply chain traceability food",
+        # Precisión: comparten una sola palabra con w5 / w6 / w7, mismo año
+        "mediate moderate effect personalize political communication social medium election",
+        "water scarcity irrigation policy smallholder farmer south america",
+        "submerge government visibility race american political trust",
+        # Precisión: mismas primeras palabras que w8, otro artículo
+        "trust social movement new research agendum",
+        # Recall: w9 es este título sin la traducción al español
+        "venezuelan migrant spain migrantes venezolanos y venezolanas en espaa",
+    ],
+    "Year": [2010, 2020, 2012, np.nan, 2020, 2020, 2020, 2018, 2021],
+    "DOI": [None] * 9,
+    "EID": ["s1", "s2", "s3", "s4", "s5", "s6", "s7", "s8", "s9"],
+})
+
+WOS = pd.DataFrame({
+    "processed_title": [
+        "deep learn crop yield prediction remote sensing",
+        "urban heat island mitigation green roof",
+        "blockchain supply chain traceability food",
+        # WoS sin año: se compara contra todo Scopus
+        "urban heat island mitigation green roofs",
+        # Títulos distintos: WRatio >= 85 contra s5 / s6 / s7, pero NO son duplicados
+        "participation political trust",
+        "urban mobility latin america",
+        "political trust",
+        "trust social movement state",
+        "venezuelan migrant spain",
+    ],
+    "Publication Year": [2021, 2020, 2019, np.nan, 2020, 2020, 2020, 2018, 2021],
+    "DOI": [None] * 9,
+    "UT (Unique WOS ID)": ["w1", "w2", "w3", "w4", "w5", "w6", "w7", "w8", "w9"],
+})
+
+# Mejor match: 64 títulos que contienen el de w10 (+ traducción, WRatio 90) antes del idéntico
+BEST_TITLE = "citizen trust local government digital public service"
+DECOYS = [f"{BEST_TITLE} {word} confianza ciudadana en el gobierno local" for word in
+          (f"{a}{b}" for a in "bcdfghjk" for b in "aeioumns")]
+SCOPUS = pd.concat([SCOPUS, pd.DataFrame({
+    "processed_title": [*DECOYS, BEST_TITLE],
+    "Year": 2020,
+    "DOI": None,
+    "EID": [f"d{i}" for i in range(len(DECOYS))] + ["s10"],
+})], ignore_index=True)
+WOS = pd.concat([WOS, pd.DataFrame({
+    "processed_title": [BEST_TITLE],
+    "Publication Year": [2020],
+    "DOI": [None],
+    "UT (Unique WOS ID)": ["w10"],
+})], ignore_index=True)
+
+# wos_row_id -> scopus_row_id
+EXPECTED = {"w1": "s2", "w3": "s4", "w4": "s3", "w9": "s9", "w10": "s10"}
+# Pares que WRatio sola aceptaría (umbral 85) y que no deben aparecer en el ledger
+FALSE_PAIRS = {"w5": "s5", "w6": "s6", "w7": "s7", "w8": "s8"}
+
+
+
+def intra_source() -> pd.DataFrame:
+    """Una sola fuente (mismo año) con los títulos de FALSE_PAIRS y un casi-duplicado por typo."""
+    titles = dict(zip(SCOPUS["EID"], SCOPUS["processed_title"]))
+    rows = [title for w_title, wos_id in zip(WOS["processed_title"], WOS["UT (Unique WOS ID)"])
+            if wos_id in FALSE_PAIRS for title in (w_title, titles[FALSE_PAIRS[wos_id]])]
+    rows += ["deep learn crop yield prediction remote sensing", "deep learn crop yeld prediction remote sensing"]
+    return pd.DataFrame({"processed_title": rows, "Year": 2020, "DOI": None, "Cited by": 0})
+
+
+def main() -> None:
+    titles = dict(zip(SCOPUS["EID"], SCOPUS["processed_title"]))
+    for w_title, wos_id in zip(WOS["processed_title"], WOS["UT (Unique WOS ID)"]):
+        if wos_id in FALSE_PAIRS:
+            # El caso solo prueba algo si WRatio sola lo aceptaría
+            assert fuzz.WRatio(w_title, titles[FALSE_PAIRS[wos_id]]) >= THRESHOLD, wos_id
+
+    runs = [(True, METHODS, EXPECTED), (False, EXHAUSTIVE_METHODS, {**EXPECTED, **FALSE_PAIRS})]
+    for confirm, methods, expected in runs:
+        config.DEDUP_CONFIRM_MATCHES = confirm
+        for method in methods:
+            with contextlib.redirect_stdout(io.StringIO()):
+                ledger = cross_deduplicate(SCOPUS, WOS, THRESHOLD, method=method)
+            found = dict(zip(ledger["wos_row_id"], ledger["scopus_row_id"]))
+            assert found == expected, f"{method} (confirm={confirm}): esperado {expected}, obtenido {found}"
+            print(f"{method:10s} confirm={confirm!s:5s} ok ({len(found)} duplicados)")
+    config.DEDUP_CONFIRM_MATCHES = True
+
+    source = intra_source()
+    for method in INTRA_METHODS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            kept = fuzzy_intra_deduplicate(source, "Scopus", "Year", ["Cited by"], threshold=90, method=method)
+        # Solo se elimina la última fila (typo de la anterior)
+        assert kept.index.tolist() == source.index[:-1].tolist(), f"intra {method}: quedan {kept.index.tolist()}"
+        print(f"intra {method:10s} ok ({len(source) - len(kept)} eliminado)")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,12 @@ BASE_DIR = Path(__file__).resolve().parent
 # Carpetas principales de datos
 FILES_DIR = BASE_DIR / "FILES"    # Donde se buscan los inputs
 RESULTS_DIR = BASE_DIR / "RESULTS" # Donde se guardan los outputs
+CACHE_DIR = BASE_DIR / "CACHE"     # Cachés persistentes entre ejecuciones (se puede borrar)
+
+# Tablas de datos versionadas con el código
+DATA_DIR = BASE_DIR / "data"
+# Alias de países en afiliaciones -> nombre canónico (country_normalizer.py)
+COUNTRY_ALIASES_FILE = DATA_DIR / "country_aliases.json"
 
 # Subdirectorios de Input específicos
 SCOPUS_DIR = FILES_DIR / "SCOPUS"
@@ -32,3 +38,130 @@ FUZZY_THRESHOLD = 85
 
 # Umbral de similitud para encontrar revistas en SCImago (90% es más estricto)
 SCIMAGO_FUZZY_THRESHOLD = 90
+
+# Modelo spaCy para lematizar títulos (se carga en el primer uso, no al importar)
+#   "en_core_web_lg" (por defecto), "en_core_web_sm" (más liviano)
+#   "blank:en" -> pipeline vacío con lematizador por tablas (pip install spacy-lookups-data)
+SPACY_MODEL = "en_core_web_lg"
+
+# Backend de lematización de títulos (processed_title):
+#   "spacy"  -> modelo SPACY_MODEL (más preciso, lento)
+#   "lookup" -> tabla palabra->lema precompilada desde spaCy (muy rápido, sin cargar modelo)
+#              Se construye sola la primera vez (requiere spacy-lookups-data) o con:
+#              python title_normalizer.py build
+TITLE_NORMALIZER = "spacy"
+LEMMA_TABLE_FILE = CACHE_DIR / "lemma_lookup_en.json.gz"
+
+# Preprocesamiento de títulos con spaCy en modo batch (nlp.pipe)
+# batch_size: títulos por lote; n_process: procesos de spaCy (1 = sin multiproceso)
+SPACY_BATCH_SIZE = 1000
+SPACY_N_PROCESS = 1
+
+# Caché persistente de processed_title (SQLite en CACHE_DIR)
+# Evita re-lematizar títulos ya vistos en ejecuciones anteriores.
+# Se limpia con: python main.py --clear-title-cache
+TITLE_CACHE_ENABLED = True
+TITLE_CACHE_FILE = CACHE_DIR / "processed_titles.sqlite"
+TITLE_CACHE_MAX_ENTRIES = 500_000  # Límite de entradas (desalojo LRU)
+
+# Snapshots Parquet de los inputs parseados (CSV Scopus / XLS WoS) en CACHE_DIR
+# Se reutilizan mientras el archivo no cambie (ruta + tamaño + mtime + hash). Requiere pyarrow.
+SNAPSHOT_CACHE_ENABLED = True
+SNAPSHOT_DIR = CACHE_DIR / "snapshots"
+
+# Carga de archivos en paralelo (lectura + limpieza base por archivo)
+# Número de procesos para leer los exports de Scopus/WoS. 1 = secuencial.
+# El resultado es idéntico en ambos modos (se concatena en el orden de los archivos).
+# Con pocos archivos el arranque del pool cuesta más de lo que ahorra (FILES/: 4
+# procesos tardan 1.5-1.8x lo secuencial); subirlo solo con decenas de exports
+# (ver benchmarks/bench_parallel_loading.py).
+LOADER_WORKERS = 1
+
+# Motor de lectura CSV (Scopus y SCImago): "pyarrow" (multihilo) o "c" (pandas clásico)
+# Si pyarrow no está instalado se usa "c" automáticamente.
+CSV_ENGINE = "pyarrow"
+
+# Artefacto compilado de SCImago (Arrow IPC + manifest en CACHE_DIR)
+# Se abre con memory-map al iniciar; se recompila solo si cambia el hash del CSV.
+# Compilación manual: python scimago_artifact.py compile [--force]
+SCIMAGO_ARTIFACT_DIR = CACHE_DIR / "scimago"
+# Memo persistente del título canónico de revistas sin ISSN (fuzzy contra SCImago).
+# Se descarta solo si cambian los títulos de SCImago; se puede borrar sin riesgo.
+SCIMAGO_TITLE_MEMO_FILE = CACHE_DIR / "scimago_canonical_titles.json"
+
+# Deduplicación fuzzy WoS vs Scopus
+#   "blocking"   -> índice por año (±1) + q-gramas de processed_title; WRatio solo sobre candidatos
+#   "bruteforce" -> WRatio contra todo Scopus de año compatible (particiones año-1..año+1 + sin año)
+#   "cdist"      -> matriz WoS x Scopus con rapidfuzz.process.cdist (uint8, multihilo)
+#   "minhash"    -> candidatos por MinHash + LSH sobre q-gramas (corpus de cientos de miles
+#                   de registros); más rápido pero aproximado: pierde matches de baja similitud
+#                   de Jaccard (ver benchmarks/bench_dedup_minhash.py)
+DEDUP_METHOD = "bruteforce"
+DEDUP_QGRAM = 3                 # Tamaño de q-grama del índice
+# Fracción mínima de q-gramas compartidos (sobre el título más corto) para ser candidato.
+# Los matches confirmados (ver DEDUP_CONFIRM_*) comparten >= 0.9 en FILES/ y >= 0.6 en
+# casi-duplicados sintéticos (typos, palabras unidas/movidas/omitidas, traducción
+# agregada): 0.5 deja margen (ver benchmarks/bench_dedup_blocking.py recall).
+DEDUP_MIN_SHARED_QGRAMS = 0.5
+# Confirmación de cada match WRatio (deduplication.confirm_match): WRatio >= 85 no basta,
+# da 85.5 a títulos de largo >= 1.5x que comparten UNA palabra. Se acepta el par si
+# ratio/token_sort_ratio >= FUZZY_THRESHOLD, o si el título corto (>= MIN_WORDS palabras)
+# está contenido en el largo con partial_ratio >= PARTIAL (título + traducción / subtítulo).
+# False -> solo WRatio (comportamiento anterior). En FILES/ cambia los conteos
+# (ver README, "Fuzzy match confirmation").
+DEDUP_CONFIRM_MATCHES = True
+DEDUP_CONFIRM_PARTIAL = 95
+DEDUP_CONFIRM_MIN_WORDS = 3
+
+# Modo "cdist": filas de WoS por chunk y columnas de Scopus por bloque
+# (memoria por matriz ~ chunk x bloque bytes, en uint8)
+DEDUP_CDIST_CHUNK = 2000
+DEDUP_CDIST_BLOCK = 20000
+
+# Modo "minhash": funciones hash de la firma y bandas LSH (num_perm múltiplo de bands).
+# Candidatos = títulos que coinciden en una banda completa; umbral de Jaccard aprox.
+# (1/bands)^(1/rows), con rows = num_perm / bands.
+DEDUP_MINHASH_PERM = 64
+DEDUP_MINHASH_BANDS = 32
+
+# Scheduler del fuzzy match (modos "bruteforce", "blocking" y "minhash")
+# Los candidatos de WoS se reparten en chunks pequeños entre los workers (imap_unordered).
+DEDUP_MAX_WORKERS = 8          # Tope de procesos (None = todos los núcleos)
+DEDUP_CHUNK_SIZE = 100         # Registros de WoS por chunk
+DEDUP_PROGRESS_SECONDS = 10    # Cada cuánto se reporta el progreso (registros/s, ETA)
+
+# Índice persistente de deduplicación (dedup_index.py): solo se comparan registros nuevos
+# Recalculo completo: python main.py --rebuild-dedup-index
+DEDUP_INDEX_DIR = CACHE_DIR / "dedup"
+# Scopus agregado desde el último build se indexa aparte; si supera esta fracción
+# del índice principal, el índice de bloqueo se reconstruye completo al guardar
+DEDUP_INDEX_MERGE_FRACTION = 0.10
+
+# Deduplicación fuzzy INTERNA de cada fuente (dedup_intra.py), después del drop_duplicates
+# exacto por processed_title: agrupa casi-duplicados (typos, puntuación de subtítulos,
+# erratum) y deja un registro por grupo. Mismo matcher paralelo que el cruce, pero con
+# fuzz.ratio: con WRatio >= 85 dos títulos distintos que comparten una palabra se
+# fusionarían (en FILES/ daría ~360k pares falsos solo en Scopus).
+DEDUP_INTRA_ENABLED = False
+DEDUP_INTRA_THRESHOLD = 90        # fuzz.ratio mínimo (0-100) entre processed_title
+DEDUP_INTRA_METHOD = "blocking"   # "blocking", "minhash" o "bruteforce" (ver DEDUP_METHOD)
+# Con ratio >= 90 los títulos comparten la mayoría de sus q-gramas: el índice puede
+# filtrar mucho más que en el cruce (menos candidatos, mismo resultado)
+DEDUP_INTRA_MIN_SHARED_QGRAMS = 0.5
+# Criterios (en orden) para elegir el sobreviviente de cada grupo; empate -> el primero leído
+#   "has_doi" -> con DOI; "citations" -> más citas; "newest" -> año más reciente
+DEDUP_INTRA_PRIORITY = ["has_doi", "citations", "newest"]
+
+# Búsqueda de revistas por título contra SCImago (scimago_utils sin ISSN, sjr_analysis fallback)
+#   "index" -> índice de q-gramas sobre títulos normalizados (journal_index.py); solo los
+#              candidatos se puntúan con rapidfuzz. Se guarda con el artefacto SCImago.
+#   "scan"  -> extractOne contra TODOS los títulos de SCImago (exacto, lento)
+SCIMAGO_TITLE_MATCH = "index"
+JOURNAL_INDEX_QGRAM = 3
+# Fracción mínima de q-gramas compartidos (sobre el título más corto) para ser candidato
+JOURNAL_INDEX_MIN_SHARED = 0.5
+# Abreviaturas de palabras en títulos de revistas ("j" -> "journal") para normalizar
+JOURNAL_ABBREVIATIONS_FILE = DATA_DIR / "journal_abbreviations.json"
+# True -> si el título tal cual no llega al umbral, se compara también su forma
+# normalizada (abreviaturas expandidas): más matches, cambia resultados respecto a "scan"
+SCIMAGO_TITLE_EXPANDED_MATCH = False
@@ -0,0 +1,108 @@
+# ============================================================
+# country_normalizer.py
+#   - Normalización de países en afiliaciones en UNA pasada
+#   - La tabla de alias vive en data/country_aliases.json (config.COUNTRY_ALIASES_FILE):
+#     lista ordenada de {"pattern": regex sin \b, "country": nombre canónico}
+#   - Todos los alias se compilan en una sola alternancia \b(?:...)\b con un grupo
+#     con nombre por alias (c0, c1, ...): el grupo que matchea indica el reemplazo.
+#     Un lookahead con las primeras letras posibles descarta rápido las demás palabras
+#   - Sobre una Serie se normaliza cada valor distinto una sola vez (factorize)
+# ============================================================
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+import config
+
+# Comas dentro de [autores] (Authors with affiliations): se quitan antes de normalizar
+_BRACKETS = re.compile(r"\[(.*?)\]")
+
+
+def load_country_aliases(path: Path) -> List[Dict[str, str]]:
+    """Alias en el orden del archivo (el orden decide entre alias que empiezan en el mismo lugar)."""
+    with open(path, encoding="utf-8") as f:
+        aliases = json.load(f)
+    for alias in aliases:
+        if not {"pattern", "country"} <= alias.keys():
+            raise ValueError(f"Alias de país inválido en {path}: {alias}")
+    return aliases
+
+
+def _first_chars(pattern: str) -> Optional[Set[str]]:
+    """
+    Primer carácter de cada alternativa de nivel superior del regex (para el lookahead).
+    None si alguna alternativa no empieza con una letra/dígito literal.
+    """
+    alternatives, depth, start, i = [], 0, 0, 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 1
+        elif c in "([":
+            depth += 1
+        elif c in ")]":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            alternatives.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    alternatives.append(pattern[start:])
+    if not all(alt[:1].isalnum() for alt in alternatives):
+        return None
+    return {alt[0].lower() for alt in alternatives}
+
+
+class CountryNormalizer:
+    """Alternancia compilada de todos los alias (sin distinguir mayúsculas) + reemplazo por grupo."""
+
+    def __init__(self, aliases: List[Dict[str, str]]):
+        self.replacements = {f"c{i}": alias["country"] for i, alias in enumerate(aliases)}
+        alternation = "|".join(f"(?P<c{i}>{alias['pattern']})" for i, alias in enumerate(aliases))
+
+        guard = ""
+        firsts = [_first_chars(alias["pattern"]) for alias in aliases]
+        if aliases and all(firsts):
+            guard = f"(?=[{re.escape(''.join(sorted(set().union(*firsts))))}])"
+        # Mismo orden que la tabla: en una posición gana el primer alias que matchea
+        self.pattern = re.compile(rf"\b{guard}(?:{alternation})\b", re.IGNORECASE)
+
+    def _replace(self, match: re.Match) -> str:
+        return self.replacements[match.lastgroup]
+
+    def normalize(self, text: str) -> str:
+        if not isinstance(text, str):
+            return text
+        return self.pattern.sub(self._replace, text)
+
+    def normalize_affiliation(self, record: str) -> str:
+        """Quita comas dentro de [...] y normaliza países (un valor ya convertido a str)."""
+        record = _BRACKETS.sub(lambda m: m.group(0).replace(",", ""), record)
+        return self.pattern.sub(self._replace, record)
+
+    def normalize_affiliations(self, values: pd.Series) -> pd.Series:
+        """
+        normalize_affiliation sobre una Serie: los nulos se conservan tal cual, el resto se
+        convierte a str y cada valor distinto se normaliza una vez.
+        """
+        present = values.notna().to_numpy()
+        if not present.any():
+            return values
+        codes, uniques = pd.factorize(values[present].astype(str))
+        normalized = np.array([self.normalize_affiliation(v) for v in uniques], dtype=object)
+        out = values.astype(object).copy()
+        out[present] = normalized[codes]
+        # Mismo dtype que Series.apply (str en pandas >= 3)
+        return out.infer_objects()
+
+
+@lru_cache(maxsize=1)
+def get_country_normalizer() -> CountryNormalizer:
+    """Normalizador compilado de config.COUNTRY_ALIASES_FILE (una vez por proceso)."""
+    return CountryNormalizer(load_country_aliases(config.COUNTRY_ALIASES_FILE))
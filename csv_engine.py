@@ -0,0 +1,92 @@
+# ============================================================
+# csv_engine.py
+#   - Capa única de lectura CSV para Scopus y SCImago
+#   - Motor configurable (config.CSV_ENGINE): "pyarrow" (multihilo) o "c" (pandas)
+#   - Si pyarrow no está instalado o no soporta una opción, cae al motor C
+#   - decimal="," también con pyarrow (que no tiene esa opción nativa)
+# ============================================================
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+import config
+from logging_utils import setup_logger
+from ui_messages import warn
+
+logger = setup_logger("csv_engine")
+
+_PYARROW_WARNED = False
+
+
+def pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_engine(engine: Optional[str] = None) -> str:
+    """Motor efectivo: el pedido (o config.CSV_ENGINE), degradado a "c" si falta pyarrow."""
+    global _PYARROW_WARNED
+    engine = engine or config.CSV_ENGINE
+    if engine == "pyarrow" and not pyarrow_available():
+        if not _PYARROW_WARNED:
+            warn("Motor CSV", "pyarrow no está instalado. Se usa el motor C de pandas.\n"
+                              "Para lectura multihilo: pip install pyarrow")
+            _PYARROW_WARNED = True
+        return "c"
+    return engine
+
+
+def _all_numbers(values: pd.Series, pattern: str) -> bool:
+    return bool(values.map(type).eq(str).all() and values.str.fullmatch(pattern).all())
+
+
+def _apply_decimal(df: pd.DataFrame, decimal: str, dtype: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """
+    Emula decimal="," del motor C: una columna de texto se convierte a float solo si
+    TODOS sus valores no nulos son números con ese separador decimal.
+    """
+    number = rf"[+-]?\d*{re.escape(decimal)}?\d+(?:[eE][+-]?\d+)?"
+    explicit = set(dtype or {})
+    for col in df.columns:
+        if col in explicit or df[col].dtype.kind in "biufc" or isinstance(df[col].dtype, pd.CategoricalDtype):
+            continue
+        values = df[col].dropna()
+        if values.empty:
+            continue
+        # Descarta rápido con una muestra antes de revisar la columna completa
+        if not all(_all_numbers(v, number) for v in (values.head(100), values)):
+            continue
+        df[col] = pd.to_numeric(df[col].str.replace(decimal, ".", regex=False))
+    return df
+
+
+def read_csv(
+    path: Path,
+    *,
+    sep: str = ",",
+    usecols: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+    decimal: str = ".",
+    engine: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    pd.read_csv con el motor configurado. Mismo resultado con ambos motores:
+    separador, comillas dobles estándar (RFC 4180), usecols/dtype y separador decimal.
+    """
+    engine = resolve_engine(engine)
+
+    if engine == "pyarrow":
+        try:
+            df = pd.read_csv(path, sep=sep, usecols=usecols, dtype=dtype, engine="pyarrow")
+            return _apply_decimal(df, decimal, dtype) if decimal != "." else df
+        except Exception as e:
+            logger.debug(f"[CSV] pyarrow no pudo leer {Path(path).name}, se usa motor C: {e}")
+
+    return pd.read_csv(path, sep=sep, usecols=usecols, dtype=dtype, decimal=decimal, engine="c")
@@ -0,0 +1,155 @@
+# ============================================================
+# dedup_blocking.py
+#   - Índice de bloqueo (candidate generation) para el fuzzy match WoS vs Scopus
+#   - En vez de puntuar cada título de WoS contra TODO Scopus (O(N·M)):
+#       1) Bloque por año: solo Scopus con año en [y-1, y+1] (+ Scopus sin año)
+#       2) Índice invertido de q-gramas sobre processed_title: solo candidatos
+#          que comparten una fracción mínima de q-gramas con el título de WoS
+#   - Los candidatos se puntúan después con WRatio, igual que el modo bruteforce
+#   - Se puede guardar/cargar como .npz (índice persistente de dedup_index.py) y
+#     compartir con los workers como arreglos NumPy (arrays / from_arrays)
+# ============================================================
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def qgrams(text: str, q: int = 3) -> set:
+    """q-gramas del título (con bordes) como conjunto."""
+    padded = f" {text} "
+    if len(padded) <= q:
+        return {padded}
+    return {padded[i:i + q] for i in range(len(padded) - q + 1)}
+
+
+class BlockingIndex:
+    """
+    Índice de candidatos sobre los títulos de Scopus.
+
+    Los registros se ordenan por año (estable, sin año al final), así cada rango de
+    años es un rango contiguo de posiciones y cada posting list (ordenada) se corta
+    con searchsorted. Las posiciones devueltas son índices de la lista ORIGINAL.
+    """
+
+    def __init__(
+        self,
+        titles: Sequence[str],
+        years: Sequence[float],
+        q: int = 3,
+        min_shared: float = 0.5,
+    ):
+        self.q = q
+        self.min_shared = min_shared
+
+        years_arr = np.asarray(years, dtype=float)
+        sort_key = np.where(np.isnan(years_arr), np.inf, years_arr)
+        self.order = np.argsort(sort_key, kind="stable")
+        self.years = years_arr[self.order]
+        self.n_dated = int((~np.isnan(self.years)).sum())
+        self.size = len(self.order)
+
+        # Vocabulario de q-gramas -> id y pares (gram_id, posición)
+        self.vocab: Dict[str, int] = {}
+        gram_ids: List[int] = []
+        positions: List[int] = []
+        gram_counts = np.zeros(self.size, dtype=np.int32)
+        for pos, original in enumerate(self.order):
+            grams = qgrams(str(titles[original]), q)
+            gram_counts[pos] = len(grams)
+            for g in grams:
+                gid = self.vocab.setdefault(g, len(self.vocab))
+                gram_ids.append(gid)
+                positions.append(pos)
+
+        # CSR: posting lists contiguas, posiciones ascendentes dentro de cada q-grama
+        gram_ids_arr = np.asarray(gram_ids, dtype=np.int64)
+        positions_arr = np.asarray(positions, dtype=np.int32)
+        by_gram = np.argsort(gram_ids_arr, kind="stable")
+        self.postings = positions_arr[by_gram]
+        self.indptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(gram_ids_arr, minlength=len(self.vocab)), out=self.indptr[1:])
+        self.gram_counts = gram_counts
+
+    # ----------------------------
+    # Persistencia (.npz) y memoria compartida
+    # ----------------------------
+    _ARRAYS = ("order", "years", "gram_counts", "postings", "indptr")
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Todo el índice como arreglos NumPy (el vocabulario va en orden de id)."""
+        return {
+            "vocab": np.array(list(self.vocab), dtype=str),
+            "params": np.array([self.q, self.min_shared, self.n_dated], dtype=float),
+            **{name: getattr(self, name) for name in self._ARRAYS},
+        }
+
+    @classmethod
+    def from_arrays(cls, data) -> "BlockingIndex":
+        """Índice sobre arreglos de arrays() (un .npz abierto o vistas de memoria compartida)."""
+        index = cls.__new__(cls)
+        q, min_shared, n_dated = data["params"].tolist()
+        index.q, index.min_shared, index.n_dated = int(q), float(min_shared), int(n_dated)
+        for name in cls._ARRAYS:
+            setattr(index, name, data[name])
+        index.vocab = {g: i for i, g in enumerate(data["vocab"].tolist())}
+        index.size = len(index.order)
+        return index
+
+    def save(self, path: Path, **extra: np.ndarray) -> None:
+        """Guarda el índice en un .npz; extra = arreglos adicionales."""
+        np.savez(path, **self.arrays(), **extra)
+
+    @classmethod
+    def load(cls, path: Path) -> "BlockingIndex":
+        """Abre un índice guardado con save() sin recalcular los q-gramas."""
+        with np.load(path) as data:
+            return cls.from_arrays(data)
+
+    def _year_ranges(self, year: float) -> List[Tuple[int, int]]:
+        # Sin año en WoS: cualquier año de Scopus es válido (misma regla que bruteforce)
+        if year is None or np.isnan(year):
+            return [(0, self.size)]
+        dated = self.years[:self.n_dated]
+        lo = int(np.searchsorted(dated, year - 1, side="left"))
+        hi = int(np.searchsorted(dated, year + 1, side="right"))
+        ranges = [(lo, hi)] if hi > lo else []
+        if self.n_dated < self.size:
+            ranges.append((self.n_dated, self.size))
+        return ranges
+
+    def candidates(self, title: str, year: Optional[float] = None) -> np.ndarray:
+        """
+        Índices (lista original de Scopus) que comparten suficientes q-gramas y tienen año
+        compatible, ordenados de mayor a menor fracción de q-gramas compartidos.
+        """
+        grams = qgrams(title, self.q)
+        ranges = self._year_ranges(np.nan if year is None else float(year))
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+
+        hits = []
+        for g in grams:
+            gid = self.vocab.get(g)
+            if gid is None:
+                continue
+            plist = self.postings[self.indptr[gid]:self.indptr[gid + 1]]
+            for lo, hi in ranges:
+                a, b = np.searchsorted(plist, (lo, hi))
+                if b > a:
+                    hits.append(plist[a:b])
+        if not hits:
+            return np.empty(0, dtype=np.int64)
+
+        pos, shared = np.unique(np.concatenate(hits), return_counts=True)
+        # Fracción sobre el título más corto: cubre el caso "título contenido en otro"
+        base = np.minimum(self.gram_counts[pos], len(grams))
+        need = np.maximum(1, np.ceil(self.min_shared * base - 1e-9)).astype(np.int64)
+        keep = shared >= need
+        pos, shared = pos[keep], shared[keep]
+        # Los que más q-gramas comparten primero: el match suele estar al inicio
+        ranked = np.argsort(-shared / np.maximum(base[keep], 1), kind="stable")
+        return self.order[pos[ranked]]
+
@@ -0,0 +1,287 @@
+# ============================================================
+# dedup_index.py
+#   - Índice persistente de la deduplicación cruzada en CACHE_DIR/dedup/
+#       * scopus.parquet  -> referencia Scopus: scopus_row_id, processed_title,
+#                            Year, DOI normalizado (tabla hash de DOIs), huella
+#       * wos.parquet     -> registros de WoS ya comparados: wos_row_id, huella
+#       * ledger.parquet  -> ledger de matches acumulado (ver deduplication.py)
+#       * candidates.npz  -> índice de candidatos de la referencia
+#                            (BlockingIndex o MinHashIndex según el método)
+#       * manifest.json   -> formato, parámetros del match, tamaño del índice principal
+#   - Una ejecución nueva solo compara lo que cambió desde la anterior:
+#       WoS nuevos o modificados      -> contra todo Scopus
+#       WoS ya vistos y sin match     -> solo contra Scopus nuevo
+#       WoS ya vistos con match       -> se conserva su fila del ledger
+#   - Se recalcula todo si cambian los parámetros, si Scopus perdió o modificó
+#     registros ya indexados, o con rebuild=True (main.py --rebuild-dedup-index)
+# ============================================================
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+from deduplication import (
+    CANDIDATE_INDEXES,
+    LEDGER_COLUMNS,
+    SCOPUS_ID_COLUMN,
+    WOS_ID_COLUMN,
+    CandidateIndex,
+    build_candidate_index,
+    build_ledger,
+    cross_deduplicate,
+    normalize_doi,
+    record_ids,
+)
+from logging_utils import setup_logger
+from ui_messages import warn
+
+logger = setup_logger("dedup_index")
+
+# Sube este número si cambia el contenido o el formato del índice
+INDEX_FORMAT = 3
+
+_SCOPUS = "scopus.parquet"
+_WOS = "wos.parquet"
+_LEDGER = "ledger.parquet"
+_CANDIDATES = "candidates.npz"
+_MANIFEST = "manifest.json"
+
+
+@dataclass(frozen=True)
+class DedupIndex:
+    """
+    Estado persistido de la deduplicación.
+      - scopus: referencia en el orden del índice; las primeras main_size filas
+                están en el índice de candidatos, las siguientes (Scopus agregado
+                después) se comparan aparte hasta la próxima reconstrucción
+      - wos: registros de WoS ya comparados (ID + huella)
+      - ledger: matches vigentes
+      - candidate_index: índice de candidatos de scopus[:main_size]
+                         (solo métodos "blocking" y "minhash")
+    """
+    scopus: pd.DataFrame
+    wos: pd.DataFrame
+    ledger: pd.DataFrame
+    main_size: int
+    candidate_index: Optional[CandidateIndex] = None
+
+
+# ----------------------------
+# Tablas de referencia
+# ----------------------------
+def _normalized_doi(df: pd.DataFrame) -> pd.Series:
+    if "DOI" not in df.columns:
+        return pd.Series(pd.NA, index=df.index, dtype="string")
+    return normalize_doi(df["DOI"])
+
+
+def _fingerprint(titles: pd.Series, years: pd.Series, dois: pd.Series) -> np.ndarray:
+    """Huella por registro (título + año + DOI): si cambia, el registro se vuelve a comparar."""
+    frame = pd.DataFrame({"t": titles.to_numpy(), "y": years.to_numpy(), "d": dois.to_numpy()})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+
+def _scopus_table(scopus_df: pd.DataFrame) -> pd.DataFrame:
+    titles = scopus_df["processed_title"].astype(str)
+    years = pd.to_numeric(scopus_df.get("Year", pd.Series(np.nan, index=scopus_df.index)), errors="coerce").astype(float)
+    dois = _normalized_doi(scopus_df)
+    table = pd.DataFrame({
+        "scopus_row_id": record_ids(scopus_df, SCOPUS_ID_COLUMN, "scopus").to_numpy(),
+        "processed_title": titles.to_numpy(),
+        "Year": years.to_numpy(),
+        "DOI": dois.to_numpy(),
+        "fp": _fingerprint(titles, years, dois),
+    })
+    return table.drop_duplicates("scopus_row_id").reset_index(drop=True)
+
+
+def _wos_table(wos_df: pd.DataFrame) -> pd.DataFrame:
+    years = pd.to_numeric(wos_df.get("Publication Year", pd.Series(np.nan, index=wos_df.index)), errors="coerce").astype(float)
+    return pd.DataFrame({
+        "wos_row_id": record_ids(wos_df, WOS_ID_COLUMN, "wos").to_numpy(),
+        "fp": _fingerprint(wos_df["processed_title"].astype(str), years, _normalized_doi(wos_df)),
+    }, index=wos_df.index)
+
+
+def _scopus_frame(table: pd.DataFrame) -> pd.DataFrame:
+    """Tabla de referencia -> columnas que espera cross_deduplicate (mismo orden de filas)."""
+    frame = table[["scopus_row_id", "processed_title", "Year", "DOI"]].rename(columns={"scopus_row_id": SCOPUS_ID_COLUMN})
+    return frame.reset_index(drop=True)
+
+
+def _build_index(table: pd.DataFrame, method: str) -> Optional[CandidateIndex]:
+    if method not in CANDIDATE_INDEXES:
+        return None
+    return build_candidate_index(method, table["processed_title"].tolist(), table["Year"].tolist())
+
+
+def _params(threshold: int, method: str) -> dict:
+    return {
+        "format": INDEX_FORMAT,
+        "threshold": threshold,
+        "method": method,
+        "qgram": config.DEDUP_QGRAM,
+        "min_shared": config.DEDUP_MIN_SHARED_QGRAMS,
+        "confirm_matches": config.DEDUP_CONFIRM_MATCHES,
+        "confirm_partial": config.DEDUP_CONFIRM_PARTIAL,
+        "confirm_min_words": config.DEDUP_CONFIRM_MIN_WORDS,
+        "minhash_perm": config.DEDUP_MINHASH_PERM,
+        "minhash_bands": config.DEDUP_MINHASH_BANDS,
+    }
+
+
+# ----------------------------
+# Lectura / escritura
+# ----------------------------
+def load_dedup_index(out_dir: Path, params: dict) -> Optional[DedupIndex]:
+    """Abre el índice guardado si existe y fue construido con los mismos parámetros."""
+    manifest_path = out_dir / _MANIFEST
+    if not manifest_path.exists():
+        return None
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("params") != params:
+            logger.info("[Dedup index] cambiaron los parámetros del match: se recalcula todo")
+            return None
+        candidate_index = None
+        if params["method"] in CANDIDATE_INDEXES:
+            candidate_index = CANDIDATE_INDEXES[params["method"]].load(out_dir / _CANDIDATES)
+        return DedupIndex(
+            scopus=pd.read_parquet(out_dir / _SCOPUS),
+            wos=pd.read_parquet(out_dir / _WOS),
+            ledger=build_ledger(pd.read_parquet(out_dir / _LEDGER).to_numpy().tolist()),
+            main_size=int(manifest["main_size"]),
+            candidate_index=candidate_index,
+        )
+    except Exception as e:
+        logger.warning(f"[Dedup index] índice ilegible, se recalcula todo: {e}")
+        return None
+
+
+def save_dedup_index(state: DedupIndex, out_dir: Path, params: dict) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # El manifest se borra primero y se escribe al final: un guardado cortado
+    # deja el índice inválido (recalculo completo), nunca a medias
+    (out_dir / _MANIFEST).unlink(missing_ok=True)
+    state.scopus.to_parquet(out_dir / _SCOPUS, index=False)
+    state.wos.reset_index(drop=True).to_parquet(out_dir / _WOS, index=False)
+    state.ledger.to_parquet(out_dir / _LEDGER, index=False)
+    if state.candidate_index is not None:
+        state.candidate_index.save(out_dir / _CANDIDATES)
+    manifest = {
+        "params": params,
+        "main_size": state.main_size,
+        "scopus_rows": len(state.scopus),
+        "wos_rows": len(state.wos),
+        "ledger_rows": len(state.ledger),
+    }
+    (out_dir / _MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+
+
+# ----------------------------
+# Deduplicación incremental
+# ----------------------------
+def _best_per_record(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """Une ledgers parciales: un match por registro de WoS (DOI primero, luego mayor puntaje)."""
+    parts = [p for p in parts if not p.empty]
+    if not parts:
+        return build_ledger([])
+    ledger = pd.concat(parts, ignore_index=True)
+    rank = (ledger["method"] != "doi").astype(int)
+    order = np.lexsort((-ledger["score"].to_numpy(dtype=float), rank.to_numpy()))
+    ledger = ledger.iloc[order].drop_duplicates("wos_row_id", keep="first")
+    return build_ledger(ledger[LEDGER_COLUMNS].to_numpy().tolist())
+
+
+def _full_run(scopus_table, wos_df, wos_table, threshold, method) -> DedupIndex:
+    candidate_index = _build_index(scopus_table, method)
+    ledger = cross_deduplicate(_scopus_frame(scopus_table), wos_df, threshold, method=method, index=candidate_index)
+    return DedupIndex(scopus_table, wos_table, ledger, len(scopus_table), candidate_index)
+
+
+def _incremental_run(state: DedupIndex, scopus_table, wos_df, wos_table, threshold, method) -> Optional[DedupIndex]:
+    # Scopus: solo se admiten altas; una baja o un cambio invalida el índice
+    current_fp = dict(zip(scopus_table["scopus_row_id"], scopus_table["fp"]))
+    stored_ok = [current_fp.get(i) == fp for i, fp in zip(state.scopus["scopus_row_id"], state.scopus["fp"])]
+    if not all(stored_ok):
+        logger.info("[Dedup index] Scopus perdió o modificó registros ya indexados: se recalcula todo")
+        return None
+    s_new = scopus_table[~scopus_table["scopus_row_id"].isin(state.scopus["scopus_row_id"])]
+    reference = pd.concat([state.scopus, s_new], ignore_index=True)
+
+    # WoS: nuevo o modificado = ID desconocido o huella distinta
+    stored_wos = dict(zip(state.wos["wos_row_id"], state.wos["fp"]))
+    seen = np.array([stored_wos.get(i) == fp for i, fp in zip(wos_table["wos_row_id"], wos_table["fp"])], dtype=bool)
+    seen_ids = set(wos_table.loc[seen, "wos_row_id"])
+    kept = state.ledger[state.ledger["wos_row_id"].isin(seen_ids)]
+    unmatched = seen & ~wos_table["wos_row_id"].isin(kept["wos_row_id"]).to_numpy()
+
+    logger.info(
+        f"[Dedup index] incremental: {int((~seen).sum())} WoS nuevos/modificados, "
+        f"{len(s_new)} Scopus nuevos, {len(kept)} matches reutilizados"
+    )
+
+    parts = [kept]
+    if (~seen).any():
+        wos_new = wos_df[~seen]
+        main = reference.iloc[:state.main_size]
+        parts.append(cross_deduplicate(_scopus_frame(main), wos_new, threshold, method=method, index=state.candidate_index))
+        delta = reference.iloc[state.main_size:]
+        if not delta.empty:
+            parts.append(cross_deduplicate(_scopus_frame(delta), wos_new, threshold, method=method))
+    if not s_new.empty and unmatched.any():
+        parts.append(cross_deduplicate(_scopus_frame(s_new), wos_df[unmatched], threshold, method=method))
+
+    ledger = _best_per_record(parts)
+
+    # Scopus agregado fuera del índice principal: se integra si ya es grande
+    main_size, candidate_index = state.main_size, state.candidate_index
+    if len(reference) - main_size > config.DEDUP_INDEX_MERGE_FRACTION * max(1, main_size):
+        main_size = len(reference)
+        candidate_index = _build_index(reference, method)
+    return DedupIndex(reference, wos_table, ledger, main_size, candidate_index)
+
+
+def incremental_deduplicate(
+    scopus_df: pd.DataFrame,
+    wos_df: pd.DataFrame,
+    threshold: int,
+    method: Optional[str] = None,
+    rebuild: bool = False,
+) -> pd.DataFrame:
+    """
+    cross_deduplicate con índice persistente: solo compara registros nuevos o
+    modificados contra el índice guardado y agrega sus matches al ledger previo.
+    rebuild=True descarta el índice y recalcula todo. Sin pyarrow no hay índice
+    (se hace el cálculo completo en cada ejecución).
+    """
+    method = method or config.DEDUP_METHOD
+    if scopus_df is None or wos_df is None or scopus_df.empty or wos_df.empty:
+        return build_ledger([])
+
+    from csv_engine import pyarrow_available
+
+    if not pyarrow_available():
+        warn("Deduplicación", "pyarrow no está instalado: la deduplicación se recalcula completa en cada ejecución.")
+        return cross_deduplicate(scopus_df, wos_df, threshold, method=method)
+
+    out_dir = Path(config.DEDUP_INDEX_DIR)
+    params = _params(threshold, method)
+    scopus_table = _scopus_table(scopus_df)
+    wos_table = _wos_table(wos_df)
+
+    state = None if rebuild else load_dedup_index(out_dir, params)
+    if state is not None:
+        state = _incremental_run(state, scopus_table, wos_df, wos_table, threshold, method)
+    if state is None:
+        logger.info(f"[Dedup index] cálculo completo: {len(scopus_table)} Scopus x {len(wos_table)} WoS")
+        state = _full_run(scopus_table, wos_df, wos_table, threshold, method)
+
+    save_dedup_index(state, out_dir, params)
+    return state.ledger
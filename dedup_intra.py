@@ -0,0 +1,168 @@
+# ============================================================
+# dedup_intra.py
+#   - Deduplicación fuzzy INTERNA de una fuente (Scopus o WoS), después del
+#     drop_duplicates exacto por processed_title de los loaders
+#   - Casos: exports de WoS solapados, re-exports de Scopus, typos, puntuación
+#     de subtítulos, versiones de erratum
+#   - Mismo matcher que el cruce WoS vs Scopus (deduplication.py): índice de
+#     candidatos (blocking / minhash) + pool de procesos con memoria compartida,
+#     pero la fuente se compara contra sí misma (pares i < j) con fuzz.ratio
+#   - Los pares se agrupan con union-find; por grupo sobrevive un registro según
+#     config.DEDUP_INTRA_PRIORITY (con DOI, más citas, más reciente)
+#   - Opcional: config.DEDUP_INTRA_ENABLED
+# ============================================================
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+from deduplication import (
+    CANDIDATE_INDEXES,
+    FuzzyCandidates,
+    build_candidate_index,
+    normalize_doi,
+    parallel_matches,
+    run_self_chunk,
+)
+from ui_messages import info
+
+
+# ----------------------------
+# Union-find
+# ----------------------------
+def cluster_labels(size: int, pairs: Sequence[Tuple[int, int, float]]) -> np.ndarray:
+    """Etiqueta de grupo (raíz del union-find) de cada posición; pares = (i, j, puntaje)."""
+    parent = list(range(size))
+
+    def find(x: int) -> int:
+        # Compresión de camino por mitades
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j, _ in pairs:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            # La raíz es la posición menor: etiquetas estables entre corridas
+            parent[max(ri, rj)] = min(ri, rj)
+    return np.fromiter((find(x) for x in range(size)), dtype=np.int64, count=size)
+
+
+# ----------------------------
+# Sobreviviente por grupo
+# ----------------------------
+def _has_doi(df: pd.DataFrame, year_column: str, citation_columns: Sequence[str]) -> np.ndarray:
+    return normalize_doi(df.get("DOI", pd.Series(index=df.index, dtype=object))).notna().to_numpy(dtype=float)
+
+
+def _citations(df: pd.DataFrame, year_column: str, citation_columns: Sequence[str]) -> np.ndarray:
+    column = next((c for c in citation_columns if c in df.columns), None)
+    if column is None:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[column], errors="coerce").fillna(-1).to_numpy(dtype=float)
+
+
+def _newest(df: pd.DataFrame, year_column: str, citation_columns: Sequence[str]) -> np.ndarray:
+    if year_column not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[year_column], errors="coerce").fillna(-np.inf).to_numpy(dtype=float)
+
+
+# Criterios de config.DEDUP_INTRA_PRIORITY: valor por registro, mayor = preferido
+PRIORITY_KEYS: Dict[str, Callable[[pd.DataFrame, str, Sequence[str]], np.ndarray]] = {
+    "has_doi": _has_doi,
+    "citations": _citations,
+    "newest": _newest,
+}
+
+
+def survivor_mask(
+    df: pd.DataFrame,
+    labels: np.ndarray,
+    priority: Sequence[str],
+    year_column: str,
+    citation_columns: Sequence[str],
+) -> np.ndarray:
+    """
+    Máscara de registros que se conservan: el primero de cada grupo según la prioridad
+    (criterios en orden; empate -> el que aparece antes en el merge).
+    """
+    unknown = [p for p in priority if p not in PRIORITY_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown intra-dedup priority: {unknown} (valid: {list(PRIORITY_KEYS)})")
+
+    # np.lexsort ordena por la ÚLTIMA clave primero: grupo, criterios, posición
+    keys: List[np.ndarray] = [np.arange(len(df))]
+    keys += [-PRIORITY_KEYS[p](df, year_column, citation_columns) for p in reversed(priority)]
+    keys.append(labels)
+    order = np.lexsort(keys)
+
+    sorted_labels = labels[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_labels[1:] != sorted_labels[:-1]
+    keep = np.zeros(len(df), dtype=bool)
+    keep[order[first]] = True
+    return keep
+
+
+# ----------------------------
+# Etapa completa
+# ----------------------------
+def fuzzy_intra_deduplicate(
+    df: pd.DataFrame,
+    source: str,
+    year_column: str,
+    citation_columns: Sequence[str],
+    threshold: Optional[int] = None,
+    method: Optional[str] = None,
+    priority: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Quita casi-duplicados de una fuente ya deduplicada por processed_title exacto.
+
+    Dos registros son casi-duplicados si fuzz.ratio(processed_title) >= threshold y
+    sus años son compatibles (±1, o falta alguno: misma regla que el cruce). Los pares
+    se agrupan transitivamente y por grupo queda un solo registro (ver survivor_mask).
+    Por defecto usa config.DEDUP_INTRA_THRESHOLD / DEDUP_INTRA_METHOD / DEDUP_INTRA_PRIORITY.
+    """
+    if df is None or len(df) < 2:
+        return df
+    threshold = config.DEDUP_INTRA_THRESHOLD if threshold is None else threshold
+    method = method or config.DEDUP_INTRA_METHOD
+    priority = config.DEDUP_INTRA_PRIORITY if priority is None else priority
+    if method not in ("bruteforce", *CANDIDATE_INDEXES):
+        raise ValueError(f"Unknown deduplication method: {method}")
+
+    titles = df["processed_title"].fillna("").astype(str).tolist()
+    years = (
+        pd.to_numeric(df[year_column], errors="coerce").to_numpy(dtype=float)
+        if year_column in df.columns
+        else np.full(len(df), np.nan)
+    )
+
+    index = None
+    if method != "bruteforce":
+        index = build_candidate_index(method, titles, years, min_shared=config.DEDUP_INTRA_MIN_SHARED_QGRAMS)
+    candidates = FuzzyCandidates(
+        row_ids=np.arange(len(df)),
+        titles=np.array(titles, dtype=object),
+        years=years,
+    )
+    pairs = parallel_matches(run_self_chunk, candidates, titles, years, threshold, index, method)
+    if not pairs:
+        info(f"{source} unificado", f"Dedup fuzzy interno: sin casi-duplicados (ratio >= {threshold}).")
+        return df
+
+    labels = cluster_labels(len(df), pairs)
+    keep = survivor_mask(df, labels, priority, year_column, citation_columns)
+    n_groups = len(np.unique(labels[~keep]))
+    info(
+        f"{source} unificado",
+        f"Dedup fuzzy interno: {n_groups} grupos de casi-duplicados (ratio >= {threshold}), "
+        f"{int((~keep).sum())} registros eliminados.",
+    )
+    return df[keep]
@@ -0,0 +1,171 @@
+# ============================================================
+# dedup_minhash.py
+#   - Índice MinHash + LSH para el fuzzy match WoS vs Scopus en corpus muy grandes
+#   - Firmas MinHash de los q-gramas de processed_title, calculadas con NumPy:
+#       1) q-gramas como enteros (códigos UTF-32 de los caracteres), sin bucles Python
+#       2) num_perm funciones hash universales (a·x + b) mod p sobre los q-gramas únicos
+#       3) mínimo por título con np.minimum.reduceat
+#   - LSH por bandas: la firma se corta en `bands` bandas de `rows` valores; dos
+#     títulos son candidatos si coinciden en al menos una banda completa
+#     (similitud de Jaccard umbral aprox. (1/bands)^(1/rows))
+#   - Misma interfaz que BlockingIndex: candidates(title, year) devuelve índices
+#     de Scopus de año compatible; se verifican después con WRatio.
+#     También arrays / from_arrays para compartirlo con los workers sin pickle
+# ============================================================
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# Primo de Mersenne 2^31 - 1: (a·x + b) cabe en uint64 sin desbordar
+_PRIME = np.uint64((1 << 31) - 1)
+# Bits por carácter al armar el código de un q-grama (cubre todo Unicode)
+_CHAR_BITS = np.uint64(21)
+# Títulos por tanda al generar q-gramas (acota la memoria en corpus grandes) y
+# sub-tanda al tomar mínimos (acota la matriz q-gramas x num_perm)
+_SHINGLE_BATCH = 16384
+_SIGNATURE_BATCH = 2048
+
+
+def shingle_codes(titles: Sequence[str], q: int = 3):
+    """
+    q-gramas de todos los títulos (con bordes, como dedup_blocking.qgrams) como enteros.
+    Retorna (códigos, offsets): los q-gramas del título i son códigos[offsets[i]:offsets[i+1]].
+    """
+    padded = [f" {t} ".ljust(q) for t in titles]
+    lengths = np.fromiter((len(p) for p in padded), dtype=np.int64, count=len(padded))
+    chars = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+    n_grams = lengths - q + 1
+    offsets = np.zeros(len(padded) + 1, dtype=np.int64)
+    np.cumsum(n_grams, out=offsets[1:])
+    char_starts = np.zeros(len(padded), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=char_starts[1:])
+
+    # Posición (en el texto concatenado) del primer carácter de cada q-grama
+    pos = np.arange(offsets[-1], dtype=np.int64) + np.repeat(char_starts - offsets[:-1], n_grams)
+    codes = chars[pos]
+    for j in range(1, q):
+        codes = (codes << _CHAR_BITS) | chars[pos + j]
+    return codes, offsets
+
+
+class MinHashIndex:
+    """
+    Índice LSH sobre firmas MinHash de los títulos de Scopus.
+
+    Por banda se guardan las claves de todos los títulos ordenadas (y su posición
+    original), así cada consulta es un searchsorted por banda. Los candidatos se
+    ordenan por número de bandas coincidentes (estimación de similitud).
+    """
+
+    def __init__(
+        self,
+        titles: Sequence[str],
+        years: Sequence[float],
+        q: int = 3,
+        num_perm: int = 64,
+        bands: int = 16,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) debe ser múltiplo de bands ({bands})")
+        self.q = q
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+        # Multiplicadores impares para combinar los `rows` valores de una banda en una clave
+        self.mix = rng.integers(1, 1 << 62, self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self.years = np.asarray(years, dtype=float)
+        self.size = len(self.years)
+
+        keys = self._band_keys(self.signatures(titles))
+        self.band_docs = np.argsort(keys, axis=1, kind="stable").astype(np.int32)
+        self.band_keys = np.take_along_axis(keys, self.band_docs.astype(np.int64), axis=1)
+
+    def signatures(self, titles: Sequence[str]) -> np.ndarray:
+        """Firmas MinHash (n_títulos x num_perm, uint32)."""
+        n = len(titles)
+        sig = np.empty((n, self.num_perm), dtype=np.uint32)
+        if n == 0:
+            return sig
+        for t0 in range(0, n, _SHINGLE_BATCH):
+            batch = titles[t0:t0 + _SHINGLE_BATCH]
+            codes, offsets = shingle_codes(batch, self.q)
+            # Cada q-grama distinto de la tanda se hashea una sola vez
+            unique, inverse = np.unique(codes, return_inverse=True)
+            hashed = ((self.a[None, :] * (unique % _PRIME)[:, None] + self.b) % _PRIME).astype(np.uint32)
+            for d0 in range(0, len(batch), _SIGNATURE_BATCH):
+                d1 = min(len(batch), d0 + _SIGNATURE_BATCH)
+                lo, hi = offsets[d0], offsets[d1]
+                sig[t0 + d0:t0 + d1] = np.minimum.reduceat(hashed[inverse[lo:hi]], offsets[d0:d1] - lo, axis=0)
+        return sig
+
+    def _band_keys(self, sig: np.ndarray) -> np.ndarray:
+        """Clave uint64 por (banda, título): combinación de los `rows` valores de la banda."""
+        blocks = sig.astype(np.uint64).reshape(len(sig), self.bands, self.rows)
+        return (blocks * self.mix).sum(axis=2, dtype=np.uint64).T.copy()
+
+    def candidates(self, title: str, year: Optional[float] = None) -> np.ndarray:
+        """
+        Índices de Scopus que comparten al menos una banda con el título y tienen año
+        compatible (±1, o sin año en cualquiera de los dos), más bandas primero.
+        """
+        keys = self._band_keys(self.signatures([title]))[:, 0]
+        hits = []
+        for band, key in enumerate(keys):
+            row = self.band_keys[band]
+            lo, hi = np.searchsorted(row, key, side="left"), np.searchsorted(row, key, side="right")
+            if hi > lo:
+                hits.append(self.band_docs[band, lo:hi])
+        if not hits:
+            return np.empty(0, dtype=np.int64)
+
+        docs, shared = np.unique(np.concatenate(hits), return_counts=True)
+        if year is not None and not np.isnan(year):
+            doc_years = self.years[docs]
+            keep = np.isnan(doc_years) | (np.abs(doc_years - float(year)) <= 1)
+            docs, shared = docs[keep], shared[keep]
+        return docs[np.argsort(-shared, kind="stable")].astype(np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return self.band_keys.nbytes + self.band_docs.nbytes + self.years.nbytes
+
+    # ----------------------------
+    # Persistencia (.npz) y memoria compartida
+    # ----------------------------
+    _ARRAYS = ("a", "b", "mix", "years", "band_keys", "band_docs")
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Todo el índice como arreglos NumPy."""
+        return {
+            "params": np.array([self.q, self.num_perm, self.bands], dtype=np.int64),
+            **{name: getattr(self, name) for name in self._ARRAYS},
+        }
+
+    @classmethod
+    def from_arrays(cls, data) -> "MinHashIndex":
+        """Índice sobre arreglos de arrays() (un .npz abierto o vistas de memoria compartida)."""
+        index = cls.__new__(cls)
+        index.q, index.num_perm, index.bands = (int(v) for v in data["params"])
+        for name in cls._ARRAYS:
+            setattr(index, name, data[name])
+        index.rows = index.num_perm // index.bands
+        index.size = len(index.years)
+        return index
+
+    def save(self, path: Path) -> None:
+        np.savez(path, **self.arrays())
+
+    @classmethod
+    def load(cls, path: Path) -> "MinHashIndex":
+        with np.load(path) as data:
+            return cls.from_arrays(data)
@@ -4,15 +4,25 @@
 #   - Estrategia:
 #       1) DOI match (exacto y rápido)
 #       2) Fuzzy title + año ±1 (aproximado y lento -> PARALELIZADO)
+#          Scopus se particiona por año: cada título de WoS solo se compara con
+#          las particiones año-1..año+1 y la de Scopus sin año (WoS sin año: todo)
+#          Match = mayor WRatio >= umbral en año compatible que además pase
+#          confirm_match (WRatio da 85.5 a títulos que comparten una sola palabra)
+#          method="blocking": solo contra candidatos del índice (dedup_blocking)
+#          method="minhash": solo contra candidatos MinHash/LSH (dedup_minhash), corpus muy grandes
+#          method="bruteforce": contra todas las particiones de año compatibles
+#          method="cdist": matriz WoS x Scopus con rapidfuzz.process.cdist (multihilo)
+#   - process_self_chunk / parallel_matches: el mismo matcher (índice + pool) para
+#     comparar una fuente contra sí misma (deduplicación interna, dedup_intra.py)
 # ============================================================
 from __future__ import annotations
 
 # Librería estándar para procesamiento paralelo (aprovechar múltiples núcleos de CPU)
 import multiprocessing
-# Ejecutor de procesos para lanzar tareas en paralelo
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import time
+from dataclasses import dataclass
 # Tipado estático para ayudar al IDE y desarrolladores
-from typing import Set, List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
 
 # Librerías científicas
 import numpy as np
@@ -20,190 +30,600 @@ import pandas as pd
 # Librería de comparación difusa de strings (más rápida que fuzzywuzzy)
 from rapidfuzz import fuzz, process
 
+import config
+from dedup_blocking import BlockingIndex
+from dedup_minhash import MinHashIndex
+from logging_utils import setup_logger
+from shared_reference import AttachedReference, ReferenceHandle, SharedReference
+
 # Importamos logger en lugar de ui_messages para registrar eventos
 # aunque en este archivo mantenemos la lógica pura y usamos prints para depuración interna de workers.
+# El progreso del fuzzy match (registros/s, ETA) sí va por el logger.
+logger = setup_logger("deduplication")
 
 # ---------------------------------------------------------
 # Variables Globales para Workers (Procesos Hijos)
 # ---------------------------------------------------------
-# Estas variables almacenarán la copia de datos de Scopus en cada proceso.
-# Se usan globales para que al crear el proceso, la memoria se comparta (copy-on-write en Linux/Mac)
-# o se inicialice una sola vez en Windows, evitando pasar grandes datos en cada llamada.
-_scopus_titles: List[str] = []
-_scopus_years: List[float] = []
+# Scopus (títulos + años) vive en un bloque de memoria compartida (shared_reference):
+# cada worker solo recibe el nombre del bloque y lo adjunta sin copiar ni des-picklear
+# las listas completas. Los títulos se decodifican por partición de año, al primer uso.
+_reference: Optional[AttachedReference] = None
+# Ventanas ya armadas (año-1..año+1 + sin año; None = WoS sin año, todo Scopus),
+# se construyen al primer uso
+_year_windows: Dict[Optional[int], Tuple[List[str], np.ndarray]] = {}
+# Índice de candidatos: BlockingIndex o MinHashIndex (None = modo bruteforce,
+# se compara contra las particiones). Sus arreglos van en el mismo bloque compartido.
+CandidateIndex = Union[BlockingIndex, MinHashIndex]
+_candidate_index: Optional[CandidateIndex] = None
+
+def share_reference(
+    titles: Sequence[str], years: Sequence[float], index: Optional[CandidateIndex] = None
+) -> SharedReference:
+    """Bloque compartido con los títulos/años de referencia y, si hay, los arreglos del índice."""
+    return SharedReference(titles, years, None if index is None else index.arrays())
+
+def index_method(index: Optional[CandidateIndex]) -> Optional[str]:
+    """Método del índice ("blocking" / "minhash"), lo que init_worker necesita para rearmarlo."""
+    if index is None:
+        return None
+    return next(method for method, cls in CANDIDATE_INDEXES.items() if isinstance(index, cls))
 
-def init_worker(titles: List[str], years: List[float]):
+def init_worker(reference: ReferenceHandle, method: Optional[str] = None):
     """
     Función de inicialización que se ejecuta UNA VEZ por cada proceso worker creado.
-    Recibe la lista completa de títulos y años de Scopus.
+    Adjunta el bloque compartido de Scopus y, si method es "blocking" o "minhash",
+    arma el índice de candidatos sobre los arreglos del mismo bloque (sin copiarlos).
+    """
+    global _reference, _candidate_index, _year_windows
+    release_worker()
+    _reference = AttachedReference(reference)
+    if method is not None:
+        _candidate_index = CANDIDATE_INDEXES[method].from_arrays(_reference.arrays)
+    _year_windows = {}
+
+def release_worker():
+    """Suelta el bloque adjuntado (solo hace falta si se usó init_worker en el proceso principal)."""
+    global _reference, _candidate_index, _year_windows
+    # El índice apunta al bloque: se suelta antes de cerrarlo
+    _candidate_index = None
+    _year_windows = {}
+    if _reference is not None:
+        _reference.close()
+    _reference = None
+
+def year_window(year: float) -> Tuple[List[str], np.ndarray]:
+    """
+    Títulos de Scopus comparables con un registro de WoS del año dado:
+    particiones año-1, año, año+1 y la de Scopus sin año.
+    Si el registro de WoS no tiene año, se compara contra todo Scopus.
+    Retorna (títulos, posiciones en la lista original de Scopus).
+    """
+    key = None if pd.isna(year) else int(year)
+    if key not in _year_windows:
+        if key is None:
+            positions = np.arange(len(_reference))
+        else:
+            positions = np.concatenate([_reference.partition(y) for y in (key - 1, key, key + 1, None)])
+        _year_windows[key] = (_reference.titles(positions), positions)
+    return _year_windows[key]
+
+# Métodos con índice de candidatos
+CANDIDATE_INDEXES = {"blocking": BlockingIndex, "minhash": MinHashIndex}
+
+def build_candidate_index(
+    method: str,
+    titles: List[str],
+    years: List[float],
+    min_shared: Optional[float] = None,
+) -> CandidateIndex:
+    """
+    Construye el índice de candidatos del método ("blocking" o "minhash") con los parámetros de config.
+    min_shared reemplaza a config.DEDUP_MIN_SHARED_QGRAMS (índice de bloqueo; p. ej. dedup_intra).
     """
-    global _scopus_titles, _scopus_years
-    _scopus_titles = titles
-    _scopus_years = years
+    if method == "minhash":
+        return MinHashIndex(
+            titles,
+            years,
+            q=config.DEDUP_QGRAM,
+            num_perm=config.DEDUP_MINHASH_PERM,
+            bands=config.DEDUP_MINHASH_BANDS,
+        )
+    if min_shared is None:
+        min_shared = config.DEDUP_MIN_SHARED_QGRAMS
+    return BlockingIndex(titles, years, q=config.DEDUP_QGRAM, min_shared=min_shared)
 
-def process_chunk(wos_chunk: List[Dict[str, Any]], threshold: int) -> Set[str]:
+def confirm_match(a: str, b: str, threshold: float) -> bool:
+    """
+    Segunda verificación de un par con WRatio >= threshold.
+    Si un título es >= 1.5x más largo, WRatio llega a 85.5 con UNA palabra en común
+    (partial_token_set_ratio = 100, escalado 0.95 x 0.9): "trust" o "political trust"
+    coinciden con cualquier título que contenga esas palabras. Se acepta el par si:
+      - ratio o token_sort_ratio >= threshold (mismo título, con typos o en otro orden), o
+      - el título corto (>= DEDUP_CONFIRM_MIN_WORDS palabras) está contenido en el largo
+        (partial_ratio >= DEDUP_CONFIRM_PARTIAL): título + traducción, subtítulo agregado.
+    Con DEDUP_CONFIRM_MATCHES = False se acepta todo par (solo WRatio).
+    """
+    if not config.DEDUP_CONFIRM_MATCHES:
+        return True
+    if max(fuzz.ratio(a, b), fuzz.token_sort_ratio(a, b)) >= threshold:
+        return True
+    shorter = min(a, b, key=len)
+    return (
+        len(shorter.split()) >= config.DEDUP_CONFIRM_MIN_WORDS
+        and fuzz.partial_ratio(a, b) >= config.DEDUP_CONFIRM_PARTIAL
+    )
+
+def best_confirmed(
+    title: str, choices: List[str], positions: Sequence[int], threshold: int
+) -> Optional[Tuple[int, float]]:
+    """
+    Mejor candidato de `choices` para el título: mayor WRatio >= threshold que pase
+    confirm_match (empate -> menor posición en Scopus).
+    Retorna (posición en Scopus, puntaje) o None.
+    """
+    best = None
+    # limit=None: todos los que pasan el umbral, de mayor a menor puntaje
+    for choice, score, k in process.extract(title, choices, scorer=fuzz.WRatio, score_cutoff=threshold, limit=None):
+        if best is not None and score < best[1]:
+            break
+        pos = int(positions[k])
+        if (best is None or pos < best[0]) and confirm_match(title, choice, threshold):
+            best = (pos, float(score))
+    return best
+
+def process_chunk(wos_chunk: FuzzyCandidates, threshold: int) -> List[Tuple[str, int, float]]:
     """
     Función que ejecuta cada worker en paralelo.
     Procesa un subconjunto (chunk) de registros de WoS y busca si existen en los datos globales de Scopus.
     
     Args:
-        wos_chunk: Lista de diccionarios con datos de WoS (título, año)
+        wos_chunk: Registros de WoS como arreglos paralelos (row_id, título, año)
         threshold: Umbral de similitud (0-100) para considerar duplicado
         
     Returns:
-        Set de títulos normalizados que se encontraron duplicados.
+        Lista de matches (row_id de WoS, posición del registro de Scopus, puntaje).
     """
-    duplicates_found = set()
+    matches_found = []
     
-    # Accedemos a las variables globales cargadas en init_worker
-    global _scopus_titles, _scopus_years
-
     # Iteramos sobre cada artículo de WoS en este chunk
-    for row in wos_chunk:
-        w_title = row.get("processed_title", "")
-        w_year = row.get("year", np.nan)
+    for row_id, w_title, w_year in zip(wos_chunk.row_ids, wos_chunk.titles, wos_chunk.years):
         
         # Optimización: Si el título es muy corto (< 5 chars), ignorar para evitar falsos positivos ruido
         if len(w_title) < 5:
             continue
 
-        # BUSQUEDA DIFUSA:
-        # process.extractOne busca el mejor candidato en _scopus_titles para w_title
-        # scorer=fuzz.WRatio usa una media ponderada de diferentes algoritmos de Levenshtein
-        # Retorna una tupla: (mejor_match, puntaje, índice_en_lista)
-        result = process.extractOne(w_title, _scopus_titles, scorer=fuzz.WRatio)
-        
-        # Si no encontró nada (lista vacía), continuar
-        if not result:
+        # MODO ÍNDICE (blocking / minhash):
+        # El índice ya filtra por año (±1, o cualquier año si falta) y por similitud
+        # (q-gramas compartidos o bandas LSH). Solo se decodifican y puntúan esos
+        # candidatos, todos: el ledger guarda el mejor, igual que bruteforce.
+        if _candidate_index is not None:
+            cand = _candidate_index.candidates(w_title, w_year)
+            found = best_confirmed(w_title, _reference.titles(cand), cand, threshold)
+            if found:
+                matches_found.append((row_id, *found))
             continue
-            
-        _, score, idx = result
+
+        # BUSQUEDA DIFUSA (por particiones de año):
+        # Solo se buscan candidatos de año compatible (±1, o sin año). Así un match
+        # mejor pero de otro año ya no "tapa" un match válido del año correcto.
+        # scorer=fuzz.WRatio usa una media ponderada de diferentes algoritmos de Levenshtein
+        # score_cutoff descarta (y deja de puntuar) lo que quede bajo el umbral (ej. 85);
+        # cada match se confirma con confirm_match (WRatio solo no basta, ver arriba)
+        titles, positions = year_window(w_year)
+        found = best_confirmed(w_title, titles, positions, threshold)
+
+        # Si hay un match confirmado en año compatible -> DUPLICADO
+        if found:
+            matches_found.append((row_id, *found))
         
-        # Si el puntaje es menor al umbral definido (ej. 85), NO es duplicado
-        if score < threshold:
+    return matches_found
+
+def run_chunk(args) -> tuple:
+    """Tarea del scheduler: (chunk, threshold) -> (registros procesados, matches)."""
+    wos_chunk, threshold = args
+    return len(wos_chunk), process_chunk(wos_chunk, threshold)
+
+def process_self_chunk(chunk: FuzzyCandidates, threshold: int) -> List[Tuple[int, int, float]]:
+    """
+    Variante de process_chunk para deduplicar una fuente contra sí misma (dedup_intra).
+    El chunk son registros de la PROPIA referencia: row_ids = posiciones en ella.
+
+    Retorna TODOS los pares (i, j, puntaje) con j > i (cada par se puntúa una sola vez,
+    sin el registro consigo mismo) y año compatible. Se puntúa con fuzz.ratio y no con
+    WRatio: WRatio da 85.5 a títulos distintos que comparten una sola palabra, y aquí
+    un falso positivo elimina un artículo.
+    """
+    pairs = []
+    for i, title, year in zip(chunk.row_ids, chunk.titles, chunk.years):
+        if len(title) < 5:
             continue
-            
-        # VALIDACIÓN DE AÑO:
-        # Si pasó el filtro de título, verificamos el año para estar seguros
-        # Recuperamos el año del candidato encontrado en Scopus usando el índice
-        s_year = _scopus_years[idx]
-        
-        # Solo comparamos si ambos registros tienen año válido (no son NaN)
-        if pd.notna(w_year) and pd.notna(s_year):
-            # Calculamos la diferencia absoluta entre años.
-            # Permitimos un margen de error de 1 año (ej. 2020 vs 2021 es aceptable)
-            # Si la diferencia es mayor a 1, asumimos que son papers distintos con título similar
-            if abs(int(w_year) - int(s_year)) > 1:
-                continue
-                
-        # Si pasa todas las pruebas, agregamos el título a la lista de duplicados encontrados
-        duplicates_found.add(w_title)
-        
-    return duplicates_found
+
+        if _candidate_index is not None:
+            cand = _candidate_index.candidates(title, year)
+            cand = cand[cand > i]
+            choices = _reference.titles(cand)
+        else:
+            choices, cand = year_window(year)
+        for choice, score, k in process.extract(title, choices, scorer=fuzz.ratio, score_cutoff=threshold, limit=None):
+            j = int(cand[k])
+            if j > i and len(choice) >= 5:
+                pairs.append((int(i), j, float(score)))
+    return pairs
+
+def run_self_chunk(args) -> tuple:
+    """Tarea del scheduler para process_self_chunk: (chunk, threshold) -> (registros procesados, pares)."""
+    chunk, threshold = args
+    return len(chunk), process_self_chunk(chunk, threshold)
+
+class ProgressReporter:
+    """Reporta por el logger registros procesados, registros/s y ETA (a lo sumo cada `every` segundos)."""
+
+    def __init__(self, total: int, every: float):
+        self.total = total
+        self.every = every
+        self.done = 0
+        self.start = time.perf_counter()
+        self.last = self.start
+
+    def update(self, n: int) -> None:
+        self.done += n
+        now = time.perf_counter()
+        if now - self.last < self.every and self.done < self.total:
+            return
+        self.last = now
+        rate = self.done / max(now - self.start, 1e-9)
+        eta = (self.total - self.done) / rate if rate > 0 else float("inf")
+        logger.info(
+            f"[Deduplication] {self.done}/{self.total} records ({100 * self.done / self.total:.1f}%) "
+            f"| {rate:.0f} rec/s | ETA {eta:.0f} s"
+        )
 
 # ---------------------------------------------------------
-# Lógica Principal de Deduplicación
+# Modo Matriz (rapidfuzz.process.cdist)
 # ---------------------------------------------------------
-def cross_deduplicate(scopus_df: pd.DataFrame, wos_df: pd.DataFrame, threshold: int) -> Set[str]:
+def cdist_matches(
+    candidates: FuzzyCandidates,
+    scopus_titles: List[str],
+    scopus_years: Sequence[float],
+    threshold: int,
+    chunk_size: Optional[int] = None,
+    block_size: Optional[int] = None,
+) -> List[Tuple[str, int, float]]:
+    """
+    Fuzzy match en modo matriz: cada chunk de WoS se puntúa contra bloques de Scopus
+    con process.cdist (score_cutoff=threshold, uint8, todos los hilos) y la regla de
+    año ±1 se aplica con NumPy sobre la matriz. Un título es duplicado si tiene
+    algún match >= threshold en año compatible (o sin año en alguno de los dos) que
+    pase confirm_match. Retorna la misma forma que process_chunk: (row_id de WoS,
+    posición en Scopus, puntaje), con el mejor match confirmado de todos los bloques
+    (empate -> menor posición en Scopus; puntaje entero, uint8).
+    """
+    chunk_size = chunk_size or config.DEDUP_CDIST_CHUNK
+    block_size = block_size or config.DEDUP_CDIST_BLOCK
+
+    # Mismo filtro de títulos cortos que process_chunk
+    rows = candidates[np.fromiter((len(t) >= 5 for t in candidates.titles), dtype=bool, count=len(candidates))]
+    w_titles = rows.titles
+    w_ids = rows.row_ids
+    w_years = np.asarray(rows.years, dtype=float)
+
+    # Ambos lados ordenados por año (sin año al final): cada chunk de WoS (un año)
+    # solo se compara con las columnas de Scopus de años [año-1, año+1] + sin año
+    s_years_raw = np.asarray(scopus_years, dtype=float)
+    s_order = np.argsort(np.where(np.isnan(s_years_raw), np.inf, s_years_raw), kind="stable")
+    s_years = s_years_raw[s_order]
+    s_titles = [scopus_titles[i] for i in s_order]
+    n_dated = int((~np.isnan(s_years)).sum())
+    w_order = np.argsort(np.where(np.isnan(w_years), np.inf, w_years), kind="stable")
+
+    # Chunks de WoS de un solo año (o sin año), de a lo sumo chunk_size filas
+    sorted_years = np.where(np.isnan(w_years[w_order]), np.inf, w_years[w_order])
+    cuts = np.flatnonzero(np.diff(sorted_years)) + 1
+    chunks = [
+        group[i:i + chunk_size]
+        for group in np.split(w_order, cuts)
+        for i in range(0, len(group), chunk_size)
+    ]
+
+    matches_found: List[Tuple[str, int, float]] = []
+    for pending in chunks:
+        chunk_years = w_years[pending]
+        if np.isnan(chunk_years).any():
+            ranges = [(0, len(s_titles))]
+        else:
+            lo = int(np.searchsorted(s_years[:n_dated], chunk_years.min() - 1, side="left"))
+            hi = int(np.searchsorted(s_years[:n_dated], chunk_years.max() + 1, side="right"))
+            ranges = [(lo, hi), (n_dated, len(s_titles))]
+
+        blocks = [(b0, min(b0 + block_size, hi)) for lo, hi in ranges for b0 in range(lo, hi, block_size)]
+        # Mejor match confirmado por fila del chunk: (posición en Scopus, puntaje)
+        best: Dict[int, Tuple[int, float]] = {}
+        for b0, b1 in blocks:
+            scores = process.cdist(
+                w_titles[pending].tolist(),
+                s_titles[b0:b1],
+                scorer=fuzz.WRatio,
+                score_cutoff=threshold,
+                dtype=np.uint8,
+                workers=-1,
+            )
+            # Regla de año vectorizada: |año WoS - año Scopus| <= 1, o falta alguno
+            wy = w_years[pending][:, None]
+            sy = s_years[b0:b1][None, :]
+            year_ok = np.isnan(wy) | np.isnan(sy) | (np.abs(wy - sy) <= 1)
+            scores = np.where(year_ok, scores, 0)
+            for r in np.flatnonzero(scores.any(axis=1)):
+                i = pending[r]
+                cols = np.flatnonzero(scores[r])
+                # Mayor puntaje primero; empate -> menor posición en Scopus (como process_chunk)
+                cols = cols[np.lexsort((s_order[b0 + cols], -scores[r, cols].astype(int)))]
+                for col in cols:
+                    score, pos = float(scores[r, col]), int(s_order[b0 + col])
+                    current = best.get(i)
+                    if current is not None and (score, -pos) <= (current[1], -current[0]):
+                        break
+                    if confirm_match(w_titles[i], s_titles[b0 + col], threshold):
+                        best[i] = (pos, score)
+                        break
+
+        matches_found.extend((w_ids[i], pos, score) for i, (pos, score) in best.items())
+
+    return matches_found
+
+# ---------------------------------------------------------
+# Ledger de matches (una fila por registro de WoS duplicado)
+# ---------------------------------------------------------
+# IDs de registro: EID en Scopus, UT en WoS (si falta, "<fuente>:<índice de fila>")
+SCOPUS_ID_COLUMN = "EID"
+WOS_ID_COLUMN = "UT (Unique WOS ID)"
+LEDGER_COLUMNS = ["wos_row_id", "scopus_row_id", "method", "score", "year_delta"]
+
+def record_ids(df: pd.DataFrame, id_column: str, prefix: str) -> pd.Series:
+    """ID estable de cada registro (columna de ID del export, o prefijo + índice si falta)."""
+    fallback = pd.Series(prefix + ":" + df.index.astype(str), index=df.index, dtype=object)
+    if id_column not in df.columns:
+        return fallback
+    ids = df[id_column].astype(object)
+    ids = ids.where(ids.notna(), "").map(lambda v: str(v).strip())
+    return ids.where(ids != "", fallback)
+
+def build_ledger(rows: Union[List[Tuple[str, str, str, float, Any]], Dict[str, Any], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Tabla compacta de matches: (wos_row_id, scopus_row_id, method, score, year_delta).
+    Acepta filas (tuplas), columnas (dict de arreglos) o un ledger ya armado.
+    """
+    ledger = pd.DataFrame(rows, columns=LEDGER_COLUMNS)
+    ledger["wos_row_id"] = ledger["wos_row_id"].astype(str)
+    ledger["scopus_row_id"] = ledger["scopus_row_id"].astype(str)
+    ledger["method"] = pd.Categorical(ledger["method"], categories=["doi", "fuzzy"])
+    ledger["score"] = ledger["score"].astype("float32")
+    ledger["year_delta"] = pd.to_numeric(ledger["year_delta"], errors="coerce").astype("Int16")
+    return ledger
+
+def _numeric_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Columna numérica como float (NaN si falta la columna o el valor no es numérico)."""
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+
+# ---------------------------------------------------------
+# Fase DOI (vectorizada)
+# ---------------------------------------------------------
+# Prefijos de resolvedor que algunos exports dejan en el DOI
+DOI_PREFIX_PATTERN = r"^(?:https?://)?(?:dx\.)?doi\.org/|^doi:\s*"
+
+def normalize_doi(dois: Optional[pd.Series]) -> pd.Series:
+    """DOIs comparables: minúsculas, sin espacios ni prefijos (https://doi.org/, doi:). Vacío -> NA."""
+    if dois is None:
+        return pd.Series(dtype="string")
+    norm = (
+        dois.astype("string")
+        .str.strip()
+        .str.lower()
+        .str.replace(DOI_PREFIX_PATTERN, "", regex=True)
+        .str.strip()
+    )
+    return norm.mask(norm == "")
+
+def doi_positions(scopus_doi: pd.Series, wos_doi: pd.Series) -> np.ndarray:
+    """
+    Hash join WoS -> Scopus por DOI normalizado: para cada fila de WoS, posición del
+    primer registro de Scopus con el mismo DOI (-1 si no tiene DOI o no hay match).
+    """
+    has_doi = scopus_doi.notna().to_numpy()
+    first = ~scopus_doi.duplicated(keep="first").to_numpy() & has_doi
+    if len(wos_doi) == 0 or not first.any():
+        return np.full(len(wos_doi), -1, dtype=np.int64)
+    keys = pd.Index(scopus_doi.to_numpy()[first])
+    positions = np.flatnonzero(first)
+    hit = keys.get_indexer(wos_doi.to_numpy())
+    hit[wos_doi.isna().to_numpy()] = -1
+    return np.where(hit >= 0, positions[hit], -1)
+
+@dataclass(frozen=True)
+class FuzzyCandidates:
+    """Registros de WoS para la fase fuzzy como arreglos paralelos (row_id, título, año)."""
+    row_ids: np.ndarray
+    titles: np.ndarray
+    years: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def __getitem__(self, key) -> "FuzzyCandidates":
+        """Slice o máscara: mismo subconjunto de las tres columnas (chunks del scheduler)."""
+        return FuzzyCandidates(self.row_ids[key], self.titles[key], self.years[key])
+
+def cross_deduplicate(
+    scopus_df: pd.DataFrame,
+    wos_df: pd.DataFrame,
+    threshold: int,
+    method: Optional[str] = None,
+    index: Optional[CandidateIndex] = None,
+) -> pd.DataFrame:
     """
     Función maestra para identificar registros de WoS que ya existen en Scopus.
     
     Estrategia Híbrida:
-      1. DOI Match: Búsqueda exacta por identificador digital (muy rápido, O(1)).
-      2. Fuzzy Match: Búsqueda aproximada por texto (lento, O(N*M), optimizado con paralelo).
+      1. DOI Match: hash join de DOIs normalizados (vectorizado, sin iterrows).
+      2. Fuzzy Match: Búsqueda aproximada por texto, optimizado con paralelo.
+         method (por defecto config.DEDUP_METHOD):
+           - "blocking": índice por año ±1 + q-gramas, WRatio solo sobre candidatos
+           - "bruteforce": WRatio contra todo Scopus de año compatible (particiones por año)
+           - "cdist": matriz WoS x Scopus con process.cdist, sin pool de procesos
+           - "minhash": candidatos por MinHash + LSH (firmas NumPy), WRatio solo sobre ellos
+      index: índice de candidatos ya construido sobre scopus_df (mismo orden de filas),
+             p. ej. el persistido por dedup_index.py; si falta y el modo es "blocking"
+             o "minhash" se construye aquí.
       
     Returns:
-        Un conjunto (Set) de títulos 'processed_title' que deben eliminarse de WoS.
+        Ledger de matches (una fila por registro de WoS que ya existe en Scopus):
+        wos_row_id, scopus_row_id, method ("doi"/"fuzzy"), score, year_delta (año WoS - año Scopus).
+        En "fuzzy", scopus_row_id es el match confirmado de mayor puntaje (empate -> el
+        primero de Scopus), el mismo con todos los métodos si el índice lo propone.
     """
-    duplicates: Set[str] = set()
-
     # Validaciones básicas: si no hay datos, no hay nada que duplicar
     if scopus_df is None or wos_df is None or scopus_df.empty or wos_df.empty:
-        return duplicates
+        return build_ledger([])
 
     # PREPARACIÓN DE DATOS (SCOPUS - REFERENCIA)
-    # Extraemos DOIs de Scopus, normalizamos a minúsculas y limpiamos espacios
-    scopus_dois = set(scopus_df.get("DOI", pd.Series([], dtype=str)).dropna().str.lower().str.strip().values)
-    scopus_dois.discard("") # Asegurar que no quede string vacío
-    
+    scopus_ids = record_ids(scopus_df, SCOPUS_ID_COLUMN, "scopus").to_numpy()
+    wos_ids = record_ids(wos_df, WOS_ID_COLUMN, "wos").to_numpy()
+
     # Listas para búsqueda difusa
     scopus_titles = scopus_df["processed_title"].tolist()
     # Convertimos años a numérico, forzando NaN si hay errores
-    scopus_years = pd.to_numeric(scopus_df.get("Year", pd.Series([np.nan]*len(scopus_df))), errors="coerce").tolist()
+    scopus_years = _numeric_column(scopus_df, "Year")
+    wos_years = _numeric_column(wos_df, "Publication Year")
 
     print(f"   [Deduplication] Reference Scopus: {len(scopus_titles)} rows")
     print(f"   [Deduplication] Candidates WoS: {len(wos_df)} rows")
 
     # -------------------------------------------------------
-    # FASE 1: DOI MATCH (Exacto y Rápido)
+    # FASE 1: DOI MATCH (hash join vectorizado)
     # -------------------------------------------------------
-    # Guardamos los índices de filas de WoS que ya encontramos para no procesarlas después
-    wos_duplicates_indices = set()
-    
-    for idx, wrow in wos_df.iterrows():
-        wdoi = str(wrow.get("DOI", "")).lower().strip()
-        # Si tiene DOI y ese DOI está en el set de Scopus -> DUPLICADO
-        if wdoi and wdoi in scopus_dois:
-            duplicates.add(wrow["processed_title"])
-            wos_duplicates_indices.add(idx)
+    # Posición en Scopus del DOI de cada registro de WoS (-1 = sin DOI o sin match)
+    doi_pos = doi_positions(normalize_doi(scopus_df.get("DOI")), normalize_doi(wos_df.get("DOI")))
+    by_doi = doi_pos >= 0
+    s_pos = doi_pos[by_doi]
+    doi_ledger = build_ledger({
+        "wos_row_id": wos_ids[by_doi],
+        "scopus_row_id": scopus_ids[s_pos],
+        "method": "doi",
+        "score": 100.0,
+        "year_delta": wos_years[by_doi] - scopus_years[s_pos],
+    })
 
-    print(f"   [Deduplication] Found by DOI: {len(duplicates)}")
+    print(f"   [Deduplication] Found by DOI: {len(doi_ledger)}")
 
     # -------------------------------------------------------
     # FASE 2: FUZZY MATCH (Paralelo)
     # -------------------------------------------------------
-    # Preparamos la lista de candidatos: artículos de WoS que NO tienen DOI match
-    candidates = []
-    
-    # Pre-calcular años de WoS vectorizadamente para rapidez
-    wos_years = pd.to_numeric(wos_df.get("Publication Year", pd.Series([np.nan]*len(wos_df))), errors="coerce")
-    
-    for idx, wrow in wos_df.iterrows():
-        # Si ya lo encontramos por DOI, saltar
-        if idx in wos_duplicates_indices:
-            continue
-            
-        wtitle = wrow.get("processed_title", "")
-        # Si el título ya está en duplicados (por otro registro), saltar
-        if wtitle in duplicates:
-            continue
-            
-        # Agregamos registro liviano (solo lo necesario) para enviar al worker
-        candidates.append({
-            "processed_title": wtitle,
-            "year": wos_years[idx]
-        })
+    # Candidatos: artículos de WoS que NO tienen DOI match, como arreglos paralelos
+    rest = ~by_doi
+    candidates = FuzzyCandidates(
+        row_ids=wos_ids[rest],
+        titles=wos_df["processed_title"].fillna("").astype(str).to_numpy(dtype=object)[rest],
+        years=wos_years[rest],
+    )
 
     # Si no quedan candidatos, terminamos
-    if not candidates:
-        return duplicates
+    if len(candidates) == 0:
+        return doi_ledger
+
+    fuzzy = _fuzzy_matches(candidates, scopus_titles, scopus_years, threshold, method or config.DEDUP_METHOD, index)
 
+    # Matches fuzzy -> filas del ledger (posición de Scopus -> ID y diferencia de año)
+    row_of = {row_id: i for i, row_id in enumerate(candidates.row_ids)}
+    w_rows = np.fromiter((row_of[m[0]] for m in fuzzy), dtype=np.int64, count=len(fuzzy))
+    f_pos = np.fromiter((m[1] for m in fuzzy), dtype=np.int64, count=len(fuzzy))
+    fuzzy_ledger = build_ledger({
+        "wos_row_id": candidates.row_ids[w_rows],
+        "scopus_row_id": scopus_ids[f_pos],
+        "method": "fuzzy",
+        "score": np.fromiter((m[2] for m in fuzzy), dtype=float, count=len(fuzzy)),
+        "year_delta": candidates.years[w_rows] - scopus_years[f_pos],
+    })
+
+    ledger = pd.concat([doi_ledger, fuzzy_ledger], ignore_index=True)
+    print(f"   [Deduplication] Total duplicates found: {len(ledger)}")
+    return build_ledger(ledger)
+
+def _fuzzy_matches(
+    candidates: FuzzyCandidates,
+    scopus_titles: List[str],
+    scopus_years: np.ndarray,
+    threshold: int,
+    method: str,
+    index: Optional[CandidateIndex] = None,
+) -> List[Tuple[str, int, float]]:
+    """Fase fuzzy con el método elegido: lista de (row_id de WoS, posición en Scopus, puntaje)."""
+    # MODO MATRIZ: cdist ya paraleliza con hilos, no necesita pool de procesos
+    if method == "cdist":
+        print(f"   [Deduplication] Starting fuzzy match (cdist) on {len(candidates)} records...")
+        return cdist_matches(candidates, scopus_titles, scopus_years, threshold)
+
+    # ÍNDICE DE CANDIDATOS (se construye una vez, o llega ya hecho, y se comparte con los workers)
+    if method not in ("bruteforce", *CANDIDATE_INDEXES):
+        raise ValueError(f"Unknown deduplication method: {method}")
+    if method == "bruteforce":
+        index = None
+    elif index is None:
+        index = build_candidate_index(method, scopus_titles, scopus_years)
+    if index is not None:
+        print(f"   [Deduplication] {type(index).__name__}: {index.size} Scopus titles")
+
+    return parallel_matches(run_chunk, candidates, scopus_titles, scopus_years, threshold, index, method)
+
+def parallel_matches(
+    task,
+    candidates: FuzzyCandidates,
+    reference_titles: List[str],
+    reference_years: Sequence[float],
+    threshold: int,
+    index: Optional[CandidateIndex],
+    method: str,
+) -> list:
+    """
+    Ejecuta `task` (run_chunk o run_self_chunk) sobre los candidatos en un pool de
+    procesos, con la referencia en memoria compartida. Retorna los resultados concatenados.
+    """
     # CONFIGURACIÓN PARALELA
-    # Usamos máximo 8 núcleos o los que tenga la CPU, lo que sea menor
-    num_workers = min(multiprocessing.cpu_count(), 8)
-    # Calculamos tamaño del chunk: cuántos items procesa cada worker de una vez
-    chunk_size = max(1, len(candidates) // num_workers)
-    
-    # Dividir la lista de candidatos en sub-listas (chunks)
+    # Muchos chunks pequeños repartidos dinámicamente: cada worker toma el siguiente
+    # al terminar el suyo (imap_unordered), así un chunk lento no frena al resto.
+    # Tope de workers configurable (config.DEDUP_MAX_WORKERS; None = todos los núcleos)
+    chunk_size = max(1, config.DEDUP_CHUNK_SIZE)
     chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+    num_workers = multiprocessing.cpu_count()
+    if config.DEDUP_MAX_WORKERS:
+        num_workers = min(num_workers, config.DEDUP_MAX_WORKERS)
+    num_workers = max(1, min(num_workers, len(chunks)))
     
-    print(f"   [Deduplication] Starting fuzzy match on {len(candidates)} records using {num_workers} cores...")
+    print(f"   [Deduplication] Starting fuzzy match ({method}) on {len(candidates)} records "
+          f"using {num_workers} cores ({len(chunks)} chunks of {chunk_size})...")
 
     # INICIO DEL POOL DE PROCESOS
-    # ProcessPoolExecutor gestiona el ciclo de vida de los procesos hijos
-    with ProcessPoolExecutor(max_workers=num_workers, initializer=init_worker, initargs=(scopus_titles, scopus_years)) as executor:
-        # Enviamos cada chunk a procesar. 'futures' son objetos que representarán el resultado futuro
-        futures = [executor.submit(process_chunk, chunk, threshold) for chunk in chunks]
-        
-        # as_completed nos devuelve los resultados a medida que cada worker termina
-        for future in as_completed(futures):
+    # La referencia (y el índice) se empaqueta una vez en memoria compartida: a cada
+    # worker solo viaja el handle del bloque. El bloque se libera al salir
+    found: list = []
+    progress = ProgressReporter(len(candidates), config.DEDUP_PROGRESS_SECONDS)
+    with share_reference(reference_titles, reference_years, index) as reference, \
+            multiprocessing.Pool(
+                num_workers, initializer=init_worker, initargs=(reference.handle, index_method(index))
+            ) as pool:
+        # imap_unordered entrega cada resultado apenas termina su chunk
+        results = pool.imap_unordered(task, [(chunk, threshold) for chunk in chunks])
+        while True:
             try:
-                # Obtenemos el set de duplicados encontrado por ese worker
-                chunk_dupes = future.result()
-                # Actualizamos el conjunto principal con los nuevos hallazgos
-                duplicates.update(chunk_dupes)
+                n_done, chunk_matches = next(results)
+            except StopIteration:
+                break
             except Exception as e:
+                # Un chunk con error no detiene a los demás
                 print(f"   [Error] in worker: {e}")
+                continue
+            # Actualizamos la lista principal con los nuevos hallazgos
+            found.extend(chunk_matches)
+            progress.update(n_done)
 
-    print(f"   [Deduplication] Total duplicates found: {len(duplicates)}")
-    return duplicates
+    return found
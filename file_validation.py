@@ -1,7 +1,9 @@
-from dataclasses import dataclass
+import hashlib
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
+from snapshot_cache import invalidate_changed
 from ui_messages import info, warn, error
 
 @dataclass(frozen=True)
@@ -14,11 +16,19 @@ class PipelinePaths:
     scimago_dir: Path
     scimago_file: Path
 
+@dataclass(frozen=True)
+class FileFingerprint:
+    path: Path
+    size: int
+    mtime_ns: int
+    sha1: str
+
 @dataclass(frozen=True)
 class InputInventory:
     scopus_files: List[Path]
     wos_files: List[Path]
     scimago_exists: bool
+    fingerprints: Dict[Path, FileFingerprint] = field(default_factory=dict)
 
 def build_default_paths(base_dir: Path | None = None) -> PipelinePaths:
     base = base_dir or Path.cwd()
@@ -40,13 +50,37 @@ def build_default_paths(base_dir: Path | None = None) -> PipelinePaths:
         scimago_file=scimago_file,
     )
 
+def fingerprint_file(path: Path, chunk_size: int = 1 << 20) -> FileFingerprint:
+    """Huella de un input: ruta absoluta + tamaño + mtime + SHA-1 del contenido."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return FileFingerprint(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha1=digest.hexdigest())
+
 def scan_inputs(paths: PipelinePaths) -> InputInventory:
     scopus_files = sorted(paths.scopus_dir.glob("*.csv")) if paths.scopus_dir.exists() else []
     wos_files = []
     if paths.wos_dir.exists():
-        wos_files = sorted(list(paths.wos_dir.glob("*.xls")) + list(paths.wos_dir.glob("*.xlsx")))
+        wos_files = sorted(
+            list(paths.wos_dir.glob("*.xls"))
+            + list(paths.wos_dir.glob("*.xlsx"))
+            + list(paths.wos_dir.glob("*.txt"))
+        )
     scimago_exists = paths.scimago_file.exists()
-    return InputInventory(scopus_files=scopus_files, wos_files=wos_files, scimago_exists=scimago_exists)
+
+    # Huellas de cada input: los snapshots Parquet de archivos modificados se invalidan aquí
+    fingerprints = {f: fingerprint_file(f) for f in scopus_files + wos_files}
+    invalidate_changed(fingerprints)
+
+    return InputInventory(
+        scopus_files=scopus_files,
+        wos_files=wos_files,
+        scimago_exists=scimago_exists,
+        fingerprints=fingerprints,
+    )
 
 def validate_or_stop(paths: PipelinePaths, inv: InputInventory) -> bool:
     """
@@ -68,7 +102,7 @@ def validate_or_stop(paths: PipelinePaths, inv: InputInventory) -> bool:
         "Validación de insumos",
         "Inventario detectado:\n\n"
         f"- Scopus CSV: {len(inv.scopus_files)}\n"
-        f"- WoS XLS/XLSX: {len(inv.wos_files)}\n"
+        f"- WoS XLS/XLSX/TXT: {len(inv.wos_files)}\n"
         f"- SCImago: {'Sí' if inv.scimago_exists else 'No'}\n\n"
         "Rutas:\n"
         f"- SCOPUS: {paths.scopus_dir}\n"
@@ -86,7 +120,7 @@ def validate_or_stop(paths: PipelinePaths, inv: InputInventory) -> bool:
             "No se encontraron archivos válidos.\n\n"
             "Acción requerida:\n"
             "- Coloca archivos *.csv en FILES/SCOPUS\n"
-            "- Coloca archivos *.xls o *.xlsx en FILES/WOS\n\n"
+            "- Coloca archivos *.xls, *.xlsx o *.txt en FILES/WOS\n\n"
             "El proceso se canceló para evitar ejecución innecesaria."
         )
         return False
@@ -95,7 +129,7 @@ def validate_or_stop(paths: PipelinePaths, inv: InputInventory) -> bool:
     if not has_scopus:
         warn("Scopus vacío", "No hay CSV de Scopus. El proceso continuará únicamente con WoS.")
     if not has_wos:
-        warn("WoS vacío", "No hay XLS/XLSX de WoS. El proceso continuará únicamente con Scopus.")
+        warn("WoS vacío", "No hay XLS/XLSX/TXT de WoS. El proceso continuará únicamente con Scopus.")
     if not inv.scimago_exists:
         warn("SCImago no encontrado", "No hay SCImago. Se omitirá la normalización ISSN→título canónico.")
 
@@ -0,0 +1,215 @@
+# ============================================================
+# journal_index.py
+#   - Índice de búsqueda de títulos de revistas SCImago para el fuzzy por título
+#     (scimago_utils: título canónico sin ISSN; sjr_analysis: fallback por título)
+#   - Normalización de títulos: minúsculas, sin paréntesis ni puntuación, "&" -> and,
+#     sin palabras vacías, abreviaturas expandidas ("J." -> journal) con la tabla
+#     data/journal_abbreviations.json (config.JOURNAL_ABBREVIATIONS_FILE)
+#   - Candidatos: índice invertido de q-gramas (dedup_blocking.BlockingIndex) sobre
+#     los títulos normalizados; solo los candidatos se puntúan con rapidfuzz, con el
+#     mismo scorer y los mismos strings que el recorrido completo
+#   - Se guarda como .npz junto al artefacto SCImago (scimago_artifact.py)
+# ============================================================
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from rapidfuzz import process
+
+import config
+from dedup_blocking import BlockingIndex
+
+# Palabras que no distinguen revistas (y que las abreviaturas suelen omitir)
+STOPWORDS = frozenset({"a", "an", "and", "de", "for", "in", "of", "on", "the"})
+
+_PARENTHESES = re.compile(r"\([^)]*\)")
+_NON_WORD = re.compile(r"[^\w]+")
+# Sube este número si cambia normalize_journal_title (invalida los índices guardados)
+NORMALIZATION_VERSION = 1
+
+
+@lru_cache(maxsize=1)
+def load_journal_abbreviations(path: Path = None) -> Dict[str, str]:
+    """Abreviatura (minúsculas, sin punto) -> palabra completa."""
+    with open(path or config.JOURNAL_ABBREVIATIONS_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def normalize_journal_title(title: str, abbreviations: Dict[str, str]) -> str:
+    """Forma de búsqueda del título: "J. Clean. Prod." -> "journal cleaner production"."""
+    text = _PARENTHESES.sub(" ", str(title).lower()).replace("&", " and ")
+    tokens = (abbreviations.get(t, t) for t in _NON_WORD.sub(" ", text).split())
+    return " ".join(t for t in tokens if t not in STOPWORDS)
+
+
+def index_signature(titles: Sequence[str], q: int, min_shared: float, abbreviations: Dict[str, str]) -> str:
+    """
+    Huella de todo lo que define el índice (títulos en orden, q, min_shared, abreviaturas,
+    versión de la normalización): un índice guardado solo se reutiliza si coincide.
+    """
+    parts = [f"v{NORMALIZATION_VERSION}", f"q{q}", f"s{min_shared}", json.dumps(abbreviations, sort_keys=True)]
+    return hashlib.sha1("\x1f".join([*parts, *map(str, titles)]).encode("utf-8")).hexdigest()
+
+
+class JournalTitleIndex:
+    """
+    Búsqueda del mejor título de `titles` para una consulta.
+
+    best_match devuelve lo mismo que process.extractOne(query, titles, scorer) con el
+    umbral aplicado, salvo que el mejor título no comparta q-gramas suficientes con la
+    consulta (min_shared, sobre las formas normalizadas). Con empate gana el primero de
+    `titles`, igual que el recorrido completo.
+    """
+
+    def __init__(
+        self,
+        titles: Sequence[str],
+        q: int = None,
+        min_shared: float = None,
+        abbreviations: Optional[Dict[str, str]] = None,
+    ):
+        self.titles = list(titles)
+        self.abbreviations = load_journal_abbreviations() if abbreviations is None else abbreviations
+        q = q or config.JOURNAL_INDEX_QGRAM
+        min_shared = config.JOURNAL_INDEX_MIN_SHARED if min_shared is None else min_shared
+        self.signature = index_signature(self.titles, q, min_shared, self.abbreviations)
+        self._normalized: Optional[List[str]] = None
+        # Sin años: BlockingIndex devuelve candidatos de toda la lista
+        self.blocking = BlockingIndex(self.normalized, np.full(len(self.titles), np.nan), q=q, min_shared=min_shared)
+
+    @property
+    def normalized(self) -> List[str]:
+        # Al abrir un índice guardado solo se recalcula si se pide (match expandido)
+        if self._normalized is None:
+            self._normalized = [normalize_journal_title(t, self.abbreviations) for t in self.titles]
+        return self._normalized
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    # ----------------------------
+    # Persistencia (.npz)
+    # ----------------------------
+    def save(self, path: Path) -> None:
+        self.blocking.save(path, signature=np.array(self.signature))
+
+    @classmethod
+    def load(cls, path: Path, titles: Sequence[str]) -> Optional["JournalTitleIndex"]:
+        """
+        Índice guardado para exactamente estos `titles` con la configuración actual
+        (config.JOURNAL_INDEX_*, abreviaturas); None si no coincide o no se puede leer.
+        """
+        titles = list(titles)
+        abbreviations = load_journal_abbreviations()
+        expected = index_signature(titles, config.JOURNAL_INDEX_QGRAM, config.JOURNAL_INDEX_MIN_SHARED, abbreviations)
+        try:
+            with np.load(path) as data:
+                if str(data["signature"]) != expected:
+                    return None
+        except (OSError, KeyError, ValueError):
+            return None
+        index = cls.__new__(cls)
+        index.titles = titles
+        index.abbreviations = abbreviations
+        index.signature = expected
+        index._normalized = None
+        index.blocking = BlockingIndex.load(path)
+        return index
+
+    # ----------------------------
+    # Consultas
+    # ----------------------------
+    def candidates(self, query: str) -> np.ndarray:
+        """
+        Posiciones de `titles` candidatas para la consulta, en orden ascendente.
+        Consultas muy cortas ("ai", "of"): todas, porque WRatio las puntúa por substring
+        (partial_ratio) y casi no comparten q-gramas con bordes.
+        """
+        normalized = normalize_journal_title(query, self.abbreviations)
+        if len(normalized) < 2 * self.blocking.q:
+            return np.arange(len(self.titles))
+        return np.sort(self.blocking.candidates(normalized))
+
+    def best_match(
+        self,
+        query: str,
+        scorer: Callable,
+        threshold: float,
+        strict: bool = False,
+        expanded: bool = None,
+    ) -> Optional[str]:
+        """
+        Título con mayor scorer(query, título) entre los candidatos si alcanza `threshold`
+        (strict=True: si lo supera). expanded=True (por defecto config.SCIMAGO_TITLE_EXPANDED_MATCH):
+        si no hay match, se puntúan también las formas normalizadas (abreviaturas expandidas).
+        """
+        positions = self.candidates(query)
+        if not len(positions):
+            return None
+        choices = [self.titles[p] for p in positions]
+        found = _extract(query, choices, scorer, threshold, strict)
+        if found is not None:
+            return choices[found]
+
+        expanded = config.SCIMAGO_TITLE_EXPANDED_MATCH if expanded is None else expanded
+        if expanded:
+            normalized = [self.normalized[p] for p in positions]
+            found = _extract(normalize_journal_title(query, self.abbreviations), normalized, scorer, threshold, strict)
+            if found is not None:
+                return choices[found]
+        return None
+
+
+def _extract(query: str, choices: List[str], scorer: Callable, threshold: float, strict: bool) -> Optional[int]:
+    """Posición del mejor choice (primero si hay empate) si pasa el umbral."""
+    best = process.extractOne(query, choices, scorer=scorer, score_cutoff=threshold)
+    if best is None:
+        return None
+    _, score, position = best
+    if strict and score <= threshold:
+        return None
+    return position
+
+
+def best_title(
+    query: str,
+    choices: List[str],
+    scorer: Callable,
+    threshold: float,
+    strict: bool = False,
+    index: Optional[JournalTitleIndex] = None,
+) -> Optional[str]:
+    """
+    Mejor título de `choices` para la consulta si alcanza `threshold` (strict: si lo supera).
+    Con `index` (construido sobre los mismos choices) solo se puntúan sus candidatos;
+    sin índice se recorren todos (config.SCIMAGO_TITLE_MATCH = "scan").
+    """
+    if index is not None:
+        return index.best_match(query, scorer, threshold, strict=strict)
+    found = _extract(query, choices, scorer, threshold, strict)
+    return None if found is None else choices[found]
+
+
+def title_index_for(choices: Sequence[str]) -> Optional[JournalTitleIndex]:
+    """Índice nuevo sobre `choices` si config.SCIMAGO_TITLE_MATCH = "index", si no None."""
+    if config.SCIMAGO_TITLE_MATCH == "scan" or not len(choices):
+        return None
+    if config.SCIMAGO_TITLE_MATCH != "index":
+        raise ValueError(f"Unknown SCImago title match: {config.SCIMAGO_TITLE_MATCH} (valid: index, scan)")
+    return JournalTitleIndex(choices)
+
+
+def matcher_signature(choices: Sequence[str]) -> str:
+    """Cómo se buscan títulos en `choices` con la configuración actual (para invalidar memos)."""
+    if config.SCIMAGO_TITLE_MATCH == "scan":
+        return "scan"
+    signature = index_signature(
+        choices, config.JOURNAL_INDEX_QGRAM, config.JOURNAL_INDEX_MIN_SHARED, load_journal_abbreviations()
+    )
+    return f"index:{signature}:expanded={int(config.SCIMAGO_TITLE_EXPANDED_MATCH)}"
@@ -1,56 +1,165 @@
 # ============================================================
 # loaders.py
 #   - Carga y merge por fuente (ANTES del dedup cruzado)
-#   - Preprocesamiento de títulos (spaCy)
+#   - Preprocesamiento de títulos (spaCy en batch con nlp.pipe, o tabla de lemas)
 #   - Limpiezas base Scopus/WoS (tu lógica)
+#   - Dedup interno: exacto por processed_title y, opcional, fuzzy (dedup_intra.py)
 # ============================================================
 from __future__ import annotations
 
+import csv
 import re
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-import spacy
-from spacy.lang.en.stop_words import STOP_WORDS
 
+import config
+import csv_engine
+from dedup_intra import fuzzy_intra_deduplicate
+from schema import (
+    SCOPUS_COLUMNS,
+    SCOPUS_DTYPES,
+    SCOPUS_SCHEMA_VERSION,
+    WOS_MULTIVALUE_TAGS,
+    WOS_NUMERIC_TAGS,
+    WOS_TAG_COLUMNS,
+    select_columns,
+)
+from snapshot_cache import read_with_snapshot
+from title_cache import TitleCache, stopwords_version
+from title_normalizer import LookupLemmatizer, load_or_build_lookup
 from ui_messages import info, warn, error
 
 
 # ----------------------------
-# spaCy (carga una sola vez)
+# spaCy (carga diferida, una sola vez)
 # ----------------------------
-def load_spacy_model(model_name: str = "en_core_web_lg"):
+# Importar loaders NO carga spaCy: el modelo (config.SPACY_MODEL) se carga en el
+# primer uso a través de get_nlp(). "blank:<lang>" crea un pipeline vacío con
+# lematizador por tablas (requiere spacy-lookups-data), mucho más liviano.
+_NLP = None
+
+
+def load_spacy_model(model_name: str = config.SPACY_MODEL):
+    import spacy
+
     try:
+        if model_name.startswith("blank:"):
+            nlp = spacy.blank(model_name.split(":", 1)[1])
+            nlp.add_pipe("lemmatizer", config={"mode": "lookup"})
+            nlp.initialize()
+            return nlp
         return spacy.load(model_name)
     except Exception as e:
         error(
             "spaCy no disponible",
             f"No se pudo cargar el modelo '{model_name}'.\n\n"
             f"Solución:\n"
-            f"1) python -m spacy download {model_name}\n"
+            f"1) python -m spacy download {model_name}"
+            f" (o pip install spacy-lookups-data para 'blank:en')\n"
             f"2) Reintentar.\n\n"
             f"Detalle: {e}",
         )
         raise
 
 
-NLP = load_spacy_model()
+def get_nlp():
+    """Devuelve el pipeline spaCy, cargándolo en la primera llamada."""
+    global _NLP
+    if _NLP is None:
+        _NLP = load_spacy_model(config.SPACY_MODEL)
+    return _NLP
+
+
+@lru_cache(maxsize=1)
+def get_stop_words() -> frozenset:
+    from spacy.lang.en.stop_words import STOP_WORDS
+
+    return frozenset(STOP_WORDS)
+
+
+def spacy_model_version(model_name: str = config.SPACY_MODEL) -> str:
+    """
+    Versión del modelo sin cargarlo (metadatos del paquete instalado).
+    Para pipelines "blank:" la versión relevante es la de spaCy.
+    """
+    import spacy
+
+    if model_name.startswith("blank:"):
+        return spacy.__version__
+    return spacy.util.get_package_version(model_name) or "unknown"
+
+
+# ----------------------------
+# Backend de lematización (config.TITLE_NORMALIZER)
+# ----------------------------
+# "spacy"  -> pipeline spaCy completo (get_nlp)
+# "lookup" -> tabla palabra->lema precompilada (title_normalizer), sin spaCy en ejecución
+_LOOKUP: LookupLemmatizer | None = None
+
+
+def get_lookup_lemmatizer() -> LookupLemmatizer:
+    global _LOOKUP
+    if _LOOKUP is None:
+        _LOOKUP = load_or_build_lookup(config.LEMMA_TABLE_FILE)
+    return _LOOKUP
+
+
+def _normalizer_namespace() -> str:
+    """Todo lo que determina processed_title para el backend activo (clave de caché)."""
+    if config.TITLE_NORMALIZER == "lookup":
+        parts = ["lookup", get_lookup_lemmatizer().version]
+    else:
+        import spacy
+
+        parts = [config.SPACY_MODEL, spacy_model_version(config.SPACY_MODEL), spacy.__version__]
+    return "|".join(parts + [stopwords_version(get_stop_words())])
+
+
+# ----------------------------
+# Caché persistente de processed_title
+# ----------------------------
+_TITLE_CACHE: TitleCache | None = None
+# True si la caché no se pudo abrir: el resto de la ejecución sigue sin caché
+# (sin tocar config.TITLE_CACHE_ENABLED, que es configuración del usuario)
+_TITLE_CACHE_UNAVAILABLE = False
+
+
+def get_title_cache() -> TitleCache | None:
+    """
+    Abre (una sola vez) la caché de títulos si está habilitada en config.
+    El namespace incluye backend (modelo spaCy + versión o tabla de lemas) y versión
+    de stopwords (se obtiene sin cargar el modelo: con caché caliente spaCy ni se carga).
+    """
+    global _TITLE_CACHE, _TITLE_CACHE_UNAVAILABLE
+    if not config.TITLE_CACHE_ENABLED or _TITLE_CACHE_UNAVAILABLE:
+        return None
+    if _TITLE_CACHE is None:
+        try:
+            _TITLE_CACHE = TitleCache(config.TITLE_CACHE_FILE, _normalizer_namespace(), config.TITLE_CACHE_MAX_ENTRIES)
+        except Exception as e:
+            warn("Caché de títulos", f"No se pudo abrir la caché de títulos. Se continúa sin caché.\n\nDetalle: {e}")
+            _TITLE_CACHE_UNAVAILABLE = True
+            return None
+    return _TITLE_CACHE
+
+
+# Componentes que el lematizador necesita: el resto (parser, ner) se desactiva en modo batch.
+# tagger + attribute_ruler aportan el POS que usa el lematizador por reglas.
+LEMMA_PIPES = ("tok2vec", "tagger", "attribute_ruler", "lemmatizer")
 
 
 # ----------------------------
 # Utilidades (tu lógica)
 # ----------------------------
-def preprocess_title(title) -> str:
+def _clean_title_text(title) -> str:
     """
-    Tu preprocesamiento:
-      - remove non letters
-      - lower
-      - remove accents
-      - stopwords
-      - lemmatize
+    Limpieza previa a spaCy (común a preprocess_title y preprocess_titles).
     """
     if not isinstance(title, str):
         return ""
@@ -60,12 +169,14 @@ def preprocess_title(title) -> str:
     title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("utf-8", "ignore")
 
     words = title.split()
-    filtered_words = [w for w in words if w not in STOP_WORDS]
+    stop_words = get_stop_words()
+    filtered_words = [w for w in words if w not in stop_words]
     title = " ".join(filtered_words)
 
-    title = re.sub(r"\s+", " ", title).strip()
+    return re.sub(r"\s+", " ", title).strip()
+
 
-    doc = NLP(title)
+def _lemmas_from_doc(doc) -> str:
     lemmas = [
         token.lemma_ if token.lemma_ != "-PRON-" else token.text
         for token in doc
@@ -74,6 +185,73 @@ def preprocess_title(title) -> str:
     return " ".join(lemmas)
 
 
+def preprocess_title(title) -> str:
+    """
+    Tu preprocesamiento:
+      - remove non letters
+      - lower
+      - remove accents
+      - stopwords
+      - lemmatize
+    """
+    if not isinstance(title, str):
+        return ""
+
+    cache = get_title_cache()
+    if cache is not None:
+        cached = cache.get(title)
+        if cached is not None:
+            return cached
+
+    if config.TITLE_NORMALIZER == "lookup":
+        processed = get_lookup_lemmatizer().lemmatize(_clean_title_text(title))
+    else:
+        processed = _lemmas_from_doc(get_nlp()(_clean_title_text(title)))
+    if cache is not None:
+        cache.put(title, processed)
+    return processed
+
+
+def preprocess_titles(
+    titles,
+    batch_size: int = config.SPACY_BATCH_SIZE,
+    n_process: int = config.SPACY_N_PROCESS,
+) -> List[str]:
+    """
+    Versión batch de preprocess_title (misma salida, byte a byte).
+    Consulta primero la caché persistente; solo los títulos únicos que faltan
+    pasan por el backend (nlp.pipe con los componentes de LEMMA_PIPES, o la tabla
+    de lemas si config.TITLE_NORMALIZER == "lookup").
+    """
+    titles = list(titles)
+    unique = list(dict.fromkeys(t for t in titles if isinstance(t, str)))
+
+    cache = get_title_cache()
+    processed = cache.get_many(unique) if cache is not None else {}
+    pending = [t for t in unique if t not in processed]
+
+    if pending:
+        if config.TITLE_NORMALIZER == "lookup":
+            lookup = get_lookup_lemmatizer()
+            computed = {t: lookup.lemmatize(_clean_title_text(t)) for t in pending}
+        else:
+            nlp = get_nlp()
+            cleaned = [_clean_title_text(t) for t in pending]
+            disable = [name for name in nlp.pipe_names if name not in LEMMA_PIPES]
+
+            docs = nlp.pipe(cleaned, batch_size=batch_size, n_process=n_process, disable=disable)
+            computed = {t: _lemmas_from_doc(doc) for t, doc in zip(pending, docs)}
+
+        processed.update(computed)
+        if cache is not None:
+            cache.put_many(computed)
+
+    if cache is not None:
+        cache.log_stats("processed_title")
+
+    return [processed[t] if isinstance(t, str) else "" for t in titles]
+
+
 def clean_data_author_full_names(cat_str):
     """
     Tu clean_data para Scopus: remove parentesis + split ';' + trim
@@ -105,39 +283,146 @@ def normalize_document_type(doc_type):
     return doc_type
 
 
+# ----------------------------
+# Lectura por archivo (secuencial o en paralelo)
+# ----------------------------
+# Cada lector hace solo las limpiezas fila a fila que dan lo mismo por archivo que
+# sobre el concat (NaN-safe). Lo que depende de columnas del conjunto queda después.
+def read_scopus_csv(f: Path) -> pd.DataFrame:
+    """
+    Lee un CSV de Scopus (todas sus columnas) con los dtypes de schema.SCOPUS_DTYPES
+    (categorías, Int64, identificadores como texto), con el motor de csv_engine.
+    """
+    header = pd.read_csv(f, nrows=0).columns.tolist()
+    usecols, dtype = select_columns(header, SCOPUS_COLUMNS, SCOPUS_DTYPES)
+    return csv_engine.read_csv(f, usecols=usecols, dtype=dtype)
+
+
+def _read_scopus_file(f: Path, fingerprint=None) -> pd.DataFrame:
+    df = read_with_snapshot(f, read_scopus_csv, f"scopus-csv-v{SCOPUS_SCHEMA_VERSION}", fingerprint)
+    if "Source" not in df.columns:
+        df["Source"] = "Scopus"
+    if "Author full names" in df.columns:
+        df["Author full names"] = df["Author full names"].apply(clean_data_author_full_names)
+    return df
+
+
+def iter_wos_tagged_records(f: Path) -> Iterator[Dict[str, str]]:
+    """
+    Lector en streaming del export WoS "Plain text" (etiquetas PT/AU/TI/SO/... , ER = fin).
+    Las líneas que empiezan con 3 espacios continúan la etiqueta anterior.
+    """
+    record: Dict[str, List[str]] = {}
+    tag = None
+
+    with open(f, encoding="utf-8-sig") as fh:
+        for line in fh:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            if line.startswith("   ") and tag is not None:
+                record[tag].append(line.strip())
+                continue
+
+            tag, value = line[:2], line[3:].strip()
+            if tag == "ER":
+                yield {
+                    t: ("; " if t in WOS_MULTIVALUE_TAGS else " ").join(vals)
+                    for t, vals in record.items()
+                }
+                record, tag = {}, None
+            elif tag in ("FN", "VR", "EF"):
+                tag = None
+            else:
+                record.setdefault(tag, []).append(value)
+
+
+def _is_wos_plain_text(f: Path) -> bool:
+    with open(f, encoding="utf-8-sig") as fh:
+        first = fh.readline()
+    return first.startswith(("FN ", "PT ")) and "\t" not in first
+
+
+def read_wos_txt(f: Path) -> pd.DataFrame:
+    """
+    Lee exports WoS de texto: "Tab-delimited (UTF-8)" o "Plain text" (etiquetado).
+    Renombra las etiquetas (TI, SO, PY, ...) a las columnas del XLS.
+    """
+    if _is_wos_plain_text(f):
+        df = pd.DataFrame.from_records(iter_wos_tagged_records(f))
+        for tag in WOS_NUMERIC_TAGS & set(df.columns):
+            df[tag] = pd.to_numeric(df[tag], errors="coerce")
+    else:
+        # Cada línea termina con un tab extra: index_col=False evita que se tome como índice
+        df = pd.read_csv(f, sep="\t", quoting=csv.QUOTE_NONE, encoding="utf-8-sig", index_col=False)
+    return df.rename(columns=WOS_TAG_COLUMNS)
+
+
+def read_wos_file(f: Path) -> pd.DataFrame:
+    if f.suffix.lower() == ".txt":
+        return read_wos_txt(f)
+    return pd.read_excel(f)
+
+
+def _read_wos_file(f: Path, fingerprint=None) -> pd.DataFrame:
+    kind = "wos-txt" if f.suffix.lower() == ".txt" else "wos-excel"
+    df = read_with_snapshot(f, read_wos_file, kind, fingerprint)
+    df["Source"] = "Web of science"
+    if "Document Type" in df.columns:
+        df["Document Type"] = df["Document Type"].apply(normalize_document_type)
+    return df
+
+
+def _read_files(
+    reader: Callable[..., pd.DataFrame],
+    files: List[Path],
+    fingerprints: Optional[Dict[Path, object]] = None,
+    workers: Optional[int] = None,
+) -> List[pd.DataFrame]:
+    """
+    Lee cada archivo con reader. Con workers > 1 usa un pool de procesos;
+    map() conserva el orden de files, así el concat es idéntico al modo secuencial.
+    workers=None -> config.LOADER_WORKERS (leído en cada llamada).
+    """
+    fps = [(fingerprints or {}).get(f) for f in files]
+    if workers is None:
+        workers = config.LOADER_WORKERS
+    workers = min(workers, len(files))
+    if workers <= 1:
+        return [reader(f, fp) for f, fp in zip(files, fps)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(reader, files, fps))
+
+
 # ----------------------------
 # Loaders por fuente
 # ----------------------------
-def load_merge_scopus(scopus_files: List[Path]) -> Tuple[pd.DataFrame, int]:
+def load_merge_scopus(
+    scopus_files: List[Path],
+    fingerprints: Optional[Dict[Path, object]] = None,
+) -> Tuple[pd.DataFrame, int]:
     """
     Une múltiples CSV de Scopus en uno.
     Aplica tu limpieza clave y genera processed_title.
-    Dedup interno por processed_title (y DOI si existe) para evitar ruido.
+    Dedup interno por processed_title (y DOI si existe) para evitar ruido;
+    con config.DEDUP_INTRA_ENABLED también casi-duplicados fuzzy (dedup_intra).
+    fingerprints (de scan_inputs) permite reutilizar snapshots Parquet sin re-hashear.
     Retorna: (df_scopus_merge, original_total_rows)
     """
     if not scopus_files:
         return pd.DataFrame(), 0
 
-    dfs = []
-    original_total = 0
-
-    for f in scopus_files:
-        df = pd.read_csv(f)
-        original_total += len(df)
-        if "Source" not in df.columns:
-            df["Source"] = "Scopus"
-        dfs.append(df)
+    dfs = _read_files(_read_scopus_file, scopus_files, fingerprints)
+    original_total = sum(len(df) for df in dfs)
 
     scopus = pd.concat(dfs, ignore_index=True)
 
-    if "Author full names" in scopus.columns:
-        scopus["Author full names"] = scopus["Author full names"].apply(clean_data_author_full_names)
-
     if "Title" not in scopus.columns:
         error("Scopus inválido", "No existe la columna 'Title' en el/los CSV de Scopus.")
         raise ValueError("Missing 'Title' in Scopus")
 
-    scopus["processed_title"] = scopus["Title"].apply(preprocess_title)
+    scopus["processed_title"] = preprocess_titles(scopus["Title"])
 
     if "DOI" in scopus.columns:
         scopus["DOI"] = scopus["DOI"].fillna("").astype(str).str.lower().str.strip()
@@ -147,30 +432,30 @@ def load_merge_scopus(scopus_files: List[Path]) -> Tuple[pd.DataFrame, int]:
     # Deduplicación interna (tu intención original: evitar duplicados antes del cruce)
     before = len(scopus)
     scopus = scopus.drop_duplicates(subset=["processed_title"])
+    if config.DEDUP_INTRA_ENABLED:
+        scopus = fuzzy_intra_deduplicate(scopus, "Scopus", "Year", ["Cited by"])
     after = len(scopus)
 
     info("Scopus unificado", f"Merge Scopus: {before} registros → {after} tras deduplicación interna.")
     return scopus, original_total
 
 
-def load_merge_wos(wos_files: List[Path]) -> Tuple[pd.DataFrame, int]:
+def load_merge_wos(
+    wos_files: List[Path],
+    fingerprints: Optional[Dict[Path, object]] = None,
+) -> Tuple[pd.DataFrame, int]:
     """
-    Une múltiples XLS/XLSX de WoS en uno.
+    Une múltiples exports de WoS en uno (XLS/XLSX o TXT tab-delimited / plain text).
     Aplica tu limpieza (Authors, Source Title, Document Type, etc.) y genera processed_title.
-    Dedup interno por processed_title.
+    Dedup interno por processed_title (y casi-duplicados fuzzy si config.DEDUP_INTRA_ENABLED).
+    fingerprints (de scan_inputs) permite reutilizar snapshots Parquet sin re-hashear.
     Retorna: (df_wos_merge, original_total_rows)
     """
     if not wos_files:
         return pd.DataFrame(), 0
 
-    dfs = []
-    original_total = 0
-
-    for f in wos_files:
-        df = pd.read_excel(f)
-        original_total += len(df)
-        df["Source"] = "Web of science"
-        dfs.append(df)
+    dfs = _read_files(_read_wos_file, wos_files, fingerprints)
+    original_total = sum(len(df) for df in dfs)
 
     wos = pd.concat(dfs, ignore_index=True)
 
@@ -196,14 +481,15 @@ def load_merge_wos(wos_files: List[Path]) -> Tuple[pd.DataFrame, int]:
     if "Source Title" in wos.columns:
         wos["Source Title"] = wos["Source Title"].astype(str).str.replace("&", "and", regex=False)
 
-    if "Document Type" in wos.columns:
-        wos["Document Type"] = wos["Document Type"].apply(normalize_document_type)
-
-    wos["processed_title"] = wos["Article Title"].apply(preprocess_title)
+    wos["processed_title"] = preprocess_titles(wos["Article Title"])
     wos["DOI"] = wos["DOI"].fillna("").astype(str).str.lower().str.strip()
 
     before = len(wos)
     wos = wos.drop_duplicates(subset=["processed_title"])
+    if config.DEDUP_INTRA_ENABLED:
+        wos = fuzzy_intra_deduplicate(
+            wos, "WoS", "Publication Year", ["Times Cited, All Databases", "Times Cited, WoS Core"]
+        )
     after = len(wos)
 
     info("WoS unificado", f"Merge WoS: {before} registros → {after} tras deduplicación interna.")
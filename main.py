@@ -5,6 +5,7 @@
 # ============================================================
 from __future__ import annotations
 
+import argparse
 import time
 import pandas as pd
 
@@ -13,15 +14,21 @@ import config  # Archivo de configuración con rutas y constantes
 from logging_utils import setup_logger  # Sistema de logs (reemplaza print)
 # Funciones para validar archivos de entrada antes de empezar
 from file_validation import build_default_paths, scan_inputs, validate_or_stop, PipelinePaths
+from title_cache import clear_title_cache  # Caché persistente de processed_title
 
 # --- Importaciones de Lógica de Negocio (Módulos) ---
 from loaders import load_merge_scopus, load_merge_wos  # Carga y limpieza inicial
-from deduplication import cross_deduplicate  # Lógica de deduplicación (paralela)
+from deduplication import record_ids, build_ledger, SCOPUS_ID_COLUMN, WOS_ID_COLUMN  # Deduplicación (paralela)
+from dedup_index import incremental_deduplicate  # Índice persistente: solo compara registros nuevos
 from normalization import normalize_wos_to_scopus_schema, apply_post_merge_normalization  # Normalización de datos
-from scimago_utils import load_scimago_if_exists, build_scimago_map, apply_scimago_canonical_titles  # Utilidades SCImago
+from affiliation_entities import extract_affiliation_entities  # Países/instituciones por registro
+from scimago_utils import apply_scimago_canonical_titles  # Utilidades SCImago
+from scimago_artifact import load_scimago_artifact  # SCImago compilado (memory-map)
 from sjr_analysis import enrich_with_scimago  # Cruce final con métricas SCImago
 from reporting import (  # Generación de reportes y gráficas
     save_outputs,
+    save_match_ledger,
+    save_affiliation_entities,
     build_report_tables,
     save_report_excel,
     plot_distribution,
@@ -33,7 +40,29 @@ from reporting import (  # Generación de reportes y gráficas
 logger = setup_logger("bibliometric_pipeline", log_dir=config.BASE_DIR / "logs")
 
 
-def main() -> None:
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bibliometric Review Pipeline (Scopus & WoS)")
+    parser.add_argument(
+        "--clear-title-cache",
+        action="store_true",
+        help="Borra la caché persistente de processed_title antes de ejecutar",
+    )
+    parser.add_argument(
+        "--rebuild-scimago",
+        action="store_true",
+        help="Recompila el artefacto de SCImago aunque el CSV no haya cambiado",
+    )
+    parser.add_argument(
+        "--rebuild-dedup-index",
+        action="store_true",
+        help="Descarta el índice persistente de deduplicación y compara todo de nuevo",
+    )
+    return parser.parse_args(argv)
+
+
+def main(args: argparse.Namespace | None = None) -> None:
+    args = args or parse_args([])
+
     # Inicio del cronómetro para medir tiempo total de ejecución
     start_time = time.time()
     
@@ -42,6 +71,9 @@ def main() -> None:
     logger.info("Bibliometric Review Pipeline")
     logger.info("Execution started...")
     logger.info("=" * 60)
+
+    if args.clear_title_cache:
+        clear_title_cache(config.TITLE_CACHE_FILE)
     
     # --------------------------------------------------------
     # 1) Definición de Rutas y Validación de Inputs
@@ -66,13 +98,13 @@ def main() -> None:
     # 2) Carga de Datos Auxiliares (SCImago)
     # --------------------------------------------------------
     logger.info("Loading SCImago data...")
-    # Carga el archivo CSV de SCImago si existe
-    scimago_df = load_scimago_if_exists(paths)
-    # Crea un mapa rápido (diccionario) de ISSN -> Título Canónico para normalizar nombres
-    scimago_map = build_scimago_map(scimago_df) if scimago_df is not None else {}
+    # Abre el artefacto compilado de SCImago (lo compila desde el CSV si cambió o no existe)
+    scimago_data = load_scimago_artifact(paths, force=args.rebuild_scimago)
+    # Mapa rápido (diccionario) de ISSN -> Título Canónico para normalizar nombres
+    scimago_map = scimago_data.issn_map if scimago_data is not None else {}
     
-    if scimago_df is not None:
-        logger.info(f"SCImago loaded: {len(scimago_df)} rows")
+    if scimago_data is not None:
+        logger.info(f"SCImago loaded: {len(scimago_data)} rows")
     else:
         logger.warning("SCImago file not found or empty.")
 
@@ -86,40 +118,49 @@ def main() -> None:
 
     if has_scopus:
         logger.info("Processing Scopus files...")
-        # load_merge_scopus: Lee CSVs, limpia autores, normaliza títulos y hace deduplicación interna
-        scopus_df, original_scopus = load_merge_scopus(inv.scopus_files)
+        # load_merge_scopus: Lee CSVs (o su snapshot Parquet), limpia autores, normaliza títulos y hace deduplicación interna
+        scopus_df, original_scopus = load_merge_scopus(inv.scopus_files, inv.fingerprints)
         logger.info(f"Scopus merged: {len(scopus_df)} unique records (from {original_scopus} raw)")
 
     if has_wos:
         logger.info("Processing WoS files...")
-        # load_merge_wos: Lee Excels, mapea columnas y hace deduplicación interna
-        wos_df, original_wos = load_merge_wos(inv.wos_files)
+        # load_merge_wos: Lee Excels (o su snapshot Parquet), mapea columnas y hace deduplicación interna
+        wos_df, original_wos = load_merge_wos(inv.wos_files, inv.fingerprints)
         logger.info(f"WoS merged: {len(wos_df)} unique records (from {original_wos} raw)")
 
     # --------------------------------------------------------
     # 4) Deduplicación Cruzada (Cross-Deduplication)
     # --------------------------------------------------------
-    duplicated_titles = set()
+    match_ledger = build_ledger([])
     # Solo ejecutamos si tenemos ambas fuentes con datos
     if has_scopus and has_wos and (not scopus_df.empty) and (not wos_df.empty):
         logger.info(f"Starting Cross-Deduplication (Threshold: {config.FUZZY_THRESHOLD})...")
-        # cross_deduplicate: Retorna la lista de títulos de WoS que ya existen en Scopus
-        duplicated_titles = cross_deduplicate(
+        # incremental_deduplicate: Retorna el ledger de matches (registro WoS -> registro Scopus).
+        # Solo compara registros nuevos/modificados contra el índice guardado en CACHE
+        match_ledger = incremental_deduplicate(
             scopus_df=scopus_df,
             wos_df=wos_df,
-            threshold=config.FUZZY_THRESHOLD  # Umbral desde config (ej. 85)
+            threshold=config.FUZZY_THRESHOLD,  # Umbral desde config (ej. 85)
+            rebuild=args.rebuild_dedup_index,
         )
-        logger.info(f"Duplicates identified: {len(duplicated_titles)}")
+        logger.info(f"Duplicates identified: {len(match_ledger)}")
 
     # --------------------------------------------------------
     # 5) Marcar Duplicados (Columna 'In_Both')
     # --------------------------------------------------------
-    # Agregamos una bandera (1 o 0) indicando si el artículo está en ambas fuentes
+    # Agregamos una bandera (1 o 0) indicando si el artículo está en ambas fuentes.
+    # Se deriva de los IDs de registro del ledger (no del título: dos artículos
+    # distintos con el mismo título no se marcan juntos)
+    duplicated_titles = set()
     if has_wos and not wos_df.empty:
-        wos_df["In_Both"] = wos_df["processed_title"].isin(duplicated_titles).astype(int)
+        wos_ids = record_ids(wos_df, WOS_ID_COLUMN, "wos")
+        wos_df["In_Both"] = wos_ids.isin(match_ledger["wos_row_id"]).astype(int)
+        # Títulos de WoS repetidos (solo para el CSV/reporte de repetidos)
+        duplicated_titles = set(wos_df.loc[wos_df["In_Both"] == 1, "processed_title"])
 
     if has_scopus and not scopus_df.empty:
-        scopus_df["In_Both"] = scopus_df["processed_title"].isin(duplicated_titles).astype(int)
+        scopus_ids = record_ids(scopus_df, SCOPUS_ID_COLUMN, "scopus")
+        scopus_df["In_Both"] = scopus_ids.isin(match_ledger["scopus_row_id"]).astype(int)
 
     # --------------------------------------------------------
     # 6) Normalización de WoS al Esquema de Scopus
@@ -152,7 +193,9 @@ def main() -> None:
     # --------------------------------------------------------
     if not combined_df.empty and scimago_map:
         # Usa SCImago para corregir nombres de revistas variantes (ej. "J. Finance" -> "Journal of Finance")
-        combined_df = apply_scimago_canonical_titles(combined_df, scimago_map)
+        combined_df = apply_scimago_canonical_titles(
+            combined_df, scimago_map, title_index=scimago_data.canonical_title_index
+        )
 
     # --------------------------------------------------------
     # 9) Normalización Post-Merge
@@ -172,7 +215,7 @@ def main() -> None:
     logger.info("Enriching with SCImago metrics...")
     combined_df = enrich_with_scimago(
         combined_df=combined_df,
-        scimago_df=scimago_df,
+        scimago_df=scimago_data,
         fuzzy_threshold=config.SCIMAGO_FUZZY_THRESHOLD
     )
 
@@ -192,9 +235,23 @@ def main() -> None:
         if before_final != after_final:
             logger.info(f"Final cleanup (exact Title+Year): Removed {before_final - after_final} duplicates.")
 
+    # Países e instituciones por registro: se parsean una sola vez, sobre el dataset
+    # final (mismos EID que el CSV); reportes y exports agrupan sobre esta tabla
+    affiliation_entities = extract_affiliation_entities(combined_df)
+    logger.info(
+        f"Affiliation entities: {len(affiliation_entities)} rows, "
+        f"{affiliation_entities['country'].nunique()} countries, "
+        f"{affiliation_entities['institution'].nunique()} institutions"
+    )
+
     logger.info(f"Saving results to: {paths.results_dir}")
     # Guarda los CSVs finales
     save_outputs(combined_df, duplicated_titles, paths.results_dir)
+    # Ledger de matches registro a registro (Parquet)
+    ledger_path = save_match_ledger(match_ledger, paths.results_dir)
+    logger.info(f"Match ledger saved: {ledger_path} ({len(match_ledger)} rows)")
+    entities_path = save_affiliation_entities(affiliation_entities, paths.results_dir)
+    logger.info(f"Affiliation entities saved: {entities_path}")
 
     # --------------------------------------------------------
     # 12) Reportes Excel
@@ -211,7 +268,8 @@ def main() -> None:
         combined_df=combined_df if not combined_df.empty else None,
         duplicated_titles=duplicated_titles,
         year_start=config.YEAR_START,
-        year_end=config.YEAR_FINAL
+        year_end=config.YEAR_FINAL,
+        affiliation_entities=affiliation_entities,
     )
     save_report_excel(report_tables, paths.results_dir)
 
@@ -260,7 +318,7 @@ def main() -> None:
 # Punto de entrada estándar de Python ("Main guard")
 if __name__ == "__main__":
     try:
-        main()
+        main(parse_args())
     except Exception as e:
         # Si ocurre un error no controlado, lo registramos como crítico antes de salir
         logger.critical(f"Critical Error: {e}", exc_info=True)
@@ -5,10 +5,10 @@
 # ============================================================
 from __future__ import annotations
 
-import re
 import pandas as pd
 import numpy as np
 
+from country_normalizer import get_country_normalizer
 from ui_messages import warn
 
 
@@ -84,80 +84,42 @@ def normalize_wos_to_scopus_schema(wos_df: pd.DataFrame) -> tuple[pd.DataFrame,
 # ----------------------------
 # Post-merge normalización
 # ----------------------------
-def _empty(x) -> bool:
-    return (pd.isna(x)) or (isinstance(x, str) and x.strip() == "")
-
-
-def fill_missing_affiliations(row: pd.Series) -> pd.Series:
-    affiliations = row.get("Affiliations", None)
-    authors_with_aff = row.get("Authors with affiliations", None)
-
-    if _empty(affiliations) and _empty(authors_with_aff):
-        return pd.Series([affiliations, authors_with_aff], index=["Affiliations", "Authors with affiliations"])
-
-    if _empty(affiliations):
-        affiliations = authors_with_aff
-    if _empty(authors_with_aff):
-        authors_with_aff = affiliations
-
-    return pd.Series([affiliations, authors_with_aff], index=["Affiliations", "Authors with affiliations"])
+def _blank(values: pd.Series) -> np.ndarray:
+    """Máscara de vacíos: nulo, o string que solo tiene espacios."""
+    blank = values.isna().to_numpy()
+    try:
+        # .str sobre object: strip de Python (los no-string dan NaN -> no vacíos)
+        stripped = values.astype(object).str.strip()
+    except AttributeError:
+        # Columna sin ningún string (p. ej. toda nula o numérica)
+        return blank
+    return blank | stripped.eq("").to_numpy()
+
+
+def fill_missing_affiliations(
+    affiliations: pd.Series,
+    authors_with_aff: pd.Series,
+) -> tuple[pd.Series, pd.Series]:
+    """
+    Completa cada columna con la otra donde está vacía (si ambas lo están, quedan igual).
+    Columnar: máscaras de vacíos + mask, sin construir una Serie por fila.
+    """
+    aff = affiliations.astype(object)
+    awa = authors_with_aff.astype(object)
+    blank_aff = _blank(aff)
+    blank_awa = _blank(awa)
+    return aff.mask(blank_aff & ~blank_awa, awa), awa.mask(blank_awa & ~blank_aff, aff)
 
 
 def normalize_country(text: str) -> str:
-    if not isinstance(text, str):
-        return text
-
-    text = re.sub(r'(?i)\b(?:usa|u\.s\.a\.|united states of america|united states)\b', 'United States', text)
-    text = re.sub(r'(?i)\b(?:uk|u\.k\.|united kingdom)\b', 'United Kingdom', text)
-    text = re.sub(r'(?i)\b(?:united arab emirates)\b', 'United Arab Emirates', text)
-    text = re.sub(r'(?i)\brepublic of korea\b', 'South Korea', text)
-    text = re.sub(r'(?i)\bpeoples r china\b', 'China', text)
-    text = re.sub(r'(?i)\brussian federation\b', 'Russia', text)
-    text = re.sub(r'(?i)\bengland\b', 'United Kingdom', text)
-    text = re.sub(r'(?i)\bScotland\b', 'United Kingdom', text)
-    text = re.sub(r'(?i)\bwales\b', 'United Kingdom', text)
-    text = re.sub(r'(?i)\bnorthern ireland\b', 'United Kingdom', text)
-
-    text = re.sub(r'(?i)\bviet\s?nam\b', 'Vietnam', text)
-
-    text = re.sub(r"(?i)\bCôte d'Ivoire\b", "Ivory Coast", text)
-    text = re.sub(r"(?i)\bCote d'Ivoire\b", "Ivory Coast", text)
-    text = re.sub(r"(?i)\bCote Ivoire\b", "Ivory Coast", text)
-
-    text = re.sub(r"(?i)\bDominican Rep\b", "Dominican Republic", text)
-    text = re.sub(r"(?i)\bTrinidad Tobago\b", "Trinidad and Tobago", text)
-    text = re.sub(r"(?i)\bTimor Leste\b", "Timor-Leste", text)
-    text = re.sub(r"(?i)\bSt Vincent\b", "Saint Vincent and the Grenadines", text)
-    text = re.sub(r"(?i)\bGermany \(Democratic Republic, DDR\)\b", "Germany", text)
-    text = re.sub(r"(?i)\bSao Tome & Prin\b", "Sao Tome and Principe", text)
-    text = re.sub(r"(?i)\bSt Lucia\b", "Saint Lucia", text)
-    text = re.sub(r"(?i)\bSt Kitts & Nevi\b", "Saint Kitts and Nevis", text)
-    text = re.sub(r"(?i)\bPapua N Guinea\b", "Papua New Guinea", text)
-    text = re.sub(r"(?i)\bGuinea Bissau\b", "Guinea-Bissau", text)
-    text = re.sub(r"(?i)\bCent Afr Republ\b", "Central African Republic", text)
-    text = re.sub(r"(?i)\bCape Verde\b", "Cabo Verde", text)
-    text = re.sub(r"(?i)\bBrunei\b", "Brunei Darussalam", text)
-
-    # Se mantiene tu lógica (aunque es riesgosa semánticamente)
-    text = re.sub(r"(?i)\bNigeria\b", "Niger", text)
-
-    text = re.sub(r"(?i)\bDEM REP CONGO\b", "Congo", text)
-    text = re.sub(r"(?i)\bDemocratic Republic of the Congo\b", "Congo", text)
-
-    text = re.sub(r"(?i)\bTurkiye\b", "Turkey", text)
-    text = re.sub(r"(?i)\bSt Martin\b", "Saint Martin", text)
-    text = re.sub(r"(?i)\bSaint Martin\b", "Saint Martin", text)
-
-    return text
+    """Alias de países -> nombre canónico (tabla en data/country_aliases.json, una sola pasada)."""
+    return get_country_normalizer().normalize(text)
 
 
 def process_record_affiliations(record):
     if pd.isna(record):
         return record
-    record = str(record)
-    record = re.sub(r"\[(.*?)\]", lambda m: m.group(0).replace(",", ""), record)
-    record = normalize_country(record)
-    return record
+    return get_country_normalizer().normalize_affiliation(str(record))
 
 
 def apply_post_merge_normalization(
@@ -198,12 +160,14 @@ def apply_post_merge_normalization(
 
     # Fill affiliations
     if "Affiliations" in df.columns and "Authors with affiliations" in df.columns:
-        df[["Affiliations", "Authors with affiliations"]] = df.apply(fill_missing_affiliations, axis=1)
+        df["Affiliations"], df["Authors with affiliations"] = fill_missing_affiliations(
+            df["Affiliations"], df["Authors with affiliations"]
+        )
 
     # Normalize countries
     for col in ["Affiliations", "Authors with affiliations"]:
         if col in df.columns:
-            df[col] = df[col].apply(process_record_affiliations)
+            df[col] = get_country_normalizer().normalize_affiliations(df[col])
 
     # Authors = Author full names
     if "Author full names" in df.columns:
@@ -211,7 +175,8 @@ def apply_post_merge_normalization(
 
     # Open Access default
     if "Open Access" in df.columns:
-        df["Open Access"] = df["Open Access"].fillna("subscription")
+        # astype(object): desde Scopus llega como category y "subscription" no es una categoría
+        df["Open Access"] = df["Open Access"].astype(object).fillna("subscription")
         df["Open Access"] = df["Open Access"].replace(r"^\s*$", "subscription", regex=True)
 
     # Cited by
@@ -1,6 +1,8 @@
 # ============================================================
 # reporting.py
 #   - Guarda outputs principales (CSV)
+#   - Guarda el ledger de matches WoS↔Scopus (Parquet; CSV si falta pyarrow)
+#   - Guarda la tabla de afiliaciones (país/institución por registro)
 #   - Genera y guarda reportes (Excel) de métricas/tablas
 #   - Genera gráficos: mostrar + guardar PNG
 # ============================================================
@@ -13,6 +15,8 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from affiliation_entities import records_per_value
+from csv_engine import pyarrow_available
 from ui_messages import info, warn
 
 
@@ -109,6 +113,41 @@ def save_outputs(
     return out_main, out_dups
 
 
+def _save_columnar(df: Optional[pd.DataFrame], results_dir: Path, stem: str) -> Path:
+    """Parquet (conserva Categorical/tipos compactos); sin pyarrow cae a CSV."""
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    if df is None:
+        df = pd.DataFrame()
+
+    if pyarrow_available():
+        out = results_dir / f"{stem}.parquet"
+        df.to_parquet(out, index=False)
+    else:
+        out = results_dir / f"{stem}.csv"
+        _save_csv_utf8sig(df, out)
+
+    return out
+
+
+def save_match_ledger(ledger: pd.DataFrame, results_dir: Path) -> Path:
+    """
+    Guarda el ledger de la deduplicación cruzada (una fila por registro de WoS duplicado):
+      wos_row_id, scopus_row_id, method, score, year_delta
+    Formato columnar (match_ledger.parquet); sin pyarrow cae a match_ledger.csv.
+    """
+    return _save_columnar(ledger, results_dir, "match_ledger")
+
+
+def save_affiliation_entities(entities: pd.DataFrame, results_dir: Path) -> Path:
+    """
+    Guarda la tabla de afiliaciones por registro (affiliation_entities.py):
+      record_id, entry, institution, country (institution/country diccionario-codificadas)
+    affiliations.parquet; sin pyarrow cae a affiliations.csv.
+    """
+    return _save_columnar(entities, results_dir, "affiliations")
+
+
 # ------------------------------------------------------------
 # 2) Construcción de tablas de reporte (lo que antes era print)
 # ------------------------------------------------------------
@@ -124,10 +163,12 @@ def build_report_tables(
     duplicated_titles: Set[str],
     year_start: int,
     year_end: int,
+    affiliation_entities: Optional[pd.DataFrame] = None,
 ) -> Dict[str, pd.DataFrame]:
     """
     Devuelve un dict {sheet_name: df} para exportar a Excel.
     Replica la lógica de tus prints, pero en tablas.
+    affiliation_entities (affiliation_entities.py) agrega registros por país e institución.
     """
 
     # --- Conteos base ---
@@ -272,12 +313,21 @@ def build_report_tables(
     except Exception as e:
         warn("Reporte Document Type", f"No se pudo construir tabla de Document Type por año.\nDetalle: {e}")
 
+    # --- Registros por país / institución (tabla ya parseada, sin re-tokenizar) ---
+    countries = pd.DataFrame()
+    institutions = pd.DataFrame()
+    if affiliation_entities is not None and not affiliation_entities.empty:
+        countries = records_per_value(affiliation_entities, "country")
+        institutions = records_per_value(affiliation_entities, "institution")
+
     return {
         "stats_summary": stats_summary,
         "dedup_distribution": dedup_distribution,
         "raw_counts_by_year": raw_counts,
         "raw_citations_by_year": raw_citations,
         "doc_types_by_year": doc_types_by_year,
+        "countries": countries,
+        "institutions": institutions,
     }
 
 
@@ -0,0 +1,197 @@
+# ============================================================
+# schema.py
+#   - Columnas del export de Scopus con sus dtypes de lectura
+#   - Se leen TODAS: las que el pipeline no usa (References, Funding Texts,
+#     Chemicals/CAS, ...) las necesitan Bibliometrix/VOSviewer (co-citación,
+#     acoplamiento). El ahorro de memoria viene solo de los dtypes
+# ============================================================
+from __future__ import annotations
+
+from typing import Dict, List
+
+# Sube este número si cambian columnas o dtypes (invalida los snapshots Parquet)
+SCOPUS_SCHEMA_VERSION = 2
+
+# Columnas y orden del export original de Scopus
+SCOPUS_COLUMNS: List[str] = [
+    "Authors",
+    "Author full names",
+    "Author(s) ID",
+    "Title",
+    "Year",
+    "Source title",
+    "Volume",
+    "Issue",
+    "Art. No.",
+    "Page start",
+    "Page end",
+    "Cited by",
+    "DOI",
+    "Link",
+    "Affiliations",
+    "Authors with affiliations",
+    "Abstract",
+    "Author Keywords",
+    "Index Keywords",
+    "Molecular Sequence Numbers",
+    "Chemicals/CAS",
+    "Tradenames",
+    "Manufacturers",
+    "Funding Details",
+    "Funding Texts",
+    "References",
+    "Correspondence Address",
+    "Editors",
+    "Publisher",
+    "Sponsors",
+    "Conference name",
+    "Conference date",
+    "Conference location",
+    "Conference code",
+    "ISSN",
+    "ISBN",
+    "CODEN",
+    "PubMed ID",
+    "Language of Original Document",
+    "Abbreviated Source Title",
+    "Document Type",
+    "Publication Stage",
+    "Open Access",
+    "Source",
+    "EID",
+]
+
+# dtypes explícitos:
+#   - category: columnas de pocos valores repetidos
+#   - Int64: enteros con nulos (sin pasar por float)
+#   - str: identificadores que NO deben inferirse como números (ceros a la izquierda en ISSN, etc.)
+#     y columnas que solo pasan al export (texto tal cual, sin inferir tipos)
+# El resto se lee como texto (object) por defecto.
+SCOPUS_DTYPES: Dict[str, str] = {
+    "Document Type": "category",
+    "Source": "category",
+    "Publication Stage": "category",
+    "Open Access": "category",
+    "Language of Original Document": "category",
+    "Year": "Int64",
+    "Cited by": "Int64",
+    "Volume": "str",
+    "Issue": "str",
+    "Art. No.": "str",
+    "Page start": "str",
+    "Page end": "str",
+    "ISSN": "str",
+    "ISBN": "str",
+    "CODEN": "str",
+    "PubMed ID": "str",
+    "Molecular Sequence Numbers": "str",
+    "Chemicals/CAS": "str",
+    "Tradenames": "str",
+    "Manufacturers": "str",
+    "Funding Details": "str",
+    "Funding Texts": "str",
+    "References": "str",
+    "Editors": "str",
+    "Sponsors": "str",
+    "Conference name": "str",
+    "Conference date": "str",
+    "Conference location": "str",
+    "Conference code": "str",
+}
+
+
+def select_columns(header: List[str], columns: List[str], dtypes: Dict[str, str]):
+    """
+    usecols/dtype para read_csv a partir del header real del archivo
+    (columnas del esquema que faltan en el export se ignoran).
+    """
+    usecols = [c for c in header if c in columns]
+    dtype = {c: t for c, t in dtypes.items() if c in usecols}
+    return usecols, dtype
+
+
+# ----------------------------
+# WoS: exports de texto (.txt)
+# ----------------------------
+# Tanto "Tab-delimited" como "Plain text" usan etiquetas de 2 caracteres.
+# Se mapean a los nombres de columna del export XLS, que es lo que espera load_merge_wos.
+WOS_TAG_COLUMNS: Dict[str, str] = {
+    "PT": "Publication Type",
+    "AU": "Authors",
+    "BA": "Book Authors",
+    "BE": "Book Editors",
+    "GP": "Book Group Authors",
+    "AF": "Author Full Names",
+    "BF": "Book Author Full Names",
+    "CA": "Group Authors",
+    "TI": "Article Title",
+    "SO": "Source Title",
+    "SE": "Book Series Title",
+    "BS": "Book Series Subtitle",
+    "LA": "Language",
+    "DT": "Document Type",
+    "CT": "Conference Title",
+    "CY": "Conference Date",
+    "CL": "Conference Location",
+    "SP": "Conference Sponsor",
+    "HO": "Conference Host",
+    "DE": "Author Keywords",
+    "ID": "Keywords Plus",
+    "AB": "Abstract",
+    "C1": "Addresses",
+    "C3": "Affiliations",
+    "RP": "Reprint Addresses",
+    "EM": "Email Addresses",
+    "RI": "Researcher Ids",
+    "OI": "ORCIDs",
+    "FU": "Funding Orgs",
+    "FP": "Funding Name Preferred",
+    "FX": "Funding Text",
+    "CR": "Cited References",
+    "NR": "Cited Reference Count",
+    "TC": "Times Cited, WoS Core",
+    "Z9": "Times Cited, All Databases",
+    "U1": "180 Day Usage Count",
+    "U2": "Since 2013 Usage Count",
+    "PU": "Publisher",
+    "PI": "Publisher City",
+    "PA": "Publisher Address",
+    "SN": "ISSN",
+    "EI": "eISSN",
+    "BN": "ISBN",
+    "J9": "Journal Abbreviation",
+    "JI": "Journal ISO Abbreviation",
+    "PD": "Publication Date",
+    "PY": "Publication Year",
+    "VL": "Volume",
+    "IS": "Issue",
+    "PN": "Part Number",
+    "SU": "Supplement",
+    "SI": "Special Issue",
+    "MA": "Meeting Abstract",
+    "BP": "Start Page",
+    "EP": "End Page",
+    "AR": "Article Number",
+    "DI": "DOI",
+    "DL": "DOI Link",
+    "D2": "Book DOI",
+    "EA": "Early Access Date",
+    "PG": "Number of Pages",
+    "WC": "WoS Categories",
+    "WE": "Web of Science Index",
+    "SC": "Research Areas",
+    "GA": "IDS Number",
+    "PM": "Pubmed Id",
+    "OA": "Open Access Designations",
+    "HC": "Highly Cited Status",
+    "HP": "Hot Paper Status",
+    "DA": "Date of Export",
+    "UT": "UT (Unique WOS ID)",
+}
+
+# En "Plain text" estas etiquetas tienen un valor por línea (se unen con "; ",
+# como en el XLS). En las demás, las líneas de continuación son texto partido (" ").
+WOS_MULTIVALUE_TAGS = {"AU", "AF", "BA", "BF", "BE", "CA", "GP", "C1", "CR"}
+
+# Etiquetas numéricas (el XLS las entrega como números)
+WOS_NUMERIC_TAGS = {"PY", "NR", "TC", "Z9", "U1", "U2"}
@@ -0,0 +1,278 @@
+# ============================================================
+# scimago_artifact.py
+#   - "scimago compile": convierte scimago_unificado.csv (326k filas) en un
+#     artefacto binario versionado en CACHE_DIR/scimago/
+#       * exploded.arrow  -> SCImago limpio con ISSN expandida (una por fila),
+#                            SJR numérico, títulos y categorías limpias,
+#                            ordenado por Year (particiones por año en el manifest)
+#       * issn_map.arrow  -> Issn -> Title (mapa de build_scimago_map)
+#       * source_titles.arrow -> títulos limpios únicos (fuzzy de sjr_analysis)
+#       * canonical_titles.npz / source_titles.npz -> índices de títulos de
+#                            journal_index (fuzzy de scimago_utils / sjr_analysis)
+#       * manifest.json   -> formato, hash del CSV fuente, particiones, filas,
+#                            hash de source_titles
+#   - El pipeline abre exploded.arrow con memory-map (Arrow IPC, sin copiar) y
+#     solo pasa a pandas las particiones de los años pedidos. Solo recompila si
+#     cambia el hash del CSV fuente
+#
+# Uso:
+#   python scimago_artifact.py compile [--force]
+# ============================================================
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+from journal_index import JournalTitleIndex, title_index_for
+from logging_utils import setup_logger
+from scimago_utils import build_scimago_map, load_scimago_if_exists, scimago_title_choices
+from sjr_analysis import prepare_scimago
+from ui_messages import info, warn
+
+logger = setup_logger("scimago_artifact")
+
+# Sube este número si cambia el contenido o el formato del artefacto
+ARTIFACT_FORMAT = 3
+
+_EXPLODED = "exploded.arrow"
+_ISSN_MAP = "issn_map.arrow"
+_SOURCE_TITLES = "source_titles.arrow"
+_CANONICAL_INDEX = "canonical_titles.npz"
+_SOURCE_INDEX = "source_titles.npz"
+_MANIFEST = "manifest.json"
+
+
+@dataclass(frozen=True)
+class ScimagoData:
+    """
+    SCImago listo para usar (compilado o preparado en memoria).
+      - exploded: una fila por (revista, año, ISSN), ordenada por Year. Si viene del
+        artefacto es una pyarrow.Table sobre el archivo mapeado en memoria (sin
+        copiar); si se preparó en memoria, un DataFrame
+      - year_slices: Year -> (inicio, fin) dentro de exploded
+      - issn_map: Issn -> Title (primer título, como build_scimago_map)
+      - source_titles: títulos limpios únicos (candidatos del fuzzy de sjr_analysis)
+      - canonical_title_index / source_title_index: índices de journal_index sobre
+        scimago_title_choices(issn_map) y source_titles (None en modo "scan")
+    """
+    exploded: Any
+    year_slices: Dict[int, Tuple[int, int]]
+    issn_map: Dict[str, str]
+    source_titles: List[str]
+    n_rows: int
+    source_sha1: str = ""
+    artifact_dir: Optional[Path] = field(default=None)
+    canonical_title_index: Optional[JournalTitleIndex] = field(default=None, repr=False)
+    source_title_index: Optional[JournalTitleIndex] = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def exploded_frame(self) -> pd.DataFrame:
+        """exploded completo como DataFrame (convierte toda la tabla: solo si hace falta todo)."""
+        if isinstance(self.exploded, pd.DataFrame):
+            return self.exploded
+        return self.exploded.to_pandas()
+
+    def exploded_for_years(self, years) -> pd.DataFrame:
+        """
+        Concatena solo las particiones de los años pedidos (resto de años no entra al merge).
+        Con el artefacto, solo esas filas se convierten a pandas. El índice es la posición
+        de cada fila en exploded.
+        """
+        wanted = pd.to_numeric(pd.Series(years), errors="coerce").dropna().astype(int).unique()
+        parts = [self.year_slices[y] for y in sorted(wanted) if y in self.year_slices]
+        idx = np.concatenate([np.arange(start, stop) for start, stop in parts]) if parts else np.empty(0, dtype=np.int64)
+        if isinstance(self.exploded, pd.DataFrame):
+            return self.exploded.iloc[idx]
+
+        import pyarrow as pa
+
+        table = self.exploded
+        if parts:
+            table = pa.concat_tables([table.slice(start, stop - start) for start, stop in parts])
+        else:
+            table = table.slice(0, 0)
+        frame = table.to_pandas()
+        frame.index = pd.Index(idx)
+        return frame
+
+
+# ----------------------------
+# Construcción (en memoria)
+# ----------------------------
+def build_scimago_data(scimago_df: pd.DataFrame, source_sha1: str = "") -> ScimagoData:
+    """Mismas transformaciones que build_scimago_map + prepare_scimago, hechas una vez."""
+    issn_map = build_scimago_map(scimago_df)
+    _, exploded = prepare_scimago(scimago_df)
+
+    source_titles = exploded["Source title"].dropna().astype(str).unique().tolist()
+
+    # Orden estable por año: dentro de cada año se conserva el orden original
+    exploded = exploded.reset_index(drop=True)
+    years = pd.to_numeric(exploded["Year"], errors="coerce")
+    order = np.argsort(years.fillna(-1).to_numpy(), kind="stable")
+    exploded = exploded.iloc[order].reset_index(drop=True)
+
+    year_slices: Dict[int, Tuple[int, int]] = {}
+    sorted_years = pd.to_numeric(exploded["Year"], errors="coerce")
+    for y, positions in sorted_years.groupby(sorted_years).indices.items():
+        year_slices[int(y)] = (int(positions[0]), int(positions[-1]) + 1)
+
+    return ScimagoData(
+        exploded=exploded,
+        year_slices=year_slices,
+        issn_map=issn_map,
+        source_titles=source_titles,
+        n_rows=len(scimago_df),
+        source_sha1=source_sha1,
+        canonical_title_index=title_index_for(scimago_title_choices(issn_map)),
+        source_title_index=title_index_for(source_titles),
+    )
+
+
+# ----------------------------
+# Escritura / lectura del artefacto
+# ----------------------------
+def _write_arrow(df: pd.DataFrame, path: Path) -> None:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_arrow(path: Path):
+    """pyarrow.Table sobre el archivo mapeado en memoria (los buffers apuntan al mapa, sin copia)."""
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+def _titles_sha1(titles: List[str]) -> str:
+    return hashlib.sha1("\x1f".join(titles).encode("utf-8")).hexdigest()
+
+
+def compile_scimago(paths, out_dir: Path = None, source_sha1: str = None) -> Optional[ScimagoData]:
+    """Lee el CSV de SCImago, lo prepara y guarda el artefacto. Retorna los datos compilados."""
+    from file_validation import fingerprint_file
+
+    out_dir = Path(out_dir or config.SCIMAGO_ARTIFACT_DIR)
+    scimago_df = load_scimago_if_exists(paths)
+    if scimago_df is None or scimago_df.empty:
+        return None
+
+    source_sha1 = source_sha1 or fingerprint_file(paths.scimago_file).sha1
+    data = build_scimago_data(scimago_df, source_sha1)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    _write_arrow(data.exploded_frame(), out_dir / _EXPLODED)
+    _write_arrow(
+        pd.DataFrame({"Issn": list(data.issn_map.keys()), "Title": list(data.issn_map.values())}),
+        out_dir / _ISSN_MAP,
+    )
+    _write_arrow(pd.DataFrame({"Source title": data.source_titles}, dtype=object), out_dir / _SOURCE_TITLES)
+    for index, name in ((data.canonical_title_index, _CANONICAL_INDEX), (data.source_title_index, _SOURCE_INDEX)):
+        if index is not None:
+            index.save(out_dir / name)
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "source": str(paths.scimago_file),
+        "source_sha1": source_sha1,
+        "rows": data.n_rows,
+        "exploded_rows": len(data.exploded),
+        "source_titles_sha1": _titles_sha1(data.source_titles),
+        "year_slices": {str(y): list(s) for y, s in data.year_slices.items()},
+    }
+    (out_dir / _MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+
+    info("SCImago compilado", f"Artefacto SCImago: {data.n_rows} filas, {len(data.exploded)} ISSN → {out_dir}")
+    return data
+
+
+def _open_title_index(path: Path, titles: List[str]) -> Optional[JournalTitleIndex]:
+    """Índice guardado si vale para estos títulos y la configuración actual; si no, se rearma y guarda."""
+    if config.SCIMAGO_TITLE_MATCH == "scan":
+        return None
+    if path.exists():
+        index = JournalTitleIndex.load(path, titles)
+        if index is not None:
+            return index
+    index = title_index_for(titles)
+    if index is not None:
+        logger.info(f"[SCImago] índice de títulos reconstruido: {path.name}")
+        index.save(path)
+    return index
+
+
+def _open_artifact(out_dir: Path, manifest: dict) -> ScimagoData:
+    exploded = _read_arrow(out_dir / _EXPLODED)
+    issn = _read_arrow(out_dir / _ISSN_MAP)
+    issn_map = dict(zip(issn.column("Issn").to_pylist(), issn.column("Title").to_pylist()))
+    source_titles = _read_arrow(out_dir / _SOURCE_TITLES).column("Source title").to_pylist()
+    if _titles_sha1(source_titles) != manifest["source_titles_sha1"]:
+        raise ValueError(f"{_SOURCE_TITLES} no coincide con el manifest")
+    return ScimagoData(
+        exploded=exploded,
+        year_slices={int(y): (s[0], s[1]) for y, s in manifest["year_slices"].items()},
+        issn_map=issn_map,
+        source_titles=source_titles,
+        n_rows=manifest["rows"],
+        source_sha1=manifest["source_sha1"],
+        artifact_dir=out_dir,
+        canonical_title_index=_open_title_index(out_dir / _CANONICAL_INDEX, scimago_title_choices(issn_map)),
+        source_title_index=_open_title_index(out_dir / _SOURCE_INDEX, source_titles),
+    )
+
+
+def load_scimago_artifact(paths, force: bool = False) -> Optional[ScimagoData]:
+    """
+    Devuelve SCImago compilado. Reutiliza el artefacto si el hash del CSV fuente
+    coincide; si no (o con force=True) lo recompila. Sin pyarrow, prepara en memoria.
+    """
+    if not paths.scimago_file.exists():
+        return None
+
+    from csv_engine import pyarrow_available
+    from file_validation import fingerprint_file
+
+    if not pyarrow_available():
+        warn("SCImago", "pyarrow no está instalado: SCImago se prepara en memoria en cada ejecución.")
+        scimago_df = load_scimago_if_exists(paths)
+        return build_scimago_data(scimago_df) if scimago_df is not None and not scimago_df.empty else None
+
+    out_dir = Path(config.SCIMAGO_ARTIFACT_DIR)
+    sha1 = fingerprint_file(paths.scimago_file).sha1
+    manifest_path = out_dir / _MANIFEST
+
+    if not force and manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("format") == ARTIFACT_FORMAT and manifest.get("source_sha1") == sha1:
+                logger.debug(f"[SCImago] artefacto vigente: {out_dir}")
+                return _open_artifact(out_dir, manifest)
+            logger.info("[SCImago] el CSV fuente cambió: se recompila el artefacto")
+        except Exception as e:
+            logger.warning(f"[SCImago] artefacto ilegible, se recompila: {e}")
+
+    return compile_scimago(paths, out_dir, sha1)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from file_validation import build_default_paths
+
+    parser = argparse.ArgumentParser(description="Compila SCImago a un artefacto binario")
+    parser.add_argument("command", choices=["compile"])
+    parser.add_argument("--force", action="store_true", help="Recompila aunque el hash no haya cambiado")
+    args = parser.parse_args()
+
+    load_scimago_artifact(build_default_paths(config.BASE_DIR), force=args.force)
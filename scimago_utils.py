@@ -3,28 +3,48 @@
 #   - Lee SCImago
 #   - Construye mapa ISSN -> Title canónico
 #   - Asigna Source title canónico (tu lógica)
+#   - El título canónico se calcula una vez por clave distinta (ISSN, Source,
+#     Source title) y se reparte a las filas; el fuzzy de las filas sin ISSN usa
+#     el índice de títulos de journal_index (o la lista completa, modo "scan") y un
+#     memo persistente (config.SCIMAGO_TITLE_MEMO_FILE) válido mientras no cambie SCImago
 # ============================================================
 from __future__ import annotations
 
+import hashlib
+import json
 import re
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
-from rapidfuzz import fuzz, process
+from rapidfuzz import fuzz
 
+import config
+import csv_engine
+from journal_index import JournalTitleIndex, best_title, matcher_signature, title_index_for
+from logging_utils import setup_logger
 from ui_messages import warn
 
+logger = setup_logger("scimago_utils")
+
+# Puntaje token_sort_ratio que debe SUPERAR un título SCImago para reemplazar un
+# Source title sin ISSN
+CANONICAL_FUZZY_MIN = 90
+# Versión de la regla de canonicalización: cambiarla invalida el memo persistente
+CANONICAL_MEMO_VERSION = 1
+
 
 def load_scimago_if_exists(paths) -> Optional[pd.DataFrame]:
     """
     paths: PipelinePaths (de file_validation)
-    Lee SCImago si existe, sep=';'
+    Lee SCImago si existe, sep=';' y coma decimal (SJR "47,288" -> 47.288)
     """
     if not paths.scimago_file.exists():
         return None
 
     try:
-        return pd.read_csv(paths.scimago_file, sep=";")
+        return csv_engine.read_csv(paths.scimago_file, sep=";", decimal=",")
     except Exception as e:
         warn("SCImago no se pudo leer", f"No se pudo leer SCImago.\nSe continúa sin SCImago.\n\nDetalle: {e}")
         return None
@@ -54,32 +74,128 @@ def safe_text(x) -> str:
     return str(x)
 
 
-def assign_canonical_title_row(row: pd.Series, scimago_map: Dict[str, str]) -> str:
-    issn = safe_text(row.get("ISSN", "")).strip()
-    src = safe_text(row.get("Source", "")).strip().lower()
-    orig = safe_text(row.get("Source title", "")).strip()
+def _strip_parentheses(text: str) -> str:
+    return re.sub(r"\([^)]*\)", "", text).strip()
 
+
+def scimago_title_choices(scimago_map: Dict[str, str]) -> List[str]:
+    """
+    Títulos SCImago para el fuzzy, sin repetir y en orden de primera aparición
+    (con empate de puntaje extractOne devuelve el mismo título que sobre la lista completa).
+    """
+    return list(dict.fromkeys(scimago_map.values()))
+
+
+class CanonicalTitleMemo:
+    """
+    Memo persistente (JSON en CACHE_DIR) Source title sin ISSN -> título SCImago (o None
+    si ninguno supera CANONICAL_FUZZY_MIN). namespace = hash de los títulos SCImago +
+    versión de la regla + forma de búsqueda (índice o recorrido completo): si algo
+    cambia, el memo anterior se descarta entero.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        choices: List[str],
+        index: Optional[JournalTitleIndex] = None,
+        use_index: bool = False,
+    ):
+        """index: índice ya abierto sobre choices; use_index sin index: se construye en el primer fallo del memo."""
+        self.path = Path(path) if path else None
+        self.choices = choices
+        self.index = index
+        self._build_index = index is None and use_index
+        matcher = matcher_signature(choices) if (index is not None or use_index) else "scan"
+        raw = "\x1f".join(safe_text(c) for c in choices)
+        key = f"v{CANONICAL_MEMO_VERSION}\x1f{matcher}\x1f{raw}"
+        self.namespace = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        self.titles: Dict[str, Optional[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    stored = json.load(f)
+                if stored.get("namespace") == self.namespace:
+                    self.titles = stored.get("titles", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Memo de títulos SCImago ilegible ({self.path}), se recalcula: {e}")
+
+    def best_match(self, orig: str) -> Optional[str]:
+        """Título SCImago más parecido a `orig` (token_sort_ratio > CANONICAL_FUZZY_MIN) o None."""
+        if orig in self.titles:
+            self.hits += 1
+            return self.titles[orig]
+        self.misses += 1
+        if self._build_index:
+            self.index = title_index_for(self.choices)
+            self._build_index = False
+        match = best_title(orig, self.choices, fuzz.token_sort_ratio, CANONICAL_FUZZY_MIN, strict=True, index=self.index)
+        if not isinstance(match, str):
+            match = None
+        self.titles[orig] = match
+        self._dirty = True
+        return match
+
+    def save(self) -> None:
+        if not (self.path and self._dirty):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"namespace": self.namespace, "titles": self.titles}, f, ensure_ascii=False)
+        tmp.replace(self.path)
+        self._dirty = False
+
+
+def canonical_title(issn: str, src: str, orig: str, scimago_map: Dict[str, str], memo: CanonicalTitleMemo) -> str:
+    """Título canónico de una clave ya limpia (issn/orig con strip, src en minúsculas)."""
     # 1) Si hay ISSN y existe en SCImago y NO es Scopus -> usar SCImago
     if issn and (issn in scimago_map) and (src != "scopus"):
         cand = safe_text(scimago_map.get(issn, "")).strip()
         if cand:
-            return re.sub(r"\([^)]*\)", "", cand).strip()
+            return _strip_parentheses(cand)
 
     # 2) Si NO hay ISSN, fuzzy vs títulos SCImago (NO Scopus)
     if (not issn) and (src != "scopus") and orig and scimago_map:
-        best = process.extractOne(orig, list(scimago_map.values()), scorer=fuzz.token_sort_ratio)
-        if best:
-            best_title, score, _ = best
-            if isinstance(score, (int, float)) and score > 90 and isinstance(best_title, str):
-                return re.sub(r"\([^)]*\)", "", best_title).strip()
+        match = memo.best_match(orig)
+        if match is not None:
+            return _strip_parentheses(match)
 
     # 3) Default: el original sin paréntesis
-    return re.sub(r"\([^)]*\)", "", orig).strip() if orig else orig
+    return _strip_parentheses(orig) if orig else orig
 
 
-def apply_scimago_canonical_titles(df: pd.DataFrame, scimago_map: Dict[str, str]) -> pd.DataFrame:
+def assign_canonical_title_row(row: pd.Series, scimago_map: Dict[str, str]) -> str:
+    """Título canónico de una fila suelta (sin memo persistente ni índice: recorre todos los títulos)."""
+    issn = safe_text(row.get("ISSN", "")).strip()
+    src = safe_text(row.get("Source", "")).strip().lower()
+    orig = safe_text(row.get("Source title", "")).strip()
+    return canonical_title(issn, src, orig, scimago_map, CanonicalTitleMemo(None, scimago_title_choices(scimago_map)))
+
+
+def _clean_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Columna como texto con strip ("" si falta o es nulo), igual que safe_text."""
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    values = df[column]
+    return values.map(safe_text).str.strip()
+
+
+def apply_scimago_canonical_titles(
+    df: pd.DataFrame,
+    scimago_map: Dict[str, str],
+    memo_path: Optional[Path] = config.SCIMAGO_TITLE_MEMO_FILE,
+    title_index: Optional[JournalTitleIndex] = None,
+) -> pd.DataFrame:
     """
     Aplica Source title canónico si hay scimago_map.
+    Se calcula una vez por clave (ISSN, Source, Source title) distinta y se reparte a
+    las filas. memo_path=None -> sin memo persistente. title_index: índice sobre
+    scimago_title_choices(scimago_map) (ScimagoData.canonical_title_index); si falta y
+    config.SCIMAGO_TITLE_MATCH = "index", se construye aquí solo si el memo no alcanza.
     """
     if df is None or df.empty or not scimago_map:
         return df
@@ -95,6 +211,24 @@ def apply_scimago_canonical_titles(df: pd.DataFrame, scimago_map: Dict[str, str]
     if "Source" in df.columns:
         df["Source"] = df["Source"].fillna("unknown")
 
-    df["Source title"] = df.apply(lambda r: assign_canonical_title_row(r, scimago_map), axis=1)
+    keys = pd.DataFrame({
+        "issn": _clean_column(df, "ISSN"),
+        "src": _clean_column(df, "Source").str.lower(),
+        "orig": _clean_column(df, "Source title"),
+    })
+    codes = keys.groupby(["issn", "src", "orig"], sort=False).ngroup().to_numpy()
+    uniques = keys.drop_duplicates()
+
+    memo = CanonicalTitleMemo(memo_path, scimago_title_choices(scimago_map), title_index, use_index=True)
+    titles = np.array(
+        [canonical_title(i, s, o, scimago_map, memo) for i, s, o in uniques.itertuples(index=False)],
+        dtype=object,
+    )
+    memo.save()
+    logger.info(
+        f"Canonical titles: {len(uniques)} distinct keys for {len(df)} rows "
+        f"(fuzzy memo: {memo.hits} hits, {memo.misses} misses)"
+    )
+
+    df["Source title"] = pd.Series(titles[codes], index=df.index).infer_objects()
     return df
-
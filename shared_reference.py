@@ -0,0 +1,136 @@
+# ============================================================
+# shared_reference.py
+#   - Conjunto de referencia de Scopus (títulos + años) empaquetado en un único
+#     bloque de multiprocessing.shared_memory para los workers de deduplicación
+#   - Layout contiguo del bloque:
+#       [offsets int64 (n+1)] [años int16 (n)] [títulos UTF-8 concatenados]
+#       [arreglos NumPy extra (índice de candidatos), alineados a 8 bytes]
+#   - El proceso principal lo crea una vez; cada worker lo adjunta sin copiar
+#     (solo recibe el nombre del bloque) y decodifica los títulos que necesita
+# ============================================================
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Año ausente (NaN) dentro del arreglo int16
+YEAR_MISSING = -1
+
+
+@dataclass(frozen=True)
+class ReferenceHandle:
+    """Lo único que viaja a cada worker: nombre del bloque y tamaños."""
+    name: str
+    size: int
+    text_bytes: int
+    # Arreglos extra: (nombre, dtype, forma, offset en el bloque)
+    arrays: Tuple[Tuple[str, str, Tuple[int, ...], int], ...] = ()
+
+
+def _layout(size: int):
+    years_at = 8 * (size + 1)
+    text_at = years_at + 2 * size
+    return years_at, text_at
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+class SharedReference:
+    """Lado del proceso principal: crea y es dueño del bloque de memoria compartida."""
+
+    def __init__(
+        self,
+        titles: Sequence[str],
+        years: Sequence[float],
+        arrays: Optional[Mapping[str, np.ndarray]] = None,
+    ):
+        """arrays: arreglos NumPy que también se comparten (p. ej. los del índice de candidatos)."""
+        encoded = [str(t).encode("utf-8") for t in titles]
+        size = len(encoded)
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        years_arr = np.asarray(years, dtype=float)
+        years16 = np.where(np.isnan(years_arr), YEAR_MISSING, years_arr).astype(np.int16)
+
+        years_at, text_at = _layout(size)
+        text_end = text_at + int(offsets[-1])
+        extra = [(name, np.ascontiguousarray(arr)) for name, arr in (arrays or {}).items()]
+        specs, total = [], text_end
+        for name, arr in extra:
+            at = _aligned(total)
+            specs.append((name, arr.dtype.str, arr.shape, at))
+            total = at + arr.nbytes
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, total))
+        buf = self.shm.buf
+        np.ndarray(size + 1, dtype=np.int64, buffer=buf, offset=0)[:] = offsets
+        np.ndarray(size, dtype=np.int16, buffer=buf, offset=years_at)[:] = years16
+        buf[text_at:text_end] = b"".join(encoded)
+        for (_, arr), (_, dtype, shape, at) in zip(extra, specs):
+            np.ndarray(shape, dtype=dtype, buffer=buf, offset=at)[...] = arr
+
+        self.handle = ReferenceHandle(self.shm.name, size, int(offsets[-1]), tuple(specs))
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedReference":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class AttachedReference:
+    """
+    Lado del worker: vistas NumPy sobre el bloque compartido (sin copia).
+    Los títulos se decodifican bajo demanda (solo las posiciones pedidas).
+    """
+
+    def __init__(self, handle: ReferenceHandle):
+        self.handle = handle
+        self.shm = shared_memory.SharedMemory(name=handle.name)
+        years_at, text_at = _layout(handle.size)
+        self.offsets = np.ndarray(handle.size + 1, dtype=np.int64, buffer=self.shm.buf, offset=0)
+        self.years = np.ndarray(handle.size, dtype=np.int16, buffer=self.shm.buf, offset=years_at)
+        self._text = self.shm.buf[text_at:text_at + handle.text_bytes]
+        # Arreglos extra como vistas de solo lectura (el bloque es de todos los workers)
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, dtype, shape, at in handle.arrays:
+            view = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=at)
+            view.flags.writeable = False
+            self.arrays[name] = view
+        self._partitions: Dict[Optional[int], np.ndarray] = {}
+        for y in np.unique(self.years):
+            key = None if y == YEAR_MISSING else int(y)
+            self._partitions[key] = np.flatnonzero(self.years == y)
+
+    def __len__(self) -> int:
+        return self.handle.size
+
+    def close(self) -> None:
+        """
+        Suelta las vistas y cierra el bloque (el dueño lo elimina con SharedReference.close).
+        Antes hay que soltar todo objeto construido sobre `arrays` (p. ej. el índice).
+        """
+        self._text.release()
+        self.offsets = self.years = None
+        self.arrays = {}
+        self._partitions = {}
+        self.shm.close()
+
+    def title(self, i: int) -> str:
+        return bytes(self._text[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def titles(self, positions) -> List[str]:
+        return [self.title(i) for i in positions]
+
+    def partition(self, year: Optional[int]) -> np.ndarray:
+        """Posiciones de los títulos de un año (None = sin año)."""
+        return self._partitions.get(year, np.empty(0, dtype=np.int64))
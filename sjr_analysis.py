@@ -1,15 +1,19 @@
 # ============================================================
 # sjr_analysis.py
 #   - Enriquecimiento del dataset final con SCImago
-#   - Matching por ISSN + fuzzy Source title
+#   - Matching por ISSN + fuzzy Source title (índice de títulos de journal_index)
 #   - Consolida columnas SCImago y elimina columnas técnicas
 #   - NO guarda archivos (solo devuelve DataFrame)
 # ============================================================
 
 from __future__ import annotations
 import re
+from typing import Optional
+
 import pandas as pd
-from rapidfuzz import process, fuzz
+from rapidfuzz import fuzz
+
+from journal_index import JournalTitleIndex, best_title, title_index_for
 
 
 # ------------------------------------------------------------
@@ -27,22 +31,17 @@ def _clean_categories(cat_str: str) -> str:
 def _best_title_match(
     title: str,
     choices: list[str],
-    threshold: int = 90
+    threshold: int = 90,
+    index: Optional[JournalTitleIndex] = None
 ) -> str | None:
-    """Devuelve el mejor match fuzzy de título si supera el umbral."""
+    """
+    Devuelve el mejor match fuzzy de título si supera el umbral.
+    index: JournalTitleIndex sobre choices (sin índice se recorren todos).
+    """
     if not isinstance(title, str) or not title.strip():
         return None
 
-    result = process.extractOne(
-        title.lower(),
-        choices,
-        scorer=fuzz.WRatio
-    )
-    if result:
-        best, score, _ = result
-        if score >= threshold:
-            return best
-    return None
+    return best_title(title.lower(), choices, fuzz.WRatio, threshold, index=index)
 
 
 def _deduplicate_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -53,6 +52,37 @@ def _deduplicate_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df.loc[:, ~df.columns.duplicated()]
 
 
+def prepare_scimago(scimago_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Limpia SCImago para el cruce:
+      - Title -> Source title (sin paréntesis)
+      - Categories limpias
+      - Issn expandida (una por fila)
+    Retorna (scimago, scimago_exp). scimago_artifact guarda este resultado compilado.
+    """
+    scimago = scimago_df.copy()
+
+    # Normalizar nombres y títulos
+    scimago = scimago.rename(columns={"Title": "Source title"})
+    scimago["Source title"] = (
+        scimago["Source title"]
+        .astype(str)
+        .str.replace(r"\([^)]*\)", "", regex=True)
+        .str.strip()
+    )
+
+    if "Categories" in scimago.columns:
+        scimago["Categories"] = scimago["Categories"].apply(_clean_categories)
+
+    # Expandir ISSN (uno por fila)
+    scimago_exp = scimago.assign(
+        Issn=scimago["Issn"].astype(str).str.split(",")
+    ).explode("Issn")
+    scimago_exp["Issn"] = scimago_exp["Issn"].astype(str).str.strip()
+
+    return scimago, scimago_exp
+
+
 # ------------------------------------------------------------
 # Enriquecimiento principal
 # ------------------------------------------------------------
@@ -63,6 +93,7 @@ def enrich_with_scimago(
 ) -> pd.DataFrame:
     """
     Enrich final Scopus+WoS dataset with SCImago metadata.
+    scimago_df: raw SCImago DataFrame or a compiled ScimagoData (scimago_artifact).
 
     Matching order:
       1) ISSN + Year
@@ -72,31 +103,27 @@ def enrich_with_scimago(
     if combined_df is None or combined_df.empty:
         return combined_df
 
-    if scimago_df is None or scimago_df.empty:
+    if scimago_df is None or len(scimago_df) == 0:
         return combined_df
 
     # --------------------------------------------------------
-    # Preparación SCImago
+    # Preparación SCImago (o artefacto ya compilado)
     # --------------------------------------------------------
-    scimago = scimago_df.copy()
-
-    # Normalizar nombres y títulos
-    scimago = scimago.rename(columns={"Title": "Source title"})
-    scimago["Source title"] = (
-        scimago["Source title"]
-        .astype(str)
-        .str.replace(r"\([^)]*\)", "", regex=True)
-        .str.strip()
-    )
-
-    if "Categories" in scimago.columns:
-        scimago["Categories"] = scimago["Categories"].apply(_clean_categories)
-
-    # Expandir ISSN (uno por fila)
-    scimago_exp = scimago.assign(
-        Issn=scimago["Issn"].astype(str).str.split(",")
-    ).explode("Issn")
-    scimago_exp["Issn"] = scimago_exp["Issn"].astype(str).str.strip()
+    if isinstance(scimago_df, pd.DataFrame):
+        _, scimago_exp = prepare_scimago(scimago_df)
+        scimago_titles = (
+            scimago_exp["Source title"]
+            .dropna()
+            .astype(str)
+            .unique()
+            .tolist()
+        )
+        title_index = None
+    else:
+        # ScimagoData (scimago_artifact): solo las particiones de los años presentes
+        scimago_exp = scimago_df.exploded_for_years(combined_df.get("Year", pd.Series(dtype=float)))
+        scimago_titles = scimago_df.source_titles
+        title_index = scimago_df.source_title_index
 
     # --------------------------------------------------------
     # 1) Merge por ISSN + Year
@@ -114,17 +141,12 @@ def enrich_with_scimago(
     # 2) Fallback fuzzy por título (sin ISSN)
     # --------------------------------------------------------
     no_match = by_issn[by_issn["Issn"].isna()].copy()
-
-    scimago_titles = (
-        scimago_exp["Source title"]
-        .dropna()
-        .astype(str)
-        .unique()
-        .tolist()
-    )
+    if title_index is None and not no_match.empty:
+        # SCImago crudo: el índice se arma aquí (None en modo "scan")
+        title_index = title_index_for(scimago_titles)
 
     no_match["Source title"] = no_match["Source title"].apply(
-        lambda x: _best_title_match(x, scimago_titles, fuzzy_threshold)
+        lambda x: _best_title_match(x, scimago_titles, fuzzy_threshold, title_index)
     )
 
     by_title = pd.merge(
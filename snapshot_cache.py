@@ -0,0 +1,186 @@
+# ============================================================
+# snapshot_cache.py
+#   - Snapshots columnares (Parquet) de cada input ya parseado
+#     (CSV de Scopus, XLS/XLSX de WoS)
+#   - Clave: ruta + tamaño + mtime + hash de contenido (FileFingerprint)
+#   - Si el archivo cambia, scan_inputs invalida su snapshot automáticamente
+# ============================================================
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+import config
+from logging_utils import setup_logger
+from ui_messages import info
+
+logger = setup_logger("snapshot_cache")
+
+# Sube este número si cambia la forma de guardar snapshots
+SNAPSHOT_FORMAT = 1
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# Una entrada JSON por archivo de entrada (no un manifest único): así varios
+# procesos de carga en paralelo pueden escribir sus snapshots sin pisarse.
+def _entry_path(path: Path) -> Path:
+    name = hashlib.sha1(str(path).encode("utf-8")).hexdigest()
+    return config.SNAPSHOT_DIR / f"{name}.json"
+
+
+def _load_entry(path: Path) -> Optional[dict]:
+    entry_file = _entry_path(path)
+    if not entry_file.exists():
+        return None
+    try:
+        return json.loads(entry_file.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def _save_entry(path: Path, entry: dict) -> None:
+    config.SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    _entry_path(path).write_text(json.dumps(entry, indent=1, sort_keys=True), encoding="utf-8")
+
+
+def _drop_entry(entry_file: Path, entry: dict) -> None:
+    (config.SNAPSHOT_DIR / f"{entry.get('key')}.parquet").unlink(missing_ok=True)
+    entry_file.unlink(missing_ok=True)
+
+
+def snapshot_key(fingerprint, kind: str) -> str:
+    """Clave del snapshot: huella del archivo + tipo de lectura + formato."""
+    raw = "|".join([
+        str(fingerprint.path),
+        str(fingerprint.size),
+        str(fingerprint.mtime_ns),
+        fingerprint.sha1,
+        kind,
+        str(SNAPSHOT_FORMAT),
+    ])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+# ----------------------------
+# Columnas object con tipos mezclados
+# ----------------------------
+# Los XLS de WoS traen columnas como Issue ("5-6" y 12) que Parquet no acepta.
+# Se guardan como JSON por celda y se decodifican al leer (ida y vuelta sin pérdida).
+def _mixed_object_columns(df: pd.DataFrame) -> List[str]:
+    mixed = []
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        types = {type(v) for v in df[col].dropna()}
+        if len(types) > 1:
+            mixed.append(col)
+    return mixed
+
+
+def _encode_json_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    out = df.copy()
+    for col in columns:
+        out[col] = [json.dumps(v) for v in df[col]]
+    return out
+
+
+def _decode_json_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    for col in columns:
+        df[col] = pd.Series([json.loads(v) for v in df[col]], index=df.index, dtype=object)
+    return df
+
+
+# ----------------------------
+# API
+# ----------------------------
+def read_with_snapshot(
+    path: Path,
+    reader: Callable[[Path], pd.DataFrame],
+    kind: str,
+    fingerprint=None,
+) -> pd.DataFrame:
+    """
+    Devuelve reader(path), reutilizando el snapshot Parquet si la huella no cambió.
+    kind identifica la forma de lectura (p. ej. "scopus-csv"): cambiarla invalida el snapshot.
+    Si no hay pyarrow o el frame no se puede guardar, se lee normalmente.
+    """
+    if not config.SNAPSHOT_CACHE_ENABLED or not _has_pyarrow():
+        return reader(path)
+
+    from file_validation import fingerprint_file
+
+    fingerprint = fingerprint or fingerprint_file(path)
+    key = snapshot_key(fingerprint, kind)
+    entry = _load_entry(fingerprint.path)
+    snap = config.SNAPSHOT_DIR / f"{key}.parquet"
+
+    if entry and entry.get("key") == key and snap.exists():
+        try:
+            df = pd.read_parquet(snap)
+            logger.debug(f"[Snapshot] hit: {path.name}")
+            return _decode_json_columns(df, entry.get("json_columns", []))
+        except Exception as e:
+            logger.debug(f"[Snapshot] snapshot ilegible, se re-parsea {path.name}: {e}")
+
+    df = reader(path)
+
+    try:
+        json_columns = _mixed_object_columns(df)
+        config.SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        _encode_json_columns(df, json_columns).to_parquet(snap, index=False)
+    except Exception as e:
+        logger.debug(f"[Snapshot] no se pudo guardar snapshot de {path.name}: {e}")
+        return df
+
+    if entry and entry.get("key") != key:
+        (config.SNAPSHOT_DIR / f"{entry['key']}.parquet").unlink(missing_ok=True)
+    _save_entry(fingerprint.path, {
+        "path": str(fingerprint.path),
+        "key": key,
+        "kind": kind,
+        "size": fingerprint.size,
+        "mtime_ns": fingerprint.mtime_ns,
+        "sha1": fingerprint.sha1,
+        "json_columns": json_columns,
+    })
+    logger.debug(f"[Snapshot] guardado: {path.name} → {snap.name}")
+    return df
+
+
+def invalidate_changed(fingerprints: Dict[Path, object]) -> int:
+    """
+    Elimina snapshots de archivos que cambiaron (tamaño/mtime/hash) o que ya no están
+    entre los inputs escaneados. Lo llama scan_inputs. Retorna cuántos se invalidaron.
+    """
+    if not config.SNAPSHOT_DIR.exists():
+        return 0
+
+    current = {str(fp.path): fp for fp in fingerprints.values()}
+    removed = 0
+    for entry_file in config.SNAPSHOT_DIR.glob("*.json"):
+        try:
+            entry = json.loads(entry_file.read_text(encoding="utf-8"))
+        except Exception:
+            entry = {}
+        fp = current.get(entry.get("path", ""))
+        if fp is not None and (entry.get("size"), entry.get("mtime_ns"), entry.get("sha1")) == (
+            fp.size, fp.mtime_ns, fp.sha1
+        ):
+            continue
+        _drop_entry(entry_file, entry)
+        removed += 1
+
+    if removed:
+        info("Snapshots", f"{removed} snapshot(s) invalidados por cambios en los archivos de entrada.")
+    return removed
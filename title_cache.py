@@ -0,0 +1,151 @@
+# ============================================================
+# title_cache.py
+#   - Caché persistente (SQLite) de processed_title
+#   - Clave: hash(título crudo + modelo spaCy/versión + versión de stopwords)
+#   - Contadores hit/miss (logging_utils) y límite de tamaño con desalojo LRU
+# ============================================================
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from logging_utils import setup_logger
+
+logger = setup_logger("title_cache")
+
+# Máximo de variables por sentencia SQLite (límite conservador)
+_SQL_CHUNK = 900
+
+
+def stopwords_version(stop_words: Iterable[str]) -> str:
+    """Huella corta del conjunto de stopwords: cambia si spaCy cambia la lista."""
+    joined = "\n".join(sorted(stop_words))
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:12]
+
+
+class TitleCache:
+    """
+    Mapa persistente hash(título crudo, namespace) -> processed_title.
+
+    namespace identifica todo lo que afecta al resultado (modelo spaCy + versión,
+    versión de stopwords). Si cambia, las entradas antiguas simplemente no se usan
+    y terminan desalojadas por LRU.
+    """
+
+    def __init__(self, path: Path, namespace: str, max_entries: int = 500_000):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS titles ("
+            " key TEXT PRIMARY KEY,"
+            " processed TEXT NOT NULL,"
+            " last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON titles(last_used)")
+        self._conn.commit()
+
+    # ----------------------------
+    # Claves
+    # ----------------------------
+    def key(self, title: str) -> str:
+        raw = f"{self.namespace}\x1f{title}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # ----------------------------
+    # Lectura / escritura
+    # ----------------------------
+    def get_many(self, titles: Iterable[str]) -> Dict[str, str]:
+        """
+        Devuelve {título: processed_title} para los títulos presentes en caché.
+        Actualiza hits/misses y la marca LRU de los encontrados.
+        """
+        by_key = {self.key(t): t for t in titles}
+        found: Dict[str, str] = {}
+        keys = list(by_key)
+
+        for i in range(0, len(keys), _SQL_CHUNK):
+            chunk = keys[i:i + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, processed FROM titles WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            for k, processed in rows:
+                found[by_key[k]] = processed
+
+        if found:
+            now = time.time_ns()
+            hit_keys = [(now, self.key(t)) for t in found]
+            self._conn.executemany("UPDATE titles SET last_used = ? WHERE key = ?", hit_keys)
+            self._conn.commit()
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, title: str) -> Optional[str]:
+        return self.get_many([title]).get(title)
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        """Guarda {título: processed_title} y aplica el límite de tamaño."""
+        if not items:
+            return
+        now = time.time_ns()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO titles (key, processed, last_used) VALUES (?, ?, ?)",
+            [(self.key(t), p, now) for t, p in items.items()],
+        )
+        self._conn.commit()
+        self._evict()
+
+    def put(self, title: str, processed: str) -> None:
+        self.put_many({title: processed})
+
+    # ----------------------------
+    # Mantenimiento
+    # ----------------------------
+    def _evict(self) -> None:
+        """Desaloja las entradas menos usadas recientemente si se supera max_entries."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM titles").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM titles WHERE key IN ("
+            " SELECT key FROM titles ORDER BY last_used ASC LIMIT ?)",
+            (excess,),
+        )
+        self._conn.commit()
+        logger.debug(f"[Title cache] LRU: {excess} entradas desalojadas (límite {self.max_entries})")
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM titles")
+        self._conn.commit()
+        self._conn.execute("VACUUM")
+
+    def log_stats(self, label: str = "") -> None:
+        total = self.hits + self.misses
+        ratio = (self.hits / total * 100) if total else 0.0
+        prefix = f"[Title cache] {label}: " if label else "[Title cache] "
+        logger.info(f"{prefix}{self.hits} hits, {self.misses} misses ({ratio:.1f}% hit rate)")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def clear_title_cache(path: Path) -> None:
+    """Elimina el archivo de caché completo (flag --clear-title-cache)."""
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+        logger.info(f"[Title cache] Caché eliminada: {path}")
+    else:
+        logger.info(f"[Title cache] No había caché en: {path}")
@@ -0,0 +1,120 @@
+# ============================================================
+# title_normalizer.py
+#   - Backend liviano de lematización para processed_title
+#   - Tabla lema por búsqueda (lookup) construida UNA vez desde spaCy
+#     (spacy-lookups-data) y guardada como JSON comprimido en CACHE_DIR
+#   - En ejecución no necesita spaCy: solo un dict palabra -> lema
+#
+# Uso (reconstruir la tabla manualmente):
+#   python title_normalizer.py build
+# ============================================================
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from ui_messages import info, error
+
+# Sube este número si cambia el formato o el filtrado de la tabla
+LEMMA_TABLE_FORMAT = 1
+
+
+def build_lemma_table(out_path: Path, lang: str = "en") -> Path:
+    """
+    Extrae la tabla 'lemma_lookup' de spacy-lookups-data y la guarda compacta:
+      - solo claves ASCII minúsculas alfabéticas (processed_title no tiene otra cosa)
+      - sin entradas identidad (palabra == lema), el default ya devuelve la palabra
+      - excepciones del tokenizer ("dont" -> "do" + "nt"), ya sin sub-tokens stopword,
+        para partir las palabras igual que spaCy
+    """
+    try:
+        import spacy
+        from spacy.attrs import ORTH
+        from spacy.util import registry, load_language_data
+
+        raw = load_language_data(registry.lookups.get(lang)["lemma_lookup"])
+        nlp = spacy.blank(lang)
+    except Exception as e:
+        error(
+            "Tabla de lemas",
+            "No se pudo leer 'lemma_lookup' de spaCy.\n\n"
+            "Solución:\n"
+            "1) pip install spacy-lookups-data\n"
+            "2) Reintentar.\n\n"
+            f"Detalle: {e}",
+        )
+        raise
+
+    lemmas = {
+        word: lemma
+        for word, lemma in raw.items()
+        if word.isascii() and word.isalpha() and word.islower() and word != lemma
+    }
+    splits = {
+        word: [a[ORTH] for a in attrs if not nlp.vocab[a[ORTH]].is_stop]
+        for word, attrs in nlp.tokenizer.rules.items()
+        if word.isascii() and word.isalpha() and word.islower() and len(attrs) > 1
+    }
+    payload = json.dumps([lemmas, splits], sort_keys=True, separators=(",", ":"))
+    version = f"{LEMMA_TABLE_FORMAT}-{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]}"
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(out_path, "wt", encoding="utf-8") as f:
+        json.dump({"version": version, "lang": lang, "lemmas": lemmas, "splits": splits}, f, separators=(",", ":"))
+
+    info("Tabla de lemas", f"Tabla construida: {len(lemmas)} lemas, {len(splits)} excepciones → {out_path}")
+    return out_path
+
+
+class LookupLemmatizer:
+    """
+    Lematizador por tabla: cada palabra se reemplaza por su lema (o queda igual).
+    Recibe el texto ya limpio (solo letras ASCII minúsculas y espacios, sin stopwords).
+    """
+
+    name = "lookup"
+
+    def __init__(self, lemmas: Dict[str, str], splits: Dict[str, List[str]], version: str):
+        self.lemmas = lemmas
+        self.splits = splits
+        self.version = version
+
+    @classmethod
+    def load(cls, path: Path) -> "LookupLemmatizer":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["lemmas"], data.get("splits", {}), data["version"])
+
+    def lemmatize(self, cleaned: str) -> str:
+        get = self.lemmas.get
+        out = []
+        for word in cleaned.split():
+            parts = self.splits.get(word)
+            if parts is None:
+                out.append(get(word, word))
+            else:
+                out.extend(get(p, p) for p in parts)
+        return " ".join(out)
+
+
+def load_or_build_lookup(path: Path) -> LookupLemmatizer:
+    """Carga la tabla; si no existe todavía, la construye una vez desde spaCy."""
+    path = Path(path)
+    if not path.exists():
+        build_lemma_table(path)
+    return LookupLemmatizer.load(path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    import config
+
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        build_lemma_table(config.LEMMA_TABLE_FILE)
+    else:
+        print("Uso: python title_normalizer.py build")